@@ -7,6 +7,10 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app import db
+# Importer les modèles pour renseigner db.metadata
+from app.models import booking, booking_series, resource_version, room, user  # noqa: F401
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -20,11 +24,8 @@ config.set_main_option("sqlalchemy.url", os.getenv("DATABASE_URL"))
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+# Métadonnées des modèles, pour 'alembic revision --autogenerate'
+target_metadata = db.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -71,7 +72,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite ne sait pas modifier une colonne : recopie de la table
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
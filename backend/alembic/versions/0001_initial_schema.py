@@ -0,0 +1,99 @@
+"""Schéma initial (tables créées jusqu'ici par db.create_all).
+
+Les bases créées par db.create_all, avant ou après les migrations,
+passent par les mêmes migrations que les bases vides : chaque révision ne
+crée que les tables, index et colonnes absents. Ne pas utiliser
+`alembic stamp head` sur ces bases, create_all n'ajoutant ni colonne ni
+index aux tables existantes.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'room' not in existing:
+        op.create_table(
+            'room',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('slug', sa.String(length=100), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('short_description', sa.String(length=200), nullable=False),
+            sa.Column('category', sa.String(length=50), nullable=False),
+            sa.Column('type', sa.String(length=50), nullable=False),
+            sa.Column('capacity_min', sa.Integer(), nullable=False),
+            sa.Column('capacity_max', sa.Integer(), nullable=False),
+            sa.Column('capacity_optimal', sa.Integer(), nullable=False),
+            sa.Column('size', sa.Float(), nullable=False),
+            sa.Column('price_per_hour', sa.Float(), nullable=False),
+            sa.Column('price_per_day', sa.Float(), nullable=False),
+            sa.Column('location_address', sa.String(length=200), nullable=False),
+            sa.Column('location_city', sa.String(length=100), nullable=False),
+            sa.Column('location_postal_code', sa.String(length=20), nullable=False),
+            sa.Column('location_country', sa.String(length=100), nullable=False),
+            sa.Column('location_lat', sa.Float(), nullable=False),
+            sa.Column('location_lng', sa.Float(), nullable=False),
+            sa.Column('amenities', postgresql.JSON(), nullable=False),
+            sa.Column('services', postgresql.JSON(), nullable=False),
+            sa.Column('images', postgresql.JSON(), nullable=False),
+            sa.Column('availability_confirmation_required', sa.Boolean(), nullable=True),
+            sa.Column('rating', sa.Float(), nullable=True),
+            sa.Column('reviews', sa.Integer(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('slug'),
+        )
+    if 'user' not in existing:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('password_hash', sa.String(length=256), nullable=False),
+            sa.Column('first_name', sa.String(length=100), nullable=False),
+            sa.Column('last_name', sa.String(length=100), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email'),
+        )
+    if 'booking' not in existing:
+        op.create_table(
+            'booking',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('room_id', sa.String(length=36), nullable=False),
+            sa.Column('user_id', sa.String(length=36), nullable=True),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('start_time', sa.Time(), nullable=True),
+            sa.Column('end_time', sa.Time(), nullable=True),
+            sa.Column('is_full_day', sa.Boolean(), nullable=True),
+            sa.Column('attendees', sa.Integer(), nullable=False),
+            sa.Column('services', postgresql.JSON(), nullable=False),
+            sa.Column('total_price', sa.Float(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['room_id'], ['room.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('booking')
+    op.drop_table('user')
+    op.drop_table('room')
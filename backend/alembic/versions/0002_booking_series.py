@@ -0,0 +1,70 @@
+"""Réservations récurrentes : séries et exceptions.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:15:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'booking_series' not in existing:
+        op.create_table(
+            'booking_series',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('room_id', sa.String(length=36), nullable=False),
+            sa.Column('user_id', sa.String(length=36), nullable=True),
+            sa.Column('freq', sa.String(length=10), nullable=False),
+            sa.Column('interval', sa.Integer(), nullable=False),
+            sa.Column('by_weekday', postgresql.JSON(), nullable=True),
+            sa.Column('start_date', sa.Date(), nullable=False),
+            sa.Column('until', sa.Date(), nullable=True),
+            sa.Column('count', sa.Integer(), nullable=True),
+            sa.Column('start_time', sa.Time(), nullable=True),
+            sa.Column('end_time', sa.Time(), nullable=True),
+            sa.Column('is_full_day', sa.Boolean(), nullable=True),
+            sa.Column('attendees', sa.Integer(), nullable=False),
+            sa.Column('services', postgresql.JSON(), nullable=False),
+            sa.Column('total_price', sa.Float(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['room_id'], ['room.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if 'booking_series_exception' not in existing:
+        op.create_table(
+            'booking_series_exception',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('series_id', sa.String(length=36), nullable=False),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('start_time', sa.Time(), nullable=True),
+            sa.Column('end_time', sa.Time(), nullable=True),
+            sa.Column('is_full_day', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['series_id'], ['booking_series.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('series_id', 'date'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('booking_series_exception')
+    op.drop_table('booking_series')
@@ -0,0 +1,30 @@
+"""Index composite (user_id, date) pour l'historique des réservations.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('booking')}
+    if 'ix_booking_user_id_date' not in existing:
+        op.create_index('ix_booking_user_id_date', 'booking', ['user_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_user_id_date', table_name='booking')
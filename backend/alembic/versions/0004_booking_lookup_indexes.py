@@ -0,0 +1,53 @@
+"""Index des recherches fréquentes sur les réservations et les séries.
+
+- (room_id, date) : créneaux d'une salle pour une date (BookingService)
+- (date) : occupation de toutes les salles pour une date (AvailabilityService)
+- (status, date) : export et suivi par statut
+- booking_series (room_id, start_date) : séries actives d'une salle
+
+Les salles ne sont lues que par id ou par slug, déjà indexés.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = {
+        index['name']
+        for table in ('booking', 'booking_series')
+        for index in inspector.get_indexes(table)
+    }
+    if 'ix_booking_room_id_date' not in existing:
+        op.create_index('ix_booking_room_id_date', 'booking', ['room_id', 'date'], unique=False)
+    if 'ix_booking_date' not in existing:
+        op.create_index('ix_booking_date', 'booking', ['date'], unique=False)
+    if 'ix_booking_status_date' not in existing:
+        op.create_index('ix_booking_status_date', 'booking', ['status', 'date'], unique=False)
+    if 'ix_booking_series_room_id_start_date' not in existing:
+        op.create_index(
+            'ix_booking_series_room_id_start_date', 'booking_series', ['room_id', 'start_date'], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_booking_series_room_id_start_date', table_name='booking_series')
+    op.drop_index('ix_booking_status_date', table_name='booking')
+    op.drop_index('ix_booking_date', table_name='booking')
+    op.drop_index('ix_booking_room_id_date', table_name='booking')
@@ -0,0 +1,31 @@
+"""Rôle des utilisateurs (export des réservations réservé aux rôles admin et finance).
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('user')}
+    if 'role' not in columns:
+        op.add_column('user', sa.Column('role', sa.String(length=20), nullable=False, server_default='user'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('role')
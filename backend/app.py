@@ -1,10 +1,6 @@
 from app import create_app
 from monitoring import setup_monitoring
 import os
-from dotenv import load_dotenv
-
-# Charger les variables d'environnement
-load_dotenv()
 
 app = create_app()
 # setup_monitoring(app)
@@ -2,9 +2,13 @@ from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from dotenv import load_dotenv
+from app.pool import engine_options, register_engine
+from app.profiling import profiler
+from app.warmup import start_catalog_warmup
+from app import query_stats
 import os
 
-# Charger les variables d'environnement
+# Charger les variables d'environnement (une seule fois : run.py et app.py en dépendent)
 load_dotenv()
 
 # Initialiser l'ORM
@@ -20,6 +24,18 @@ def create_app():
         "DATABASE_URL", "sqlite:///roomly.db"
     )
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+        app.config["SQLALCHEMY_DATABASE_URI"]
+    )
+    # Détection des N+1 : "off" (défaut) ou "log" pour journaliser les requêtes
+    # qui répètent une même requête SQL ou en exécutent trop (staging)
+    app.config["QUERY_TRACKING"] = os.getenv("QUERY_TRACKING", "off")
+    app.config["QUERY_REPEAT_THRESHOLD"] = int(os.getenv("QUERY_REPEAT_THRESHOLD", "3"))
+    app.config["QUERY_WARN_COUNT"] = int(os.getenv("QUERY_WARN_COUNT", "20"))
+    # Profilage à la demande, désactivé (aucun hook) sans PROFILE_SECRET
+    app.config["PROFILE_SECRET"] = os.getenv("PROFILE_SECRET") or None
+    app.config["PROFILE_DIR"] = os.getenv("PROFILE_DIR", "profiles")
+    app.config["PROFILE_TOKEN_MAX_AGE"] = int(os.getenv("PROFILE_TOKEN_MAX_AGE", "3600"))
 
     # Configuration CORS
     allowed_origins = [
@@ -43,6 +59,13 @@ def create_app():
 
     # Initialiser les extensions
     db.init_app(app)
+    with app.app_context():
+        register_engine(db.engine)
+        query_stats.install(db.engine)
+    if app.config["QUERY_TRACKING"] == "log":
+        app.after_request(query_stats.log_offenders)
+    if app.config["PROFILE_SECRET"]:
+        profiler.install(app)
 
     # Enregistrer les blueprints
     from app.routes.rooms import rooms_bp
@@ -52,11 +75,29 @@ def create_app():
     app.register_blueprint(rooms_bp, url_prefix="/api/rooms")
     app.register_blueprint(bookings_bp, url_prefix="/api/bookings")
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
+    if app.config["PROFILE_SECRET"]:
+        from app.routes.profiling import profiling_bp
 
-    # Créer les tables de la base de données
-    with app.app_context():
+        app.register_blueprint(profiling_bp, url_prefix="/api/admin/profiling")
+
+    # Créer les tables manquantes de la base de données. Activé par défaut pour
+    # le développement local et les bases pas encore migrées ; create_all
+    # n'ajoute ni colonne ni index aux tables existantes, les migrations
+    # (alembic upgrade head) restent nécessaires. Avec DB_CREATE_ALL=false, le
+    # schéma est géré uniquement par les migrations
+    if os.getenv("DB_CREATE_ALL", "true").lower() not in ("0", "false", "no"):
+        with app.app_context():
+            db.create_all()
+
+    @app.cli.command("init-db")
+    def init_db():
+        """Crée les tables manquantes, hors du démarrage du serveur."""
         db.create_all()
 
+    # Préchargement du catalogue en arrière-plan, sans retarder le démarrage
+    if os.getenv("CATALOG_WARMUP", "false").lower() in ("1", "true", "yes"):
+        start_catalog_warmup(app)
+
     @app.route("/", methods=["GET"])
     def index():
         return "Welcome to the BEST Roomly API!"
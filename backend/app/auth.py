@@ -0,0 +1,152 @@
+from app.cache import MISSING, MemoryCache
+from app.models.user import User
+from app import db
+from flask import current_app, g, jsonify, request
+from functools import wraps
+from types import SimpleNamespace
+import hashlib
+import jwt
+import os
+import time
+
+# Identités vérifiées (claims + utilisateur), par empreinte du token. Une
+# entrée expire avec le token, et au plus tard après AUTH_CACHE_TTL secondes
+# pour qu'un compte désactivé ne reste pas utilisable jusqu'à l'expiration.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "300"))
+token_cache = MemoryCache(max_entries=int(os.getenv("AUTH_CACHE_SIZE", "10000")))
+
+
+class TokenDenylist:
+    """Tokens révoqués avant leur expiration, oubliés une fois expirés.
+
+    Les révocations sont écrites dans un CacheBackend. Avec le MemoryCache par
+    défaut, elles sont locales au processus : une révocation ne s'applique
+    qu'aux requêtes servies par ce worker. Un stockage partagé (Redis...)
+    les applique à tous les workers et à toutes les instances.
+    """
+
+    def __init__(self, backend=None, clock=time.time):
+        self.backend = backend if backend is not None else MemoryCache(max_entries=100000)
+        self._clock = clock
+
+    def add(self, key, expires_at):
+        ttl = expires_at - self._clock()
+        if ttl > 0:
+            self.backend.set(key, True, ttl)
+
+    def __contains__(self, key):
+        return self.backend.get(key) is not MISSING
+
+    def clear(self):
+        self.backend.clear()
+
+
+# Une entrée évincée redonnerait cours à un token révoqué : prévoir large
+denylist = TokenDenylist(MemoryCache(max_entries=int(os.getenv("TOKEN_DENYLIST_SIZE", "100000"))))
+
+
+def token_key(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _decode(token):
+    return jwt.decode(
+        token,
+        current_app.config["SECRET_KEY"],
+        algorithms=["HS256"],
+        options={"require": ["exp"]},
+    )
+
+
+def _verify(token):
+    """Vérifie le token et charge l'utilisateur ; retourne (claims, user) ou None."""
+    try:
+        claims = _decode(token)
+    except jwt.InvalidTokenError:
+        return None
+    user = db.session.get(User, claims.get("user_id"))
+    if user is None or not user.is_active:
+        return None
+    # Instantané détaché de la session, réutilisable d'une requête à l'autre
+    snapshot = SimpleNamespace(
+        id=user.id,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        is_active=user.is_active,
+        role=user.role,
+    )
+    return claims, snapshot
+
+
+def authenticate(token):
+    """Retourne (claims, user) pour un token valide et non révoqué, sinon None.
+
+    Seule la première requête d'un token vérifie la signature et lit
+    l'utilisateur en base ; les suivantes sont servies par le cache.
+    """
+    key = token_key(token)
+    if key in denylist:
+        return None
+    identity = token_cache.get(key)
+    if identity is MISSING:
+        identity = _verify(token)
+        if identity is None:
+            return None
+        ttl = min(identity[0]["exp"] - time.time(), AUTH_CACHE_TTL)
+        if ttl > 0:
+            token_cache.set(key, identity, ttl)
+    return identity
+
+
+def revoke_token(token):
+    """Révoque un token jusqu'à son expiration."""
+    try:
+        claims = _decode(token)
+    except jwt.InvalidTokenError:
+        # Token déjà expiré ou invalide : il est refusé de toute façon
+        return False
+    key = token_key(token)
+    denylist.add(key, claims["exp"])
+    token_cache.delete(key)
+    return True
+
+
+def bearer_token():
+    """Token de l'en-tête `Authorization: Bearer <token>`, ou None."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return None
+    return token.strip()
+
+
+def login_required(view):
+    """Refuse la requête sans token valide ; expose `g.current_user` et `g.token_claims`."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = bearer_token()
+        if token is None:
+            return jsonify({"error": "Authentification requise"}), 401
+        identity = authenticate(token)
+        if identity is None:
+            return jsonify({"error": "Token invalide, expiré ou révoqué"}), 401
+        g.token_claims, g.current_user = identity
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def roles_required(*roles):
+    """Comme `login_required`, en réservant la route aux utilisateurs de l'un des rôles."""
+
+    def decorator(view):
+        @wraps(view)
+        def check_role(*args, **kwargs):
+            if g.current_user.role not in roles:
+                return jsonify({"error": "Accès refusé"}), 403
+            return view(*args, **kwargs)
+
+        return login_required(check_role)
+
+    return decorator
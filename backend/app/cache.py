@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from threading import Lock
+import os
+import time
+
+# Valeur sentinelle : une entrée absente se distingue d'une entrée valant None
+MISSING = object()
+
+
+class CacheBackend:
+    """Interface d'un stockage de cache.
+
+    Le cache mémoire ci-dessous suffit pour un processus ; un stockage partagé
+    (Redis, Memcached...) peut être branché en implémentant ces méthodes.
+    """
+
+    evictions = 0
+
+    def get(self, key):
+        """Retourne la valeur associée à `key`, ou MISSING."""
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        """Enregistre `value` pour `ttl` secondes."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Cache local au processus avec expiration (TTL) et éviction LRU."""
+
+    def __init__(self, max_entries=256, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.evictions += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, self._clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ReadThroughCache:
+    """Cache en lecture seule : charge la valeur à la première demande."""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def evictions(self):
+        return self.backend.evictions
+
+    def get_or_load(self, key, loader):
+        if self.ttl <= 0:
+            return loader()
+
+        value = self.backend.get(key)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = loader()
+        self.backend.set(key, value, self.ttl)
+        return value
+
+    def invalidate(self):
+        """Vide le cache ; à appeler après toute écriture des données cachées."""
+        self.backend.clear()
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        self.backend.clear()
+        self.hits = self.misses = 0
+        self.backend.evictions = 0
+
+
+# Cache du catalogue des salles (liste et détail), désactivé avec un TTL à 0
+catalog_cache = ReadThroughCache(
+    MemoryCache(max_entries=int(os.getenv("CATALOG_CACHE_SIZE", "256"))),
+    ttl=float(os.getenv("CATALOG_CACHE_TTL", "60")),
+)
@@ -0,0 +1,107 @@
+from email.utils import formatdate
+from functools import wraps
+from threading import Thread
+from flask import current_app, make_response, request
+from app.versioning import load_versions
+import json
+import logging
+import os
+import urllib.request
+
+logger = logging.getLogger(__name__)
+
+# Révision déployée (fixée par Cloud Run) : un déploiement peut changer le
+# format des réponses sans changer les données, donc change aussi les ETags
+ETAG_REVISION = os.getenv("K_REVISION", "")
+
+# Fonctions appelées avec la liste des surrogate keys à purger
+surrogate_purgers = []
+
+
+def validators(versions):
+    """Calcule l'ETag et la date de dernière modification à partir des versions.
+
+    `versions` est une liste de couples (VersionCounters, clé). Les versions
+    sont lues en base en une requête (aucune pendant leur TTL, voir
+    VERSION_CACHE_TTL), sans lire la ressource ni construire le corps de la
+    réponse : l'ETag est le même sur tous les workers.
+    """
+    parts = [ETAG_REVISION] if ETAG_REVISION else []
+    last_modified = 0
+    for version, modified_at in load_versions(versions):
+        parts.append(str(version))
+        last_modified = max(last_modified, modified_at)
+    return "-".join(parts), int(last_modified)
+
+
+def _is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        # "*" ne dit rien de la version : traité après la vue, selon que la ressource existe
+        return not request.if_none_match.star_tag and request.if_none_match.contains(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since.timestamp()
+    return False
+
+
+def conditional_get(versions, cache_control, surrogate_keys=None):
+    """Décorateur de route GET gérant If-None-Match et If-Modified-Since.
+
+    `versions(**view_args)` retourne les compteurs dont dépend la réponse (ou
+    None pour désactiver la validation) ; `surrogate_keys(**view_args)` les
+    clés permettant au CDN de purger la réponse.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            keys = versions(**kwargs)
+            if keys is None:
+                return view(*args, **kwargs)
+
+            etag, last_modified = validators(keys)
+            if _is_not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if request.if_none_match.star_tag:
+                    response = current_app.response_class(status=304)
+
+            response.set_etag(etag)
+            response.headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+            response.headers["Cache-Control"] = cache_control
+            if surrogate_keys is not None:
+                response.headers["Surrogate-Key"] = " ".join(surrogate_keys(**kwargs))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _purge_url(keys):
+    """Envoie les clés à purger à l'API du CDN configurée dans CDN_PURGE_URL."""
+    body = json.dumps({"surrogate_keys": keys}).encode("utf-8")
+    req = urllib.request.Request(
+        os.environ["CDN_PURGE_URL"],
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        urllib.request.urlopen(req, timeout=5).close()
+    except OSError:
+        logger.warning("Échec de la purge CDN pour %s", keys, exc_info=True)
+
+
+if os.getenv("CDN_PURGE_URL"):
+    surrogate_purgers.append(
+        lambda keys: Thread(target=_purge_url, args=(keys,), daemon=True).start()
+    )
+
+
+def purge_surrogate_keys(keys):
+    """Demande la purge des réponses associées à `keys` dans les caches en amont."""
+    for purger in surrogate_purgers:
+        purger(list(keys))
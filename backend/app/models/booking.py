@@ -16,4 +16,15 @@ class Booking(db.Model):
     total_price = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), nullable=False, default='pending')  # pending, confirmed, cancelled
     created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        # Historique des réservations d'un utilisateur, trié par date
+        db.Index('ix_booking_user_id_date', 'user_id', 'date'),
+        # Créneaux d'une salle pour une date (index des créneaux, réservations groupées)
+        db.Index('ix_booking_room_id_date', 'room_id', 'date'),
+        # Occupation de toutes les salles pour une date, export par période
+        db.Index('ix_booking_date', 'date'),
+        # Export et suivi par statut (ex. réservations en attente de confirmation)
+        db.Index('ix_booking_status_date', 'status', 'date'),
+    )
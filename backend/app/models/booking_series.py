@@ -0,0 +1,53 @@
+from app import db
+from sqlalchemy.dialects.postgresql import JSON
+import datetime
+import uuid
+
+class BookingSeries(db.Model):
+    """Réservation récurrente : une règle de récurrence et le créneau de chaque occurrence.
+
+    Les occurrences ne sont pas stockées ; elles sont calculées à la demande
+    à partir de la règle (voir app.services.recurrence).
+    """
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    room_id = db.Column(db.String(36), db.ForeignKey('room.id'), nullable=False)
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=True)
+    # Règle de récurrence, sur le modèle de RRULE (RFC 5545)
+    freq = db.Column(db.String(10), nullable=False, default='weekly')  # daily, weekly
+    interval = db.Column(db.Integer, nullable=False, default=1)
+    by_weekday = db.Column(JSON, nullable=True)  # 0 = lundi ... 6 = dimanche
+    start_date = db.Column(db.Date, nullable=False)
+    until = db.Column(db.Date, nullable=True)
+    count = db.Column(db.Integer, nullable=True)
+    # Créneau de chaque occurrence
+    start_time = db.Column(db.Time, nullable=True)
+    end_time = db.Column(db.Time, nullable=True)
+    is_full_day = db.Column(db.Boolean, default=False)
+    attendees = db.Column(db.Integer, nullable=False)
+    services = db.Column(JSON, nullable=False, default=list)
+    total_price = db.Column(db.Float, nullable=False)  # prix d'une occurrence
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, confirmed, cancelled
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    # Relations
+    exceptions = db.relationship('BookingSeriesException', backref='series', lazy=True)
+
+    __table_args__ = (
+        # Séries actives d'une salle sur une plage de dates
+        db.Index('ix_booking_series_room_id_start_date', 'room_id', 'start_date'),
+    )
+
+
+class BookingSeriesException(db.Model):
+    """Occurrence d'une série annulée ou déplacée, sans réécrire la série."""
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    series_id = db.Column(db.String(36), db.ForeignKey('booking_series.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)  # date de l'occurrence d'origine
+    status = db.Column(db.String(20), nullable=False, default='cancelled')  # cancelled, moved
+    start_time = db.Column(db.Time, nullable=True)
+    end_time = db.Column(db.Time, nullable=True)
+    is_full_day = db.Column(db.Boolean, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('series_id', 'date'),)
@@ -0,0 +1,14 @@
+from app import db
+import datetime
+
+class ResourceVersion(db.Model):
+    """Version d'une ressource ("rooms", "room:<slug>", "user:<id>", "date:<iso>").
+
+    Incrémentée dans la transaction de chaque écriture : tous les workers et
+    toutes les instances lisent la même valeur (voir app.versioning).
+    """
+    __tablename__ = 'resource_version'
+
+    key = db.Column(db.String(120), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.datetime.utcnow)
@@ -1,6 +1,6 @@
 from app import db
 import uuid
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.passwords import hash_password, verify_password
 
 class User(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -9,12 +9,14 @@ class User(db.Model):
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    # 'user', 'finance' (export des réservations) ou 'admin'
+    role = db.Column(db.String(20), nullable=False, default='user', server_default='user')
     
     # Relations
     bookings = db.relationship('Booking', backref='user', lazy=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
\ No newline at end of file
+        return verify_password(self.password_hash, password)
\ No newline at end of file
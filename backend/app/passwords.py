@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from threading import BoundedSemaphore
+from werkzeug.security import check_password_hash, generate_password_hash
+import os
+
+# Méthode werkzeug et facteur de coût, ex. "scrypt:32768:8:1" ou "pbkdf2:sha256:600000"
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
+
+class PasswordHasherBusy(Exception):
+    """Trop de hachages en attente, ou hachage trop long : la requête doit être refusée (503)."""
+
+
+class PasswordHasher:
+    """Hache et vérifie les mots de passe sur un pool de threads borné.
+
+    Au plus `workers` hachages s'exécutent en même temps et au plus
+    `queue_size` attendent leur tour ; au-delà, PasswordHasherBusy est levée
+    au lieu d'accumuler les requêtes. Une place n'est libérée qu'à la fin du
+    hachage, même si l'appelant a abandonné après `timeout` secondes. scrypt et pbkdf2 libèrent le GIL : les
+    autres threads du worker continuent de servir leurs requêtes. Avec
+    `workers=0`, le hachage s'exécute dans le thread appelant.
+    """
+
+    def __init__(self, method=PASSWORD_HASH_METHOD, workers=2, queue_size=16, timeout=10):
+        self.method = method
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="password") if workers else None
+        self._slots = BoundedSemaphore(workers + queue_size) if workers else None
+        self._prefix = None
+
+    def _run(self, function, *args):
+        if self._executor is None:
+            return function(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(self.timeout)
+        except FutureTimeout:
+            raise PasswordHasherBusy() from None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Vrai si le hash a été produit avec d'autres paramètres que la méthode courante."""
+        if self._prefix is None:
+            # werkzeug complète la méthode avec ses valeurs par défaut ("scrypt" -> "scrypt:32768:8:1")
+            self._prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return password_hash.split("$", 1)[0] != self._prefix
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    queue_size=int(os.getenv("PASSWORD_HASH_QUEUE", "16")),
+)
+
+
+def hash_password(password):
+    return password_hasher.hash(password)
+
+
+def verify_password(password_hash, password):
+    return password_hasher.verify(password_hash, password)
+
+
+def needs_rehash(password_hash):
+    return password_hasher.needs_rehash(password_hash)
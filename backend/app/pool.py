@@ -0,0 +1,71 @@
+from sqlalchemy.pool import QueuePool
+from weakref import WeakSet
+import os
+import time
+
+# Fonctions appelées avec la durée (s) d'obtention de chaque connexion
+pool_wait_listeners = []
+
+# Moteurs créés par les applications, à libérer dans les workers après un fork
+_engines = WeakSet()
+
+
+def _env_flag(name, default):
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool qui mesure le temps passé à obtenir une connexion.
+
+    La durée inclut l'attente d'une connexion libre et, le cas échéant,
+    l'ouverture d'une nouvelle connexion.
+    """
+
+    def _do_get(self):
+        began = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - began
+            for listener in pool_wait_listeners:
+                listener(waited)
+
+
+def engine_options(database_uri):
+    """Options du moteur SQLAlchemy lues dans l'environnement.
+
+    DB_POOL_RECYCLE et DB_POOL_PRE_PING protègent des connexions fermées
+    côté serveur après une période d'inactivité. La taille du pool ne
+    s'applique pas à SQLite, qui garde son pool par défaut.
+    """
+    options = {
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", "true"),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    if not database_uri.startswith("sqlite"):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        )
+    return options
+
+
+def register_engine(engine):
+    _engines.add(engine)
+
+
+def engines():
+    return list(_engines)
+
+
+def dispose_engines():
+    """À appeler dans chaque worker juste après le fork (hook post_fork de gunicorn).
+
+    Les connexions héritées du processus maître ne doivent pas être
+    partagées : le pool est vidé sans les fermer, pour ne pas couper
+    celles que le maître utilise encore.
+    """
+    for engine in engines():
+        engine.dispose(close=False)
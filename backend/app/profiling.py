@@ -0,0 +1,220 @@
+from collections import Counter
+from flask import current_app, g, request
+from itsdangerous import BadSignature, SignatureExpired, TimestampSigner
+from threading import Event, Lock, Thread, get_ident
+import cProfile
+import os
+import random
+import re
+import sys
+import time
+
+# En-tête signé qui active le profilage d'une requête : "<mode>.<horodatage>.<signature>"
+PROFILE_HEADER = "X-Profile"
+# "sample" : échantillonnage des piles, agrégé par modèle de route ;
+# "cprofile" : profil déterministe de la seule requête, écrit en .prof ;
+# "admin" : accès aux routes /api/admin/profiling
+PROFILE_MODES = ("sample", "cprofile", "admin")
+
+_FILENAME_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _signer(secret):
+    return TimestampSigner(secret, salt="roomly-profile")
+
+
+def profile_token(secret, mode="sample"):
+    """Valeur de l'en-tête X-Profile pour `mode`, à générer hors de l'application."""
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"mode de profilage inconnu : {mode}")
+    return _signer(secret).sign(mode).decode("ascii")
+
+
+def verify_token(token, secret, max_age):
+    """Mode porté par un en-tête X-Profile valide et non expiré, sinon None."""
+    try:
+        mode = _signer(secret).unsign(token, max_age=max_age).decode("ascii")
+    except (BadSignature, SignatureExpired):
+        return None
+    return mode if mode in PROFILE_MODES else None
+
+
+def frame_name(frame):
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse(frame):
+    """Pile d'appels au format « collapsed stack » (racine;...;feuille)."""
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Échantillonne à intervalle régulier la pile des threads en cours de profilage.
+
+    Les piles sont comptées par modèle de route ; le thread d'échantillonnage
+    ne tourne que tant qu'au moins une requête est suivie. Les agrégats sont
+    locaux au processus : chaque worker écrit ses propres fichiers.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = {}  # route -> Counter(pile -> échantillons)
+        self.requests = Counter()  # route -> requêtes échantillonnées
+        self._targets = {}  # ident du thread -> route
+        self._lock = Lock()
+        self._wakeup = Event()
+        self._thread = None
+
+    def start(self, route):
+        with self._lock:
+            self._targets[get_ident()] = route
+            self.requests[route] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self):
+        with self._lock:
+            self._targets.pop(get_ident(), None)
+
+    def _run(self):
+        me = get_ident()
+        while True:
+            if not self._targets:
+                self._wakeup.clear()
+                # Une requête a pu démarrer entre le test et clear()
+                if not self._targets:
+                    self._wakeup.wait()
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, route in self._targets.items():
+                    frame = frames.get(ident)
+                    if frame is not None and ident != me:
+                        self.stacks.setdefault(route, Counter())[collapse(frame)] += 1
+            del frames
+            time.sleep(self.interval)
+
+    def snapshot(self):
+        with self._lock:
+            return {route: Counter(stacks) for route, stacks in self.stacks.items()}
+
+    def clear(self):
+        with self._lock:
+            self.stacks.clear()
+            self.requests.clear()
+
+    def dump(self, directory):
+        """Écrit un fichier .folded par route (« pile nombre » par ligne), lisible par flamegraph.pl ou speedscope."""
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for route, stacks in sorted(self.snapshot().items()):
+            path = os.path.join(directory, f"{_filename(route)}.{os.getpid()}.folded")
+            with open(path, "w", encoding="utf-8") as handle:
+                for stack, count in stacks.most_common():
+                    handle.write(f"{stack} {count}\n")
+            paths.append(path)
+        return paths
+
+
+def _filename(route):
+    return _FILENAME_RE.sub("_", route).strip("_") or "root"
+
+
+class Profiler:
+    """Profilage à la demande des requêtes HTTP.
+
+    Une requête est profilée si elle porte un en-tête X-Profile signé, ou
+    tirée au sort tant que l'échantillonnage est activé (`enable`). Sans
+    PROFILE_SECRET, `install` n'enregistre aucun hook.
+
+    L'état (échantillonnage, piles collectées) est propre au processus : avec
+    plusieurs workers gunicorn, `enable` et `dump` ne concernent que le worker
+    qui sert la requête, identifié par `worker` dans `status`.
+    """
+
+    def __init__(self, sampler=None, clock=time.monotonic):
+        self.sampler = sampler or StackSampler()
+        self.sample_rate = 0.0
+        self.until = 0.0
+        self._clock = clock
+
+    def enable(self, sample_rate, duration):
+        """Échantillonne une proportion `sample_rate` des requêtes pendant `duration` secondes."""
+        self.sample_rate = sample_rate
+        self.until = self._clock() + duration
+
+    def disable(self):
+        self.sample_rate = 0.0
+        self.until = 0.0
+
+    @property
+    def active(self):
+        return self.sample_rate > 0 and self._clock() < self.until
+
+    def status(self):
+        return {
+            "worker": os.getpid(),
+            "sample_rate": self.sample_rate if self.active else 0.0,
+            "remaining": max(self.until - self._clock(), 0.0) if self.active else 0.0,
+            "requests": dict(self.sampler.requests),
+        }
+
+    def _mode(self):
+        token = request.headers.get(PROFILE_HEADER)
+        if token:
+            return verify_token(
+                token,
+                current_app.config["PROFILE_SECRET"],
+                current_app.config["PROFILE_TOKEN_MAX_AGE"],
+            )
+        if self.sample_rate and self.active and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    def before_request(self):
+        mode = self._mode()
+        if mode == "sample":
+            g.profile_route = f"{request.method} {request.url_rule.rule if request.url_rule else '<unmatched>'}"
+            self.sampler.start(g.profile_route)
+        elif mode == "cprofile":
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # Un autre profileur est déjà actif
+                return
+            g.cprofile = profile
+
+    def after_request(self, response):
+        profile = g.pop("cprofile", None)
+        if profile is not None:
+            profile.disable()
+            route = request.url_rule.rule if request.url_rule else "<unmatched>"
+            directory = current_app.config["PROFILE_DIR"]
+            os.makedirs(directory, exist_ok=True)
+            name = f"{_filename(f'{request.method} {route}')}.{int(time.time() * 1000)}.{os.getpid()}.prof"
+            profile.dump_stats(os.path.join(directory, name))
+            response.headers["X-Profile-File"] = name
+        return response
+
+    def teardown_request(self, exc):
+        # Exécuté même si la vue lève une exception
+        if g.pop("profile_route", None) is not None:
+            self.sampler.stop()
+        profile = g.pop("cprofile", None)
+        if profile is not None:
+            profile.disable()
+
+    def install(self, app):
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+
+
+profiler = Profiler(StackSampler(float(os.getenv("PROFILE_INTERVAL", "0.005"))))
@@ -0,0 +1,134 @@
+from collections import Counter
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+import re
+import time
+
+# Une forme de requête répétée au moins ce nombre de fois signale un N+1 probable
+REPEAT_THRESHOLD = 3
+
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)|\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)+\s*\)")
+_SPACES_RE = re.compile(r"\s+")
+
+# Enregistreurs actifs en dehors des requêtes HTTP (tests, scripts)
+_recorders = []
+
+
+def statement_shape(statement):
+    """Forme d'une requête SQL : blancs normalisés et listes IN réduites à un paramètre."""
+    return _IN_LIST_RE.sub("(?)", _SPACES_RE.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Requêtes SQL exécutées pendant une requête HTTP : nombre et durée cumulée.
+
+    Avec `track_shapes`, chaque requête est aussi comptée par forme pour
+    repérer les formes répétées, signe d'un chargement paresseux ligne à
+    ligne (N+1).
+    """
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self, track_shapes=False):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter() if track_shapes else None
+
+    def add(self, statement, elapsed):
+        self.count += 1
+        self.duration += elapsed
+        if self.shapes is not None:
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold=REPEAT_THRESHOLD):
+        """Formes exécutées au moins `threshold` fois, de la plus répétée à la moins répétée."""
+        if not self.shapes:
+            return []
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def report(self):
+        lines = [f"{self.count} requêtes SQL, {self.duration * 1000:.1f} ms"]
+        for shape, n in (self.shapes or Counter()).most_common():
+            lines.append(f"  {n} x {shape}")
+        return "\n".join(lines)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Trop de requêtes SQL, ou une même requête répétée (N+1)."""
+
+
+@contextmanager
+def record():
+    """Enregistre toutes les requêtes SQL exécutées dans le bloc, quel que soit le contexte."""
+    stats = QueryStats(track_shapes=True)
+    _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        _recorders.remove(stats)
+
+
+@contextmanager
+def query_budget(limit, repeat_threshold=REPEAT_THRESHOLD):
+    """Échoue si le bloc exécute plus de `limit` requêtes ou répète une même requête.
+
+        with query_budget(2):
+            client.get("/api/rooms")
+    """
+    with record() as stats:
+        yield stats
+    if stats.count > limit:
+        raise QueryBudgetExceeded(f"budget de {limit} requêtes dépassé\n{stats.report()}")
+    if stats.repeated(repeat_threshold):
+        raise QueryBudgetExceeded(f"requête répétée (N+1 probable)\n{stats.report()}")
+
+
+def current_stats():
+    """Statistiques de la requête en cours, créées à la première requête SQL."""
+    if not has_app_context():
+        return None
+    stats = g.get("query_stats")
+    if stats is None:
+        stats = g.query_stats = QueryStats(
+            track_shapes=current_app.config.get("QUERY_TRACKING") == "log"
+        )
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.add(statement, elapsed)
+    for recorder in _recorders:
+        recorder.add(statement, elapsed)
+
+
+def install(engine):
+    """Compte et chronomètre les requêtes SQL de `engine` (événements SQLAlchemy)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def log_offenders(response):
+    """Hook after_request (QUERY_TRACKING=log) : journalise les N+1 et les requêtes trop coûteuses."""
+    stats = g.get("query_stats")
+    if stats is None:
+        return response
+    repeated = stats.repeated(current_app.config["QUERY_REPEAT_THRESHOLD"])
+    if repeated or stats.count > current_app.config["QUERY_WARN_COUNT"]:
+        route = request.url_rule.rule if request.url_rule else request.path
+        current_app.logger.warning(
+            "%s %s : %s%s",
+            request.method,
+            route,
+            stats.report(),
+            " (N+1 probable)" if repeated else "",
+        )
+    return response
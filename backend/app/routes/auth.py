@@ -1,10 +1,17 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, request, jsonify
+from app.auth import bearer_token, login_required, revoke_token
+from app.passwords import PasswordHasherBusy
 from app.schemas.user import UserCreate, UserLogin
 from app.services.auth_service import AuthService
 from pydantic import ValidationError
 
 auth_bp = Blueprint('auth', __name__)
 
+def _busy():
+    response = jsonify({"error": "Service momentanément surchargé, veuillez réessayer"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     """Enregistrer un nouvel utilisateur."""
@@ -17,6 +24,8 @@ def register():
     
     except ValidationError as e:
         return jsonify({"error": "Données invalides", "details": str(e)}), 400
+    except PasswordHasherBusy:
+        return _busy()
     except Exception as e:
         return jsonify({"error": "Erreur serveur", "details": str(e)}), 500
 
@@ -32,5 +41,30 @@ def login():
     
     except ValidationError as e:
         return jsonify({"error": "Données invalides", "details": str(e)}), 400
+    except PasswordHasherBusy:
+        return _busy()
     except Exception as e:
-        return jsonify({"error": "Erreur serveur", "details": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": "Erreur serveur", "details": str(e)}), 500
+
+@auth_bp.route('/me', methods=['GET'])
+@login_required
+def me():
+    """Retourner l'utilisateur connecté."""
+    user = g.current_user
+    return jsonify({
+        "id": user.id,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+    })
+
+@auth_bp.route('/logout', methods=['POST'])
+@login_required
+def logout():
+    """Révoquer le token de la requête.
+
+    Avec le stockage mémoire par défaut de la liste de révocation, le token
+    n'est refusé que par le worker qui a servi cette requête (voir app.auth).
+    """
+    revoke_token(bearer_token())
+    return jsonify({"message": "Vous êtes déconnecté"}), 200
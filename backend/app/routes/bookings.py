@@ -1,6 +1,20 @@
-from flask import Blueprint, jsonify, request
-from app.schemas.booking import BookingCreate
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from app.auth import roles_required
+from app.schemas.booking import (
+    BookingBatchCreate,
+    BookingCreate,
+    BookingExportQuery,
+    BookingSeriesCreate,
+    OccurrenceUpdate,
+    OccurrenceWindow,
+    UserBookingsQuery,
+)
 from app.services.booking_service import BookingService
+from app.services.export_service import ExportService
+from app.services.recurrence_service import RecurrenceService
+from app.http_cache import conditional_get
+from app.versioning import booking_versions
+from datetime import date
 from pydantic import ValidationError
 
 bookings_bp = Blueprint('bookings', __name__)
@@ -18,8 +32,111 @@ def create_booking():
     except ValidationError as e:
         return jsonify({"error": "Données invalides", "details": str(e)}), 400
     
+@bookings_bp.route('/batch', methods=['POST'])
+def create_bookings():
+    """Créer plusieurs réservations en une seule transaction."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Données invalides", "details": "Un objet JSON est attendu"}), 400
+    try:
+        batch = BookingBatchCreate(**data)
+    except ValidationError as e:
+        return jsonify({"error": "Données invalides", "details": str(e)}), 400
+
+    response, status_code = BookingService.create_bookings(batch.items, batch.mode)
+    return jsonify(response), status_code
+
+@bookings_bp.route('/export', methods=['GET'])
+@roles_required('admin', 'finance')
+def export_bookings():
+    """Exporter les réservations en CSV ou NDJSON, en flux continu (rôles admin et finance)."""
+    try:
+        query = BookingExportQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+
+    mimetype = "text/csv" if query.format == "csv" else "application/x-ndjson"
+    return Response(
+        stream_with_context(ExportService.export_bookings(query)),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=bookings.{query.format}"},
+    )
+
 @bookings_bp.route('/user/<user_id>', methods=['GET'])
+@conditional_get(
+    lambda user_id: [(booking_versions, f"user:{user_id}")],
+    "private, no-cache",
+)
 def get_user_bookings(user_id):
-    """Récupérer toutes les réservations d'un utilisateur."""
-    bookings = BookingService.get_user_bookings(user_id)
-    return jsonify(bookings)
\ No newline at end of file
+    """Récupérer les réservations d'un utilisateur, éventuellement filtrées et paginées."""
+    try:
+        query = UserBookingsQuery(**request.args.to_dict())
+        bookings = BookingService.get_user_bookings(
+            user_id,
+            start=query.start,
+            end=query.end,
+            status=query.status,
+            limit=query.limit,
+            cursor=query.cursor,
+        )
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+    except ValueError:
+        return jsonify({"error": "Curseur invalide"}), 400
+    return jsonify(bookings)
+
+@bookings_bp.route('/<booking_id>/cancel', methods=['POST'])
+def cancel_booking(booking_id):
+    """Annuler une réservation."""
+    response, status_code = BookingService.cancel_booking(booking_id)
+    return jsonify(response), status_code
+
+@bookings_bp.route('/series', methods=['POST'])
+def create_series():
+    """Créer une réservation récurrente."""
+    try:
+        series_data = BookingSeriesCreate(**request.json)
+    except ValidationError as e:
+        return jsonify({"error": "Données invalides", "details": str(e)}), 400
+
+    response, status_code = RecurrenceService.create_series(series_data)
+    return jsonify(response), status_code
+
+@bookings_bp.route('/series/<series_id>/occurrences', methods=['GET'])
+def list_occurrences(series_id):
+    """Lister les occurrences d'une réservation récurrente entre deux dates."""
+    try:
+        window = OccurrenceWindow(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+
+    return jsonify(RecurrenceService.list_occurrences(series_id, window))
+
+@bookings_bp.route('/series/<series_id>/cancel', methods=['POST'])
+def cancel_series(series_id):
+    """Annuler une réservation récurrente."""
+    response, status_code = RecurrenceService.cancel_series(series_id)
+    return jsonify(response), status_code
+
+@bookings_bp.route('/series/<series_id>/occurrences/<occurrence_date>/cancel', methods=['POST'])
+def cancel_occurrence(series_id, occurrence_date):
+    """Annuler une seule occurrence d'une réservation récurrente."""
+    try:
+        day = date.fromisoformat(occurrence_date)
+    except ValueError:
+        return jsonify({"error": "Date invalide"}), 400
+
+    response, status_code = RecurrenceService.cancel_occurrence(series_id, day)
+    return jsonify(response), status_code
+
+@bookings_bp.route('/series/<series_id>/occurrences/<occurrence_date>', methods=['PUT'])
+def reschedule_occurrence(series_id, occurrence_date):
+    """Déplacer une seule occurrence d'une réservation récurrente."""
+    try:
+        day = date.fromisoformat(occurrence_date)
+        update = OccurrenceUpdate(**request.json)
+    except (ValueError, ValidationError) as e:
+        return jsonify({"error": "Données invalides", "details": str(e)}), 400
+
+    response, status_code = RecurrenceService.reschedule_occurrence(series_id, day, update)
+    return jsonify(response), status_code
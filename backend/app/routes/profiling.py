@@ -0,0 +1,57 @@
+from flask import Blueprint, current_app, jsonify, request
+from app.profiling import PROFILE_HEADER, profiler, verify_token
+from app.schemas.profiling import ProfilingToggle
+from functools import wraps
+from pydantic import ValidationError
+
+profiling_bp = Blueprint('profiling', __name__)
+
+def admin_token_required(view):
+    """Réserve la route aux porteurs d'un en-tête X-Profile signé en mode 'admin'."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        mode = verify_token(
+            request.headers.get(PROFILE_HEADER, ""),
+            current_app.config["PROFILE_SECRET"],
+            current_app.config["PROFILE_TOKEN_MAX_AGE"],
+        )
+        if mode != "admin":
+            return jsonify({"error": "Accès refusé"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+@profiling_bp.route('', methods=['GET'])
+@admin_token_required
+def status():
+    """État de l'échantillonnage et nombre de requêtes profilées par route, pour ce worker."""
+    return jsonify(profiler.status())
+
+@profiling_bp.route('', methods=['PUT'])
+@admin_token_required
+def enable():
+    """Échantillonner une proportion des requêtes du worker pendant une durée limitée."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Données invalides", "details": "Un objet JSON est attendu"}), 400
+    try:
+        toggle = ProfilingToggle(**data)
+    except ValidationError as e:
+        return jsonify({"error": "Données invalides", "details": str(e)}), 400
+
+    profiler.enable(toggle.sample_rate, toggle.duration)
+    return jsonify(profiler.status())
+
+@profiling_bp.route('', methods=['DELETE'])
+@admin_token_required
+def disable():
+    """Arrêter l'échantillonnage du worker (les piles déjà collectées sont conservées)."""
+    profiler.disable()
+    return jsonify(profiler.status())
+
+@profiling_bp.route('/dump', methods=['POST'])
+@admin_token_required
+def dump():
+    """Écrire les piles agrégées de ce worker en fichiers .folded, puis les oublier."""
+    files = profiler.sampler.dump(current_app.config["PROFILE_DIR"])
+    profiler.sampler.clear()
+    return jsonify({"files": files})
@@ -1,23 +1,109 @@
-from flask import Blueprint, jsonify, request
-from app.schemas.room import RoomCreate
-from app.services.room_service import RoomService
+from flask import Blueprint, Response, jsonify, request
+from app.schemas.room import (
+    RoomCreate,
+    RoomAvailabilityQuery,
+    RoomListQuery,
+    RoomNearQuery,
+    RoomSearchQuery,
+)
+from app.services.room_service import RoomService, ROOM_IMPORT_BATCH_SIZE
+from app.services.availability_service import AvailabilityService
+from app.services.geo_service import GeoService
+from app.services.facet_service import FacetService
+from app.services.search_service import SearchService
+from app.http_cache import conditional_get
+from app.versioning import catalog_versions, booking_versions
+from datetime import date
+import io
+import os
 from pydantic import ValidationError
 
 rooms_bp = Blueprint("rooms", __name__)
 
+# Le catalogue est public : le CDN peut le garder jusqu'à la purge suivante
+CATALOG_CACHE_CONTROL = f"public, max-age=0, s-maxage={int(os.getenv('CATALOG_SMAXAGE', '60'))}"
+
+
+def _available_versions():
+    try:
+        day = date.fromisoformat(request.args.get("date", ""))
+    except ValueError:
+        return None
+    return [(catalog_versions, "rooms"), (booking_versions, f"date:{day.isoformat()}")]
+
 
 @rooms_bp.route("", methods=["GET"])
+@conditional_get(
+    lambda: [(catalog_versions, "rooms")],
+    CATALOG_CACHE_CONTROL,
+    surrogate_keys=lambda: ["rooms"],
+)
 def get_all_rooms():
-    """Récupérer toutes les salles."""
-    rooms = RoomService.get_all_rooms()
-    return jsonify(rooms)
+    """Récupérer toutes les salles, éventuellement filtrées et paginées."""
+    try:
+        query = RoomListQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+
+    if query.is_faceted:
+        body = FacetService.search_rooms_json(query)
+    else:
+        body = RoomService.get_all_rooms_json(
+            limit=query.limit, cursor=query.cursor, fields=query.fields
+        )
+    return Response(body, mimetype="application/json")
+
+
+@rooms_bp.route("/available", methods=["GET"])
+@conditional_get(_available_versions, "public, max-age=0, no-cache")
+def get_available_rooms():
+    """Récupérer les salles libres sur un créneau."""
+    try:
+        query = RoomAvailabilityQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+
+    body, status_code = AvailabilityService.find_available_rooms_json(query)
+    if status_code != 200:
+        return jsonify(body), status_code
+    return Response(body, mimetype="application/json")
+
+
+@rooms_bp.route("/near", methods=["GET"])
+@conditional_get(lambda: [(catalog_versions, "rooms")], CATALOG_CACHE_CONTROL)
+def get_rooms_near():
+    """Récupérer les salles les plus proches d'un point."""
+    try:
+        query = RoomNearQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+
+    return jsonify(GeoService.find_rooms_near(query))
+
+
+@rooms_bp.route("/search", methods=["GET"])
+@conditional_get(lambda: [(catalog_versions, "rooms")], CATALOG_CACHE_CONTROL)
+def search_rooms():
+    """Rechercher des salles par mots-clés."""
+    try:
+        query = RoomSearchQuery(**request.args.to_dict())
+    except ValidationError as e:
+        return jsonify({"error": "Paramètres invalides", "details": str(e)}), 400
+
+    body = SearchService.search_rooms_json(query)
+    return Response(body, mimetype="application/json")
 
 
 @rooms_bp.route("/<slug>", methods=["GET"])
+@conditional_get(
+    lambda slug: [(catalog_versions, f"room:{slug}")],
+    CATALOG_CACHE_CONTROL,
+    surrogate_keys=lambda slug: ["rooms", f"room-{slug}"],
+)
 def get_room_by_slug(slug):
     """Récupérer une salle par son slug."""
-    room = RoomService.get_room_by_slug(slug)
-    return jsonify(room)
+    body = RoomService.get_room_by_slug_json(slug)
+    return Response(body, mimetype="application/json")
 
 
 @rooms_bp.route("", methods=["POST"])
@@ -32,3 +118,19 @@ def create_room():
 
     except ValidationError as e:
         return jsonify({"error": "Données invalides", "details": str(e)}), 400
+
+
+@rooms_bp.route("/bulk", methods=["POST"])
+def import_rooms():
+    """Importer des salles en masse depuis un corps NDJSON (une salle par ligne)."""
+    batch_size = request.args.get("batch_size", type=int) or ROOM_IMPORT_BATCH_SIZE
+    if not 1 <= batch_size <= 10000:
+        return jsonify({"error": "batch_size doit être compris entre 1 et 10000"}), 400
+
+    # Le flux brut lit les lignes octet par octet : on le bufferise
+    lines = io.BufferedReader(request.stream, buffer_size=64 * 1024)
+    results = RoomService.import_rooms(lines, batch_size=batch_size)
+    created = sum(1 for result in results if result["status"] == "created")
+    return jsonify(
+        {"created": created, "errors": len(results) - created, "results": results}
+    )
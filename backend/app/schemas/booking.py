@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional, Any, Literal
 from datetime import date, time
 
+# Bornes d'une série récurrente et de la fenêtre de listage de ses occurrences
+MAX_SERIES_OCCURRENCES = 500
+MAX_OCCURRENCE_WINDOW_DAYS = 366
+
 BookingStatus = Literal['pending', 'confirmed', 'cancelled']
 
 class BookingCreate(BaseModel):
@@ -15,6 +19,81 @@ class BookingCreate(BaseModel):
     services: List[Any] = []
     total_price: float
 
+class BookingBatchCreate(BaseModel):
+    items: List[BookingCreate] = Field(min_length=1, max_length=500)
+    # 'atomic' : tout ou rien ; 'partial' : seuls les éléments valides sont créés
+    mode: Literal['atomic', 'partial'] = 'atomic'
+
+class BookingSeriesCreate(BaseModel):
+    room_id: str
+    user_id: Optional[str] = None
+    freq: Literal['daily', 'weekly'] = 'weekly'
+    interval: int = Field(default=1, ge=1, le=52)
+    by_weekday: Optional[List[int]] = None  # 0 = lundi ... 6 = dimanche
+    start_date: date
+    until: Optional[date] = None
+    count: Optional[int] = Field(default=None, ge=1, le=MAX_SERIES_OCCURRENCES)
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    is_full_day: bool = False
+    attendees: int
+    services: List[Any] = []
+    total_price: float
+
+    @model_validator(mode='after')
+    def check_rule(self):
+        if self.until is None and self.count is None:
+            raise ValueError("Une série doit se terminer : 'until' ou 'count' est requis")
+        if self.until is not None and self.until < self.start_date:
+            raise ValueError("'until' doit être postérieur à 'start_date'")
+        if self.by_weekday and not all(0 <= day <= 6 for day in self.by_weekday):
+            raise ValueError("'by_weekday' attend des jours de 0 (lundi) à 6 (dimanche)")
+        return self
+
+class OccurrenceWindow(BaseModel):
+    start: date
+    end: date
+
+    @model_validator(mode='after')
+    def check_window(self):
+        if not 0 <= (self.end - self.start).days <= MAX_OCCURRENCE_WINDOW_DAYS:
+            raise ValueError(f"La fenêtre doit couvrir de 1 à {MAX_OCCURRENCE_WINDOW_DAYS + 1} jours")
+        return self
+
+class OccurrenceUpdate(BaseModel):
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    is_full_day: bool = False
+
+class BookingExportQuery(BaseModel):
+    format: Literal['csv', 'ndjson'] = 'ndjson'
+    start: Optional[date] = None
+    end: Optional[date] = None
+    room_id: Optional[str] = None
+    status: List[BookingStatus] = []
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def split_status(cls, value):
+        # ?status=confirmed,pending
+        if isinstance(value, str):
+            return [status.strip() for status in value.split(",") if status.strip()]
+        return value
+
+class UserBookingsQuery(BaseModel):
+    start: Optional[date] = Field(default=None, alias='from')
+    end: Optional[date] = Field(default=None, alias='to')
+    status: List[BookingStatus] = []
+    limit: Optional[int] = Field(default=None, ge=1, le=100)
+    cursor: Optional[str] = None
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def split_status(cls, value):
+        if isinstance(value, str):
+            return [status.strip() for status in value.split(",") if status.strip()]
+        return value
+
 class BookingResponse(BookingCreate):
     id: str
     status: BookingStatus
@@ -0,0 +1,5 @@
+from pydantic import BaseModel, Field
+
+class ProfilingToggle(BaseModel):
+    sample_rate: float = Field(gt=0, le=1)
+    duration: int = Field(default=300, ge=1, le=3600)  # en secondes
@@ -1,9 +1,16 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Dict, Optional, Literal
+from datetime import date, time
 
 # Correspondant aux types de frontend
 RoomCategory = Literal["Premium", "Standard", "Haut de Gamme"]
 RoomType = Literal["Petite", "Moyenne", "Grande", "Hangar", "Parking", "Espace Atypique"]
+RoomField = Literal[
+    "id", "name", "slug", "description", "shortDescription", "category", "type",
+    "capacity", "size", "pricePerHour", "pricePerDay", "location", "amenities",
+    "services", "images", "featuredImage", "availabilityConfirmationRequired",
+    "rating", "reviews",
+]
 
 class RoomAmenity(BaseModel):
     icon: str
@@ -54,4 +61,63 @@ class RoomCreate(BaseModel):
     reviews: Optional[int] = None
 
 class RoomResponse(RoomCreate):
-    id: str
\ No newline at end of file
+    id: str
+
+class RoomAvailabilityQuery(BaseModel):
+    date: date
+    start: Optional[time] = None
+    end: Optional[time] = None
+    attendees: Optional[int] = Field(default=None, ge=1)
+
+class RoomListQuery(BaseModel):
+    limit: Optional[int] = Field(default=None, ge=1, le=100)
+    cursor: Optional[str] = None
+    fields: Optional[List[RoomField]] = None
+
+    # Filtres à facettes
+    category: Optional[List[RoomCategory]] = None
+    type: Optional[List[RoomType]] = None
+    city: Optional[List[str]] = None
+    amenities: Optional[List[str]] = None
+    min_capacity: Optional[int] = Field(default=None, ge=0)
+    max_capacity: Optional[int] = Field(default=None, ge=0)
+    min_price: Optional[float] = Field(default=None, ge=0)
+    max_price: Optional[float] = Field(default=None, ge=0)
+    facets: bool = False
+
+    @field_validator("fields", "category", "type", "city", "amenities", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        # Les listes sont passées séparées par des virgules dans la query string
+        if isinstance(value, str):
+            return [field.strip() for field in value.split(",") if field.strip()]
+        return value
+
+    @property
+    def is_faceted(self):
+        """Vrai si la requête filtre le catalogue ou demande les comptes par facette."""
+        return self.facets or any(
+            getattr(self, name) not in (None, [])
+            for name in (
+                "category", "type", "city", "amenities",
+                "min_capacity", "max_capacity", "min_price", "max_price",
+            )
+        )
+
+class RoomNearQuery(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
+    radius_km: float = Field(default=10, gt=0, le=20000)
+    limit: int = Field(default=20, ge=1, le=100)
+
+class RoomSearchQuery(BaseModel):
+    q: str = Field(min_length=1, max_length=200)
+    limit: int = Field(default=20, ge=1, le=100)
+    fields: Optional[List[RoomField]] = None
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        if isinstance(value, str):
+            return [field.strip() for field in value.split(",") if field.strip()]
+        return value
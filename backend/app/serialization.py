@@ -0,0 +1,48 @@
+import json
+import math
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None
+
+from app.cache import MISSING
+
+
+def dumps(data):
+    """Sérialise `data` en JSON (bytes UTF-8), avec orjson s'il est installé."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """Désérialise un document JSON (str ou bytes), avec orjson s'il est installé."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_array(chunks):
+    """Assemble des documents JSON déjà sérialisés en un tableau JSON."""
+    return b"[" + b",".join(chunks) + b"]"
+
+
+class VersionedJsonCache:
+    """Documents JSON pré-sérialisés, valables pour une version donnée."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get(self, key, version):
+        entry = self.backend.get(key)
+        if entry is MISSING or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, key, version, data):
+        # Pas d'expiration : une nouvelle version suffit à périmer l'entrée
+        self.backend.set(key, (version, data), math.inf)
+
+    def clear(self):
+        self.backend.clear()
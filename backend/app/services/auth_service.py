@@ -1,4 +1,5 @@
 from app.models.user import User
+from app.passwords import PasswordHasherBusy, needs_rehash
 from app import db
 import jwt
 import datetime
@@ -36,6 +37,17 @@ class AuthService:
         if not user or not user.check_password(user_data.password):
             return {"error": "Email ou mot de passe incorrect"}, 401
 
+        # Mettre à niveau un hash produit avec d'anciens paramètres ; si le
+        # pool de hachage est saturé, la connexion réussit et la mise à niveau
+        # est retentée à la prochaine connexion
+        if needs_rehash(user.password_hash):
+            try:
+                user.set_password(user_data.password)
+            except PasswordHasherBusy:
+                pass
+            else:
+                db.session.commit()
+
         # Générer un token JWT
         token = jwt.encode(
             {
@@ -0,0 +1,149 @@
+from app.models.booking import Booking
+from app.models.room import Room
+from app.services.booking_index import booking_bounds
+from app.services.recurrence import series_intervals
+from app.services.room_service import RoomService
+from app.serialization import json_array
+from app.versioning import booking_versions
+from app import db
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+import os
+import time
+
+# Une journée est découpée en 96 créneaux d'un quart d'heure
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def slot_mask(start, end):
+    """Retourne le masque des créneaux couverts par l'intervalle [start, end[ en minutes."""
+    first = start // SLOT_MINUTES
+    last = -(-end // SLOT_MINUTES)  # arrondi supérieur
+    return ((1 << (last - first)) - 1) << first
+
+
+class OccupancyBitmaps:
+    """Occupation de chaque salle pour une date, sous forme d'entier de 96 bits.
+
+    Une date est chargée en une seule requête à la première recherche, puis
+    maintenue à jour lors des créations de réservation. Une annulation invalide
+    la date : deux réservations peuvent partager un même quart d'heure.
+    Les écritures des autres workers ou instances sont vues quand la version
+    `date:<iso>` de booking_versions change (voir `_date_version_changed`), et
+    au plus tard après `ttl` secondes ; au plus `max_entries` dates sont
+    gardées (LRU).
+    """
+
+    def __init__(self, loader, max_entries=366, ttl=60, clock=time.monotonic):
+        self._loader = loader
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._days = OrderedDict()
+        self._lock = Lock()
+
+    def _cached(self, day):
+        """Masques encore valides de la date, sinon None (sous le verrou)."""
+        entry = self._days.get(day)
+        if entry is None:
+            return None
+        masks, expires_at = entry
+        if expires_at <= self._clock():
+            del self._days[day]
+            return None
+        self._days.move_to_end(day)
+        return masks
+
+    def masks_for(self, day):
+        with self._lock:
+            masks = self._cached(day)
+        if masks is None:
+            masks = {}
+            for room_id, start, end in self._loader(day):
+                masks[room_id] = masks.get(room_id, 0) | slot_mask(start, end)
+            with self._lock:
+                cached = self._cached(day)
+                if cached is not None:
+                    return cached
+                self._days[day] = (masks, self._clock() + self.ttl)
+                while len(self._days) > self.max_entries:
+                    self._days.popitem(last=False)
+        return masks
+
+    def add(self, room_id, day, start, end):
+        # Une date jamais chargée le sera complètement à la prochaine recherche
+        with self._lock:
+            masks = self._cached(day)
+            if masks is not None:
+                masks[room_id] = masks.get(room_id, 0) | slot_mask(start, end)
+
+    def invalidate(self, day):
+        with self._lock:
+            self._days.pop(day, None)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+
+    def __len__(self):
+        return len(self._days)
+
+
+def _load_day_occupancy(day):
+    """Charge les créneaux non annulés de toutes les salles pour une date, séries comprises."""
+    rows = db.session.query(
+        Booking.room_id, Booking.start_time, Booking.end_time, Booking.is_full_day
+    ).filter(Booking.date == day, Booking.status != "cancelled")
+    intervals = [
+        (room_id, *booking_bounds(is_full_day, start_time, end_time))
+        for room_id, start_time, end_time, is_full_day in rows
+    ]
+    for room_id, _, start, end, _ in series_intervals([day]):
+        intervals.append((room_id, start, end))
+    return intervals
+
+
+# Occupation des salles par date, partagée par toutes les requêtes du processus
+occupancy = OccupancyBitmaps(
+    _load_day_occupancy,
+    max_entries=int(os.getenv("OCCUPANCY_CACHE_SIZE", "366")),
+    ttl=float(os.getenv("OCCUPANCY_CACHE_TTL", "60")),
+)
+
+
+def _date_version_changed(key):
+    """Réservations d'une date modifiées (par ce processus ou un autre) : la date est rechargée."""
+    if key.startswith("date:"):
+        occupancy.invalidate(date.fromisoformat(key.removeprefix("date:")))
+
+
+booking_versions.listeners.append(_date_version_changed)
+
+
+class AvailabilityService:
+    @staticmethod
+    def find_available_rooms_json(query):
+        """Retourne le JSON (bytes) des salles libres sur le créneau et adaptées au nombre de participants.
+
+        Seuls les ids et slugs des salles sont lus pour filtrer ; les salles
+        retenues sont servies par le cache JSON du catalogue.
+        """
+        # Sans horaires, la salle doit être libre toute la journée
+        start, end = booking_bounds(False, query.start, query.end)
+        if start >= end:
+            return {"error": "L'heure de fin doit être postérieure à l'heure de début"}, 400
+
+        rooms = db.session.query(Room.id, Room.slug)
+        if query.attendees is not None:
+            rooms = rooms.filter(
+                Room.capacity_min <= query.attendees,
+                Room.capacity_max >= query.attendees,
+            )
+
+        wanted = slot_mask(start, end)
+        masks = occupancy.masks_for(query.date)
+        available = [(room_id, slug) for room_id, slug in rooms if not masks.get(room_id, 0) & wanted]
+
+        return json_array(RoomService._rooms_json(available)), 200
@@ -0,0 +1,173 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from threading import Lock
+import time
+
+# Une journée complète couvre tous les créneaux de 00:00 à 24:00
+DAY_START = 0
+DAY_END = 24 * 60
+
+
+def to_minutes(value):
+    """Convertit un objet time en minutes depuis minuit."""
+    return value.hour * 60 + value.minute
+
+
+def booking_bounds(is_full_day, start_time, end_time):
+    """Retourne l'intervalle [début, fin[ en minutes occupé par une réservation.
+
+    Une réservation sans horaires est considérée comme occupant toute la journée.
+    """
+    if is_full_day or start_time is None or end_time is None:
+        return DAY_START, DAY_END
+    return to_minutes(start_time), to_minutes(end_time)
+
+
+class DayIntervals:
+    """Intervalles triés par heure de début pour une salle et une date."""
+
+    __slots__ = ("starts", "entries", "disjoint")
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.entries = []
+        # Tant que les intervalles ne se chevauchent pas, les fins sont triées
+        # dans le même ordre que les débuts : seul le voisin de gauche compte.
+        self.disjoint = True
+        for start, end, booking_id in sorted(intervals):
+            self.add(start, end, booking_id)
+
+    def find_conflict(self, start, end):
+        """Retourne l'id d'une réservation chevauchant [start, end[, sinon None."""
+        # Tous les intervalles commençant avant `end` sont à gauche de `i`
+        i = bisect_left(self.starts, end)
+        if i == 0:
+            return None
+        if self.disjoint:
+            prev_start, prev_end, booking_id = self.entries[i - 1]
+            return booking_id if prev_end > start else None
+        # Données historiques qui se chevauchent déjà : repli sur un parcours
+        for prev_start, prev_end, booking_id in self.entries[:i]:
+            if prev_end > start:
+                return booking_id
+        return None
+
+    def add(self, start, end, booking_id):
+        if self.disjoint and self.find_conflict(start, end) is not None:
+            self.disjoint = False
+        i = bisect_left(self.starts, start)
+        self.starts.insert(i, start)
+        self.entries.insert(i, (start, end, booking_id))
+
+    def remove(self, booking_id):
+        for i, entry in enumerate(self.entries):
+            if entry[2] == booking_id:
+                del self.starts[i]
+                del self.entries[i]
+                return True
+        return False
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class BookingIntervalIndex:
+    """Index des créneaux réservés, par couple (salle, date).
+
+    Chaque couple est chargé paresseusement via `loader(room_id, date)` qui doit
+    retourner des tuples (début, fin, booking_id) en minutes, puis maintenu à jour
+    à chaque création ou annulation. L'index est local au processus : d'autres
+    workers ou instances écrivent sans le prévenir. Il ne sert donc qu'à écarter
+    vite un créneau déjà pris ; avant d'écrire, `reload` relit la base. Un couple
+    expire après `ttl` secondes et au plus `max_entries` couples sont gardés (LRU).
+    """
+
+    def __init__(self, loader, max_entries=10000, ttl=60, clock=time.monotonic):
+        self._loader = loader
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._days = OrderedDict()
+        self._lock = Lock()
+
+    def _cached(self, key):
+        """Intervalles encore valides du couple, sinon None (sous le verrou)."""
+        entry = self._days.get(key)
+        if entry is None:
+            return None
+        intervals, expires_at = entry
+        if expires_at <= self._clock():
+            del self._days[key]
+            return None
+        self._days.move_to_end(key)
+        return intervals
+
+    def _store(self, key, intervals, replace=False):
+        """Enregistre les intervalles du couple et évince les plus anciens (sous le verrou)."""
+        if not replace:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+        self._days[key] = (intervals, self._clock() + self.ttl)
+        self._days.move_to_end(key)
+        while len(self._days) > self.max_entries:
+            self._days.popitem(last=False)
+        return intervals
+
+    def _get(self, room_id, day):
+        key = (room_id, day)
+        with self._lock:
+            intervals = self._cached(key)
+        if intervals is None:
+            intervals = DayIntervals(self._loader(room_id, day))
+            with self._lock:
+                intervals = self._store(key, intervals)
+        return intervals
+
+    def reload(self, room_id, day):
+        """Relit les créneaux du couple via le loader, remplace ceux de l'index et les retourne."""
+        intervals = DayIntervals(self._loader(room_id, day))
+        with self._lock:
+            return self._store((room_id, day), intervals, replace=True)
+
+    def preload(self, keys, bulk_loader, refresh=False):
+        """Charge en une fois les couples (salle, date) absents de l'index.
+
+        `bulk_loader(keys)` retourne un dict associant chaque couple à ses
+        intervalles ; un couple absent du dict n'a aucune réservation. Avec
+        `refresh`, tous les couples sont relus, même ceux déjà dans l'index.
+        """
+        with self._lock:
+            missing = [key for key in set(keys) if refresh or self._cached(key) is None]
+        if missing:
+            loaded = bulk_loader(missing)
+            with self._lock:
+                for key in missing:
+                    self._store(key, DayIntervals(loaded.get(key, ())), replace=refresh)
+
+    def find_conflict(self, room_id, day, start, end):
+        """Retourne l'id d'une réservation en conflit avec le créneau, sinon None."""
+        return self._get(room_id, day).find_conflict(start, end)
+
+    def add(self, room_id, day, start, end, booking_id):
+        intervals = self._get(room_id, day)
+        with self._lock:
+            intervals.add(start, end, booking_id)
+
+    def remove(self, room_id, day, booking_id):
+        with self._lock:
+            intervals = self._cached((room_id, day))
+            if intervals is None:
+                return False
+            return intervals.remove(booking_id)
+
+    def invalidate(self, room_id, day):
+        with self._lock:
+            self._days.pop((room_id, day), None)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+
+    def __len__(self):
+        return len(self._days)
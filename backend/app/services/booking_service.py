@@ -1,35 +1,107 @@
 from app.models.booking import Booking
 from app.models.room import Room
 from app.schemas.booking import BookingCreate
+from app.services.booking_index import BookingIntervalIndex, DayIntervals, booking_bounds
+from app.services.availability_service import occupancy
+from app.models.booking_series import BookingSeries
+from app.services.recurrence import active_occurrences, occurrence_id, overlapping_series, series_intervals
+from app.versioning import booking_versions
 from app import db
+from sqlalchemy import func, insert, tuple_
+from datetime import date, time
+from itertools import islice
+from types import SimpleNamespace
+import heapq
+import os
+import uuid
+
+
+def _load_day_intervals(room_id, day):
+    """Charge les créneaux non annulés d'une salle pour une date, séries comprises."""
+    rows = db.session.query(
+        Booking.id, Booking.start_time, Booking.end_time, Booking.is_full_day
+    ).filter(
+        Booking.room_id == room_id,
+        Booking.date == day,
+        Booking.status != 'cancelled',
+    )
+    intervals = [
+        (*booking_bounds(is_full_day, start_time, end_time), booking_id)
+        for booking_id, start_time, end_time, is_full_day in rows
+    ]
+    for _, _, start, end, occurrence in series_intervals([day], [room_id]):
+        intervals.append((start, end, occurrence))
+    return intervals
+
+
+def _load_intervals_bulk(keys):
+    """Charge en une passe les créneaux non annulés de plusieurs couples (salle, date), séries comprises."""
+    wanted = set(keys)
+    rows = db.session.query(
+        Booking.room_id, Booking.date, Booking.id,
+        Booking.start_time, Booking.end_time, Booking.is_full_day,
+    ).filter(
+        Booking.room_id.in_({room_id for room_id, _ in wanted}),
+        Booking.date.in_({day for _, day in wanted}),
+        Booking.status != 'cancelled',
+    )
+    intervals = {}
+    for room_id, day, booking_id, start_time, end_time, is_full_day in rows:
+        if (room_id, day) in wanted:
+            intervals.setdefault((room_id, day), []).append(
+                (*booking_bounds(is_full_day, start_time, end_time), booking_id)
+            )
+    for room_id, day, start, end, occurrence in series_intervals(
+        {day for _, day in wanted}, {room_id for room_id, _ in wanted}
+    ):
+        if (room_id, day) in wanted:
+            intervals.setdefault((room_id, day), []).append((start, end, occurrence))
+    return intervals
+
+
+# Index des créneaux réservés, partagé par toutes les requêtes du processus
+booking_index = BookingIntervalIndex(
+    _load_day_intervals,
+    max_entries=int(os.getenv("BOOKING_INDEX_SIZE", "10000")),
+    ttl=float(os.getenv("BOOKING_INDEX_TTL", "60")),
+)
 
 
 class BookingService:
     @staticmethod
     def create_booking(booking_data: BookingCreate):
-        """Crée une nouvelle réservation."""
+        """Crée une nouvelle réservation.
+
+        La salle est verrouillée (SELECT ... FOR UPDATE) jusqu'au commit et ses
+        créneaux du jour sont relus en base sous ce verrou : deux workers ne
+        peuvent pas réserver le même créneau. L'index local n'est jamais cru
+        sur parole, un créneau libéré par un autre worker y figurant encore.
+        """
         # Vérifier que la salle existe
-        room = Room.query.get_or_404(booking_data.room_id)
-        
-        # Créer la réservation
-        booking = Booking(
-            room_id=booking_data.room_id,
-            user_id=booking_data.user_id,
-            date=booking_data.date,
-            is_full_day=booking_data.is_full_day,
-            attendees=booking_data.attendees,
-            services=booking_data.services,
-            total_price=booking_data.total_price,
-            status='pending' if room.availability_confirmation_required else 'confirmed'
+        room = Room.query.filter_by(id=booking_data.room_id).with_for_update().first_or_404()
+
+        if booking_data.attendees > room.capacity_max:
+            db.session.rollback()
+            return {"error": "Le nombre de participants dépasse la capacité de la salle"}, 400
+
+        # Vérifier que le créneau est libre
+        start, end = booking_bounds(
+            booking_data.is_full_day, booking_data.start_time, booking_data.end_time
         )
+        if start >= end:
+            db.session.rollback()
+            return {"error": "L'heure de fin doit être postérieure à l'heure de début"}, 400
+        if booking_index.reload(booking_data.room_id, booking_data.date).find_conflict(start, end) is not None:
+            db.session.rollback()
+            return {"error": "La salle est déjà réservée sur ce créneau"}, 409
         
-        # Ajouter les heures si ce n'est pas une journée complète
-        if not booking.is_full_day and booking_data.start_time and booking_data.end_time:
-            booking.start_time = booking_data.start_time
-            booking.end_time = booking_data.end_time
+        # Créer la réservation
+        booking = Booking(**BookingService._booking_columns(booking_data, room))
         
         db.session.add(booking)
+        BookingService._bookings_changed(booking)
         db.session.commit()
+        BookingService._booking_created(booking, start, end)
         
         return {
             'id': booking.id,
@@ -38,16 +110,225 @@ class BookingService:
         }, 201
     
     @staticmethod
-    def get_user_bookings(user_id):
-        """Récupère toutes les réservations d'un utilisateur."""
-        bookings = Booking.query.filter_by(user_id=user_id).all()
-        result = []
-        
-        for booking in bookings:
-            result.append(BookingService._format_booking_data(booking))
-        
-        return result
+    def create_bookings(items, mode='atomic'):
+        """Crée plusieurs réservations en une seule transaction.
+
+        Les salles sont chargées et verrouillées en une requête IN, puis leurs
+        créneaux sont relus en base en une autre ; capacité et chevauchements
+        (y compris entre les éléments du lot) sont vérifiés en mémoire. En mode 'atomic', une seule
+        erreur annule tout le lot ; en mode 'partial', seuls les éléments
+        valides sont créés.
+        """
+        # Verrous pris dans l'ordre des ids, pour que deux lots ne s'attendent pas mutuellement
+        rooms = {
+            room.id: room
+            for room in Room.query.filter(Room.id.in_({item.room_id for item in items}))
+            .order_by(Room.id).with_for_update()
+        }
+        booking_index.preload(
+            [(item.room_id, item.date) for item in items if item.room_id in rooms],
+            _load_intervals_bulk,
+            refresh=True,
+        )
+
+        results = []
+        accepted = []
+        pending = {}  # (salle, date) -> créneaux déjà acceptés dans ce lot
+        for position, item in enumerate(items):
+            room = rooms.get(item.room_id)
+            start, end = booking_bounds(item.is_full_day, item.start_time, item.end_time)
+            error = None
+            if room is None:
+                error = "Salle introuvable"
+            elif start >= end:
+                error = "L'heure de fin doit être postérieure à l'heure de début"
+            elif item.attendees > room.capacity_max:
+                error = "Le nombre de participants dépasse la capacité de la salle"
+            elif (
+                booking_index.find_conflict(item.room_id, item.date, start, end) is not None
+                or pending.setdefault((item.room_id, item.date), DayIntervals()).find_conflict(start, end) is not None
+            ):
+                error = "La salle est déjà réservée sur ce créneau"
+
+            if error is not None:
+                results.append({"index": position, "status": "error", "error": error})
+                continue
+
+            columns = BookingService._booking_columns(item, room)
+            columns["id"] = str(uuid.uuid4())
+            pending[(item.room_id, item.date)].add(start, end, columns["id"])
+            accepted.append((position, columns, start, end))
+            results.append({"index": position, "status": "created", "id": columns["id"], "booking_status": columns["status"]})
+
+        failed = len(results) - len(accepted)
+        if mode == 'atomic' and failed:
+            for result in results:
+                if result["status"] == "created":
+                    result.update(status="skipped", id=None)
+            db.session.rollback()
+            return {"created": 0, "errors": failed, "results": results}, 400
+
+        if accepted:
+            db.session.execute(insert(Booking), [columns for _, columns, _, _ in accepted])
+            BookingService._bookings_changed(*(SimpleNamespace(**columns) for _, columns, _, _ in accepted))
+            db.session.commit()
+            for _, columns, start, end in accepted:
+                BookingService._booking_created(SimpleNamespace(**columns), start, end)
+        else:
+            db.session.rollback()
+
+        status_code = 201 if accepted else 400
+        return {"created": len(accepted), "errors": failed, "results": results}, status_code
+
+    @staticmethod
+    def cancel_booking(booking_id):
+        """Annule une réservation et libère son créneau."""
+        booking = Booking.query.get_or_404(booking_id)
+        if booking.status == 'cancelled':
+            return {"error": "Cette réservation est déjà annulée"}, 400
+
+        booking.status = 'cancelled'
+        BookingService._bookings_changed(booking)
+        db.session.commit()
+        booking_index.remove(booking.room_id, booking.date, booking.id)
+        occupancy.invalidate(booking.date)
+
+        return {
+            'id': booking.id,
+            'status': booking.status,
+            'message': 'Votre réservation a été annulée'
+        }, 200
+
+    @staticmethod
+    def get_user_bookings(user_id, start=None, end=None, status=None, limit=None, cursor=None):
+        """Récupère les réservations d'un utilisateur, triées par date et heure de début.
+
+        Les occurrences non annulées de ses réservations récurrentes sont
+        intercalées (id `<série>@<date>`, voir `_user_occurrences`).
+        `start`/`end` bornent les dates et `status` filtre les statuts. Avec
+        `limit`, le résultat est paginé par clé (date, heure de début, id) et
+        contient le curseur de la page suivante.
+        """
+        query = BookingService._user_bookings_query(user_id, start, end, status, cursor)
+        bookings = query.limit(limit + 1).all() if limit is not None else query.all()
+        items = heapq.merge(
+            (BookingService._format_booking_data(booking) for booking in bookings),
+            BookingService._user_occurrences(user_id, start, end, status, cursor),
+            key=BookingService._item_key,
+        )
+        if limit is None:
+            return list(items)
+
+        result = list(islice(items, limit + 1))
+        next_cursor = None
+        if len(result) > limit:
+            result = result[:limit]
+            next_cursor = "_".join(BookingService._item_key(result[-1]))
+        return {"items": result, "nextCursor": next_cursor}
+
+    @staticmethod
+    def _user_occurrences(user_id, start=None, end=None, status=None, cursor=None):
+        """Occurrences des séries d'un utilisateur, au format de `_format_booking_data`, triées par clé."""
+        if cursor is not None:
+            cursor_date, cursor_time, cursor_id = BookingService._parse_cursor(cursor)
+            after = (cursor_date.isoformat(), cursor_time.isoformat(), cursor_id)
+            start = max(start, cursor_date) if start is not None else cursor_date
+        series_list = overlapping_series(start, end).filter(BookingSeries.user_id == user_id).all()
+        items = []
+        for series, day, is_full_day, start_time, end_time, occurrence_status in active_occurrences(
+            series_list, start, end
+        ):
+            if status and occurrence_status not in status:
+                continue
+            item = {
+                "id": occurrence_id(series.id, day),
+                "series_id": series.id,
+                "room_id": series.room_id,
+                "date": day.isoformat(),
+                "is_full_day": is_full_day,
+                "start_time": start_time.isoformat() if start_time else None,
+                "end_time": end_time.isoformat() if end_time else None,
+                "attendees": series.attendees,
+                "services": series.services,
+                "total_price": series.total_price,
+                "status": occurrence_status,
+                "created_at": series.created_at.isoformat(),
+                "updated_at": series.updated_at.isoformat(),
+            }
+            if cursor is None or BookingService._item_key(item) > after:
+                items.append(item)
+        items.sort(key=BookingService._item_key)
+        return items
+
+    @staticmethod
+    def _item_key(item):
+        """Clé de tri et de pagination (date, heure de début, id) d'une réservation formatée."""
+        # Une journée complète commence à minuit
+        return item["date"], item["start_time"] or time(0).isoformat(), item["id"]
+
+    @staticmethod
+    def _user_bookings_query(user_id, start=None, end=None, status=None, cursor=None):
+        """Requête de l'historique d'un utilisateur, servie par l'index (user_id, date)."""
+        # Une journée complète commence à minuit
+        start_time = func.coalesce(Booking.start_time, time(0))
+        query = Booking.query.filter_by(user_id=user_id)
+        if start is not None:
+            query = query.filter(Booking.date >= start)
+        if end is not None:
+            query = query.filter(Booking.date <= end)
+        if status:
+            query = query.filter(Booking.status.in_(status))
+        if cursor is not None:
+            cursor_date, cursor_time, cursor_id = BookingService._parse_cursor(cursor)
+            # La borne sur la date seule permet un parcours d'intervalle de l'index
+            query = query.filter(
+                Booking.date >= cursor_date,
+                tuple_(Booking.date, start_time, Booking.id) > tuple_(cursor_date, cursor_time, cursor_id),
+            )
+        return query.order_by(Booking.date, start_time, Booking.id)
+
+    @staticmethod
+    def _parse_cursor(cursor):
+        """Décode un curseur 'date_heure_id' ; lève ValueError s'il est invalide."""
+        day, start_time, booking_id = cursor.split("_", 2)
+        return date.fromisoformat(day), time.fromisoformat(start_time), booking_id
     
+    @staticmethod
+    def _booking_columns(booking_data, room):
+        """Colonnes du modèle Booking pour une réservation validée."""
+        columns = dict(
+            room_id=booking_data.room_id,
+            user_id=booking_data.user_id,
+            date=booking_data.date,
+            is_full_day=booking_data.is_full_day,
+            start_time=None,
+            end_time=None,
+            attendees=booking_data.attendees,
+            services=booking_data.services,
+            total_price=booking_data.total_price,
+            status='pending' if room.availability_confirmation_required else 'confirmed',
+        )
+        # Ajouter les heures si ce n'est pas une journée complète
+        if not booking_data.is_full_day and booking_data.start_time and booking_data.end_time:
+            columns["start_time"] = booking_data.start_time
+            columns["end_time"] = booking_data.end_time
+        return columns
+
+    @staticmethod
+    def _booking_created(booking, start, end):
+        """Met à jour les index en mémoire après la création d'une réservation."""
+        booking_index.add(booking.room_id, booking.date, start, end, booking.id)
+        occupancy.add(booking.room_id, booking.date, start, end)
+
+    @staticmethod
+    def _bookings_changed(*bookings):
+        """À appeler avant le commit de toute écriture de réservations, dans la même transaction."""
+        booking_versions.bump(*(
+            key
+            for booking in bookings
+            for key in (f"user:{booking.user_id}", f"date:{booking.date.isoformat()}")
+        ))
+
     @staticmethod
     def _format_booking_data(booking):
         """Formate les données d'une réservation pour le frontend."""
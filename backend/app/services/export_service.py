@@ -0,0 +1,146 @@
+from app.models.booking import Booking
+from app.models.booking_series import BookingSeries
+from app.serialization import dumps
+from app.services.recurrence import active_occurrences, occurrence_id, overlapping_series
+from app import db
+from itertools import chain, islice
+import csv
+import io
+import os
+
+# Nombre de lignes lues par aller-retour du curseur et écrites par morceau
+BOOKING_EXPORT_BATCH_SIZE = int(os.getenv("BOOKING_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_COLUMNS = (
+    "id",
+    "room_id",
+    "user_id",
+    "date",
+    "start_time",
+    "end_time",
+    "is_full_day",
+    "attendees",
+    "services",
+    "total_price",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+# Colonnes date/heure, exportées au format ISO
+TEMPORAL_COLUMNS = tuple(
+    EXPORT_COLUMNS.index(column)
+    for column in ("date", "start_time", "end_time", "created_at", "updated_at")
+)
+
+
+def _export_values(row):
+    """Valeurs sérialisables d'une ligne (dates et heures au format ISO)."""
+    values = list(row)
+    for i in TEMPORAL_COLUMNS:
+        if values[i] is not None:
+            values[i] = values[i].isoformat()
+    return values
+
+
+class ExportService:
+    @staticmethod
+    def export_bookings(query, batch_size=BOOKING_EXPORT_BATCH_SIZE):
+        """Génère l'export des réservations en morceaux de `batch_size` lignes.
+
+        Les lignes sont lues via un curseur côté serveur (`yield_per`) et
+        écrites au fil de l'eau : la mémoire utilisée ne dépend pas du nombre
+        de réservations exportées. Les occurrences des réservations
+        récurrentes suivent les réservations simples ; les occurrences
+        annulées ne sont pas exportées.
+        """
+        rows = ExportService._rows(query, batch_size)
+        if query.format == "csv":
+            return ExportService._csv_chunks(rows, batch_size)
+        return ExportService._ndjson_chunks(rows, batch_size)
+
+    @staticmethod
+    def _rows(query, batch_size):
+        return chain(
+            ExportService._booking_rows(query, batch_size),
+            ExportService._series_rows(query, batch_size),
+        )
+
+    @staticmethod
+    def _booking_rows(query, batch_size):
+        bookings = db.session.query(
+            *(getattr(Booking, column) for column in EXPORT_COLUMNS)
+        )
+        if query.start is not None:
+            bookings = bookings.filter(Booking.date >= query.start)
+        if query.end is not None:
+            bookings = bookings.filter(Booking.date <= query.end)
+        if query.room_id is not None:
+            bookings = bookings.filter(Booking.room_id == query.room_id)
+        if query.status:
+            bookings = bookings.filter(Booking.status.in_(query.status))
+        return bookings.order_by(Booking.date, Booking.start_time, Booking.id).yield_per(batch_size)
+
+    @staticmethod
+    def _series_rows(query, batch_size):
+        """Occurrences des séries, lues par lots de `batch_size` séries (une requête d'exceptions par lot)."""
+        series = overlapping_series(query.start, query.end)
+        if query.room_id is not None:
+            series = series.filter(BookingSeries.room_id == query.room_id)
+        series = iter(series.order_by(BookingSeries.start_date, BookingSeries.id).yield_per(batch_size))
+        while True:
+            batch = list(islice(series, batch_size))
+            if not batch:
+                return
+            for item, day, is_full_day, start_time, end_time, status in active_occurrences(
+                batch, query.start, query.end
+            ):
+                if query.status and status not in query.status:
+                    continue
+                # Prix et participants de la série : total_price est le prix d'une occurrence
+                values = {
+                    "id": occurrence_id(item.id, day),
+                    "room_id": item.room_id,
+                    "user_id": item.user_id,
+                    "date": day,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "is_full_day": is_full_day,
+                    "attendees": item.attendees,
+                    "services": item.services,
+                    "total_price": item.total_price,
+                    "status": status,
+                    "created_at": item.created_at,
+                    "updated_at": item.updated_at,
+                }
+                yield tuple(values[column] for column in EXPORT_COLUMNS)
+
+    @staticmethod
+    def _csv_chunks(rows, batch_size):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        services = EXPORT_COLUMNS.index("services")
+        pending = 0
+        for row in rows:
+            values = _export_values(row)
+            values[services] = dumps(values[services]).decode("utf-8")
+            writer.writerow(values)
+            pending += 1
+            if pending == batch_size:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _ndjson_chunks(rows, batch_size):
+        lines = []
+        for row in rows:
+            lines.append(dumps(dict(zip(EXPORT_COLUMNS, _export_values(row)))))
+            if len(lines) == batch_size:
+                yield b"\n".join(lines) + b"\n"
+                lines.clear()
+        if lines:
+            yield b"\n".join(lines) + b"\n"
@@ -0,0 +1,239 @@
+from app.models.room import Room
+from app.services.room_service import RoomService, catalog_listeners, catalog_resets
+from app.cache import catalog_cache
+from app.serialization import dumps, json_array
+from app import db
+from bisect import bisect_left, bisect_right, insort
+from threading import Lock
+import heapq
+
+# Facettes à valeurs discrètes : une valeur par salle, sauf les équipements
+FACETS = ("category", "type", "city", "amenities")
+
+# Facettes numériques : (paramètre min, paramètre max, attribut de l'index)
+RANGES = (
+    ("min_capacity", "max_capacity", "capacity"),
+    ("min_price", "max_price", "price"),
+)
+
+
+def positions(bits):
+    """Énumère les positions des bits à 1, du plus faible au plus fort."""
+    digits = bin(bits)[:1:-1]
+    position = digits.find("1")
+    while position != -1:
+        yield position
+        position = digits.find("1", position + 1)
+
+
+def bits_from(positions, size):
+    """Construit un bitset à partir d'une liste de positions."""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _room_values(room):
+    """Valeurs indexées d'une salle (ligne complète ou partielle)."""
+    return {
+        "category": (room.category,),
+        "type": (room.type,),
+        "city": (room.location_city,),
+        "amenities": tuple({amenity["name"] for amenity in room.amenities or ()}),
+        "capacity": room.capacity_max,
+        "price": room.price_per_hour,
+    }
+
+
+class FacetIndex:
+    """Index inversé des salles : un bitset par valeur de facette.
+
+    Chaque salle reçoit une position fixe ; filtrer revient à combiner des
+    bitsets, et compter une facette à un popcount. Les facettes numériques
+    sont des tableaux triés de (valeur, position) interrogés par bissection.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = Lock()
+        self._built = False
+
+    def _reset(self):
+        self.ids = []  # position -> (id, slug)
+        self.by_id = {}  # id -> position
+        self.values = []  # position -> valeurs indexées
+        self.facets = {facet: {} for facet in FACETS}
+        self.ranges = {attribute: [] for _, _, attribute in RANGES}
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if not self._built:
+                self._reset()
+                for room in self._loader():
+                    self._add(room)
+                self._built = True
+
+    def add(self, room):
+        """Ajoute ou met à jour une salle dans un index déjà construit."""
+        with self._lock:
+            if self._built:
+                self._add(room)
+
+    def _add(self, room):
+        position = self.by_id.get(room.id)
+        if position is None:
+            position = len(self.ids)
+            self.ids.append((room.id, room.slug))
+            self.values.append(None)
+            self.by_id[room.id] = position
+        else:
+            self._remove(position)
+            self.ids[position] = (room.id, room.slug)
+
+        values = _room_values(room)
+        self.values[position] = values
+        bit = 1 << position
+        for facet in FACETS:
+            index = self.facets[facet]
+            for value in values[facet]:
+                index[value] = index.get(value, 0) | bit
+        for _, _, attribute in RANGES:
+            insort(self.ranges[attribute], (values[attribute], position))
+
+    def _remove(self, position):
+        values = self.values[position]
+        mask = ~(1 << position)
+        for facet in FACETS:
+            for value in values[facet]:
+                self.facets[facet][value] &= mask
+        for _, _, attribute in RANGES:
+            entries = self.ranges[attribute]
+            del entries[bisect_left(entries, (values[attribute], position))]
+
+    def clear(self):
+        with self._lock:
+            self._built = False
+
+    def _range_bits(self, attribute, low, high):
+        entries = self.ranges[attribute]
+        start = 0 if low is None else bisect_left(entries, (low, -1))
+        end = len(entries) if high is None else bisect_right(entries, (high, len(self.ids)))
+        return bits_from((position for _, position in entries[start:end]), len(self.ids))
+
+    def search(self, filters, ranges):
+        """Filtre les salles et compte les facettes.
+
+        `filters` associe une facette aux valeurs demandées (OU entre les
+        valeurs, sauf pour les équipements qui doivent tous être présents) ;
+        `ranges` associe un attribut numérique à un couple (min, max).
+        Retourne le bitset des salles retenues et les comptes par facette.
+        """
+        self._ensure_built()
+        with self._lock:
+            return self._search(filters, ranges)
+
+    def _search(self, filters, ranges):
+        everything = (1 << len(self.ids)) - 1
+
+        facet_bits = {}
+        for facet, wanted in filters.items():
+            index = self.facets[facet]
+            bits = everything if facet == "amenities" else 0
+            for value in wanted:
+                if facet == "amenities":
+                    bits &= index.get(value, 0)
+                else:
+                    bits |= index.get(value, 0)
+            facet_bits[facet] = bits
+
+        base = everything
+        for attribute, (low, high) in ranges.items():
+            base &= self._range_bits(attribute, low, high)
+
+        matched = base
+        for bits in facet_bits.values():
+            matched &= bits
+
+        counts = {}
+        for facet in FACETS:
+            # Une facette à choix multiple est comptée sans son propre filtre
+            scope = base
+            for other, bits in facet_bits.items():
+                if other != facet or facet == "amenities":
+                    scope &= bits
+            counts[facet] = {
+                value: count
+                for value, bits in sorted(self.facets[facet].items())
+                if (count := (bits & scope).bit_count())
+            }
+        return matched, counts
+
+    def keys(self, bits):
+        """Retourne les couples (id, slug) des salles d'un bitset."""
+        return [self.ids[position] for position in positions(bits)]
+
+
+def _load_rooms_for_facets():
+    return db.session.query(
+        Room.id,
+        Room.slug,
+        Room.category,
+        Room.type,
+        Room.location_city,
+        Room.amenities,
+        Room.capacity_max,
+        Room.price_per_hour,
+    ).all()
+
+
+# Index des facettes, partagé par toutes les requêtes du processus
+facet_index = FacetIndex(_load_rooms_for_facets)
+catalog_listeners.append(facet_index.add)
+catalog_resets.append(facet_index.clear)
+
+
+class FacetService:
+    @staticmethod
+    def search_rooms_json(query):
+        """Filtre le catalogue et retourne le corps JSON avec les comptes par facette."""
+        return catalog_cache.get_or_load(
+            f"facets:{query.model_dump_json()}",
+            lambda: FacetService._search_rooms_json(query),
+        )
+
+    @staticmethod
+    def _search_rooms_json(query):
+        filters = {
+            facet: getattr(query, facet) for facet in FACETS if getattr(query, facet)
+        }
+        ranges = {
+            attribute: (getattr(query, low), getattr(query, high))
+            for low, high, attribute in RANGES
+            if getattr(query, low) is not None or getattr(query, high) is not None
+        }
+        matched, counts = facet_index.search(filters, ranges)
+
+        # Ordre par slug, comme la pagination de GET /api/rooms
+        keys = facet_index.keys(matched)
+        if query.cursor is not None:
+            keys = [key for key in keys if key[1] > query.cursor]
+        total = matched.bit_count()
+        next_cursor = None
+        if query.limit is not None:
+            keys = heapq.nsmallest(query.limit + 1, keys, key=lambda key: key[1])
+            if len(keys) > query.limit:
+                keys = keys[: query.limit]
+                next_cursor = keys[-1][1]
+        else:
+            keys.sort(key=lambda key: key[1])
+
+        items = json_array(RoomService._rooms_json(keys, query.fields))
+        return (
+            b'{"items":' + items
+            + b',"total":' + dumps(total)
+            + b',"facets":' + dumps(counts)
+            + b',"nextCursor":' + dumps(next_cursor) + b"}"
+        )
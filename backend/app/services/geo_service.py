@@ -0,0 +1,135 @@
+from app.models.room import Room
+from app.services.room_service import RoomService, catalog_listeners, catalog_resets
+from app import db
+from threading import Lock
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Taille d'une cellule de la grille, en degrés (environ 11 km en latitude)
+CELL_DEGREES = 0.1
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Distance orthodromique entre deux points, en kilomètres."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell(lat, lng):
+    return math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES)
+
+
+class GeoGridIndex:
+    """Grille régulière latitude/longitude des salles.
+
+    Une recherche ne parcourt que les cellules recouvrant le cercle demandé,
+    puis garde les k plus proches dans un tas borné. La grille est construite
+    en une requête à la première recherche puis complétée à chaque création ;
+    elle est reconstruite quand une autre instance modifie le catalogue.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._cells = None
+        self._lock = Lock()
+
+    def _grid(self):
+        cells = self._cells
+        if cells is None:
+            cells = {}
+            for room_id, lat, lng in self._loader():
+                cells.setdefault(_cell(lat, lng), []).append((room_id, lat, lng))
+            with self._lock:
+                if self._cells is None:
+                    self._cells = cells
+                cells = self._cells
+        return cells
+
+    def add(self, room_id, lat, lng):
+        # Une grille jamais construite le sera complètement à la prochaine recherche
+        with self._lock:
+            if self._cells is not None:
+                self._cells.setdefault(_cell(lat, lng), []).append((room_id, lat, lng))
+
+    def clear(self):
+        with self._lock:
+            self._cells = None
+
+    def _candidate_cells(self, cells, lat, lng, radius_km):
+        lat_delta = radius_km / KM_PER_DEGREE
+        # Près des pôles, le cercle couvre toutes les longitudes
+        cos_lat = math.cos(math.radians(min(89.0, abs(lat) + lat_delta)))
+        lng_delta = min(180.0, radius_km / (KM_PER_DEGREE * cos_lat))
+
+        min_x, min_y = _cell(max(-90.0, lat - lat_delta), lng - lng_delta)
+        max_x, max_y = _cell(min(90.0, lat + lat_delta), lng + lng_delta)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+            # Cercle plus grand que la zone peuplée : parcourir les cellules existantes
+            return cells.values()
+
+        # Les longitudes au-delà de ±180° sont ramenées dans la grille
+        wrap = round(360 / CELL_DEGREES)
+        max_y = min(max_y, min_y + wrap - 1)
+        candidates = []
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                cell = cells.get((x, (y + wrap // 2) % wrap - wrap // 2))
+                if cell is not None:
+                    candidates.append(cell)
+        return candidates
+
+    def nearest(self, lat, lng, radius_km, limit):
+        """Retourne jusqu'à `limit` couples (distance, room_id) dans le rayon, du plus proche au plus loin."""
+        cells = self._grid()
+        heap = []  # tas max (distances négatives) des `limit` meilleurs candidats
+        for cell in self._candidate_cells(cells, lat, lng, radius_km):
+            for room_id, room_lat, room_lng in cell:
+                distance = haversine_km(lat, lng, room_lat, room_lng)
+                if distance > radius_km:
+                    continue
+                if len(heap) < limit:
+                    heapq.heappush(heap, (-distance, room_id))
+                elif -heap[0][0] > distance:
+                    heapq.heapreplace(heap, (-distance, room_id))
+        return sorted((-distance, room_id) for distance, room_id in heap)
+
+
+def _load_room_coordinates():
+    return db.session.query(Room.id, Room.location_lat, Room.location_lng).all()
+
+
+# Index géographique des salles, partagé par toutes les requêtes du processus
+geo_index = GeoGridIndex(_load_room_coordinates)
+catalog_listeners.append(
+    lambda room: geo_index.add(room.id, room.location_lat, room.location_lng)
+)
+catalog_resets.append(geo_index.clear)
+
+
+class GeoService:
+    @staticmethod
+    def find_rooms_near(query):
+        """Retourne les salles les plus proches d'un point, avec leur distance."""
+        nearest = geo_index.nearest(query.lat, query.lng, query.radius_km, query.limit)
+        if not nearest:
+            return []
+
+        rooms = {
+            room.id: room
+            for room in Room.query.filter(Room.id.in_([room_id for _, room_id in nearest]))
+        }
+        result = []
+        for distance, room_id in nearest:
+            room = rooms.get(room_id)
+            if room is not None:
+                data = RoomService._format_room_data(room)
+                data["distanceKm"] = round(distance, 3)
+                result.append(data)
+        return result
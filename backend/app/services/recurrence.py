@@ -0,0 +1,162 @@
+from app.models.booking_series import BookingSeries, BookingSeriesException
+from app.services.booking_index import booking_bounds
+from datetime import timedelta
+from sqlalchemy import or_
+
+# Une règle sans fin (ni 'until' ni 'count') ne génère rien au-delà de cet horizon
+HORIZON_DAYS = 3 * 366
+
+
+def occurrences(rule, start=None, end=None):
+    """Génère paresseusement les dates d'une règle de récurrence comprises dans [start, end].
+
+    `rule` expose freq ('daily' ou 'weekly'), interval, by_weekday, start_date,
+    until et count, comme une règle RRULE. Sans `count`, la génération saute
+    directement à la première période de la fenêtre.
+    """
+    if rule.freq == "daily":
+        anchor = rule.start_date
+        step = rule.interval
+        offsets = (0,)
+        weekdays = set(rule.by_weekday) if rule.by_weekday else None
+    else:
+        # Périodes d'une semaine, à partir du lundi de la première semaine
+        anchor = rule.start_date - timedelta(days=rule.start_date.weekday())
+        step = 7 * rule.interval
+        offsets = sorted(set(rule.by_weekday or (rule.start_date.weekday(),)))
+        weekdays = None
+
+    last = rule.until
+    if last is None and rule.count is None:
+        last = rule.start_date + timedelta(days=HORIZON_DAYS)
+    if end is not None and (last is None or end < last):
+        last = end
+
+    period = 0
+    if rule.count is None and start is not None and start > anchor:
+        period = (start - anchor).days // step
+    emitted = 0
+    while True:
+        base = anchor + timedelta(days=period * step)
+        if last is not None and base > last:
+            return
+        for offset in offsets:
+            day = base + timedelta(days=offset)
+            if day < rule.start_date or (weekdays and day.weekday() not in weekdays):
+                continue
+            if last is not None and day > last:
+                return
+            if rule.count is not None:
+                if emitted >= rule.count:
+                    return
+                emitted += 1
+            if start is None or day >= start:
+                yield day
+        period += 1
+
+
+def occurs_on(rule, day):
+    """Indique si la règle produit une occurrence à cette date."""
+    return next(occurrences(rule, day, day), None) == day
+
+
+def occurrence_id(series_id, day):
+    """Identifiant d'une occurrence dans les index de créneaux."""
+    return f"{series_id}@{day.isoformat()}"
+
+
+def expand_series(series, exceptions, start=None, end=None):
+    """Génère les occurrences d'une série dans la fenêtre, exceptions appliquées.
+
+    `exceptions` associe une date d'occurrence à son BookingSeriesException.
+    Chaque occurrence est un tuple (date, is_full_day, start_time, end_time, status).
+    """
+    for day in occurrences(series, start, end):
+        exception = exceptions.get(day)
+        if exception is None:
+            yield day, series.is_full_day, series.start_time, series.end_time, series.status
+        elif exception.status == "cancelled":
+            yield day, series.is_full_day, series.start_time, series.end_time, "cancelled"
+        else:
+            yield day, exception.is_full_day, exception.start_time, exception.end_time, series.status
+
+
+def overlapping_series(start=None, end=None):
+    """Requête des séries actives dont la règle peut produire une date dans [start, end]."""
+    query = BookingSeries.query.filter(BookingSeries.status != "cancelled")
+    if end is not None:
+        query = query.filter(BookingSeries.start_date <= end)
+    if start is not None:
+        query = query.filter(or_(BookingSeries.until.is_(None), BookingSeries.until >= start))
+    return query
+
+
+def active_occurrences(series_list, start=None, end=None):
+    """Génère les occurrences non annulées de séries dans la fenêtre, série par série.
+
+    Les exceptions de toutes les séries sont lues en une requête. Chaque
+    occurrence est un tuple (série, date, is_full_day, start_time, end_time,
+    status), par date croissante pour une même série.
+    """
+    if not series_list:
+        return
+    exceptions = BookingSeriesException.query.filter(
+        BookingSeriesException.series_id.in_([series.id for series in series_list])
+    )
+    if start is not None:
+        exceptions = exceptions.filter(BookingSeriesException.date >= start)
+    if end is not None:
+        exceptions = exceptions.filter(BookingSeriesException.date <= end)
+    by_series = {}
+    for exception in exceptions:
+        by_series.setdefault(exception.series_id, {})[exception.date] = exception
+
+    for series in series_list:
+        for day, is_full_day, start_time, end_time, status in expand_series(
+            series, by_series.get(series.id, {}), start, end
+        ):
+            if status != "cancelled":
+                yield series, day, is_full_day, start_time, end_time, status
+
+
+def series_intervals(days, room_ids=None):
+    """Créneaux occupés par les séries actives sur ces dates.
+
+    Deux requêtes quel que soit le nombre de dates : les séries qui
+    chevauchent la plage, puis leurs exceptions. Retourne des tuples
+    (room_id, date, début, fin, occurrence_id) en minutes.
+    """
+    days = set(days)
+    if not days:
+        return []
+    first, last = min(days), max(days)
+    query = BookingSeries.query.filter(
+        BookingSeries.status != "cancelled",
+        BookingSeries.start_date <= last,
+        or_(BookingSeries.until.is_(None), BookingSeries.until >= first),
+    )
+    if room_ids is not None:
+        query = query.filter(BookingSeries.room_id.in_(set(room_ids)))
+    series_list = query.all()
+    if not series_list:
+        return []
+
+    exceptions = {}
+    for exception in BookingSeriesException.query.filter(
+        BookingSeriesException.series_id.in_([series.id for series in series_list]),
+        BookingSeriesException.date.in_(days),
+    ):
+        exceptions.setdefault(exception.series_id, {})[exception.date] = exception
+
+    intervals = []
+    for series in series_list:
+        for day, is_full_day, start_time, end_time, status in expand_series(
+            series, exceptions.get(series.id, {}), first, last
+        ):
+            if day in days and status != "cancelled":
+                intervals.append((
+                    series.room_id, day,
+                    *booking_bounds(is_full_day, start_time, end_time),
+                    occurrence_id(series.id, day),
+                ))
+    return intervals
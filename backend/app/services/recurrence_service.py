@@ -0,0 +1,198 @@
+from app.models.booking_series import BookingSeries, BookingSeriesException
+from app.models.room import Room
+from app.schemas.booking import MAX_SERIES_OCCURRENCES
+from app.services.booking_index import booking_bounds
+from app.services.booking_service import BookingService, booking_index, _load_intervals_bulk
+from app.services.availability_service import occupancy
+from app.services.recurrence import expand_series, occurrence_id, occurrences, occurs_on
+from app import db
+from itertools import islice
+from types import SimpleNamespace
+
+
+class RecurrenceService:
+    @staticmethod
+    def create_series(series_data):
+        """Crée une réservation récurrente après une vérification groupée des conflits.
+
+        Comme pour une réservation simple, la salle est verrouillée jusqu'au
+        commit et les créneaux des dates de la série sont relus en base.
+        """
+        room = Room.query.filter_by(id=series_data.room_id).with_for_update().first_or_404()
+
+        start, end = booking_bounds(
+            series_data.is_full_day, series_data.start_time, series_data.end_time
+        )
+        if start >= end:
+            return {"error": "L'heure de fin doit être postérieure à l'heure de début"}, 400
+        if series_data.attendees > room.capacity_max:
+            return {"error": "Le nombre de participants dépasse la capacité de la salle"}, 400
+
+        days = list(islice(occurrences(series_data), MAX_SERIES_OCCURRENCES + 1))
+        if not days:
+            return {"error": "La règle de récurrence ne produit aucune occurrence"}, 400
+        if len(days) > MAX_SERIES_OCCURRENCES:
+            return {"error": f"Une série est limitée à {MAX_SERIES_OCCURRENCES} occurrences"}, 400
+
+        # Tous les créneaux existants des dates de la série sont relus d'un coup
+        booking_index.preload([(room.id, day) for day in days], _load_intervals_bulk, refresh=True)
+        conflicts = [
+            day.isoformat() for day in days
+            if booking_index.find_conflict(room.id, day, start, end) is not None
+        ]
+        if conflicts:
+            return {"error": "La salle est déjà réservée sur certaines occurrences", "conflicts": conflicts}, 409
+
+        series = BookingSeries(
+            **series_data.model_dump(exclude={"start_time", "end_time"}),
+            status='pending' if room.availability_confirmation_required else 'confirmed',
+        )
+        # Ajouter les heures si ce n'est pas une journée complète
+        if not series.is_full_day and series_data.start_time and series_data.end_time:
+            series.start_time = series_data.start_time
+            series.end_time = series_data.end_time
+
+        db.session.add(series)
+        RecurrenceService._occurrences_changed(series, days)
+        db.session.commit()
+        for day in days:
+            booking_index.add(room.id, day, start, end, occurrence_id(series.id, day))
+            occupancy.add(room.id, day, start, end)
+
+        return {
+            'id': series.id,
+            'status': series.status,
+            'occurrences': len(days),
+            'message': 'Votre réservation récurrente a été enregistrée avec succès'
+        }, 201
+
+    @staticmethod
+    def list_occurrences(series_id, window):
+        """Liste les occurrences d'une série dans une fenêtre de dates."""
+        series = BookingSeries.query.get_or_404(series_id)
+        exceptions = RecurrenceService._exceptions(series.id, window.start, window.end)
+        return [
+            {
+                "id": occurrence_id(series.id, day),
+                "series_id": series.id,
+                "room_id": series.room_id,
+                "date": day.isoformat(),
+                "is_full_day": is_full_day,
+                "start_time": start_time.isoformat() if start_time else None,
+                "end_time": end_time.isoformat() if end_time else None,
+                "status": status,
+            }
+            for day, is_full_day, start_time, end_time, status in expand_series(
+                series, exceptions, window.start, window.end
+            )
+        ]
+
+    @staticmethod
+    def cancel_occurrence(series_id, day):
+        """Annule une seule occurrence sans modifier la série."""
+        series = BookingSeries.query.get_or_404(series_id)
+        if series.status == 'cancelled' or not occurs_on(series, day):
+            return {"error": "Cette occurrence n'existe pas"}, 404
+
+        exception = RecurrenceService._exception(series.id, day)
+        if exception.status == 'cancelled':
+            return {"error": "Cette occurrence est déjà annulée"}, 400
+        exception.status = 'cancelled'
+        db.session.add(exception)
+        RecurrenceService._occurrences_changed(series, [day])
+        db.session.commit()
+
+        booking_index.remove(series.room_id, day, occurrence_id(series.id, day))
+        occupancy.invalidate(day)
+
+        return {
+            'id': occurrence_id(series.id, day),
+            'status': 'cancelled',
+            'message': 'Cette occurrence a été annulée'
+        }, 200
+
+    @staticmethod
+    def reschedule_occurrence(series_id, day, update):
+        """Change les horaires d'une seule occurrence sans modifier la série."""
+        series = BookingSeries.query.get_or_404(series_id)
+        if series.status == 'cancelled' or not occurs_on(series, day):
+            return {"error": "Cette occurrence n'existe pas"}, 404
+
+        start, end = booking_bounds(update.is_full_day, update.start_time, update.end_time)
+        if start >= end:
+            return {"error": "L'heure de fin doit être postérieure à l'heure de début"}, 400
+
+        exception = RecurrenceService._exception(series.id, day)
+        if exception.status == 'cancelled':
+            return {"error": "Cette occurrence est déjà annulée"}, 400
+
+        # L'occurrence ne doit pas entrer en conflit avec son propre créneau :
+        # la date est relue en base, salle verrouillée, puis l'occurrence en est retirée
+        key = occurrence_id(series.id, day)
+        Room.query.filter_by(id=series.room_id).with_for_update().first()
+        booking_index.reload(series.room_id, day)
+        booking_index.remove(series.room_id, day, key)
+        if booking_index.find_conflict(series.room_id, day, start, end) is not None:
+            booking_index.invalidate(series.room_id, day)
+            return {"error": "La salle est déjà réservée sur ce créneau"}, 409
+
+        exception.status = 'moved'
+        exception.is_full_day = update.is_full_day
+        exception.start_time = None if update.is_full_day else update.start_time
+        exception.end_time = None if update.is_full_day else update.end_time
+        db.session.add(exception)
+        RecurrenceService._occurrences_changed(series, [day])
+        db.session.commit()
+
+        booking_index.add(series.room_id, day, start, end, key)
+        occupancy.invalidate(day)
+
+        return {
+            'id': key,
+            'status': series.status,
+            'message': 'Cette occurrence a été déplacée'
+        }, 200
+
+    @staticmethod
+    def cancel_series(series_id):
+        """Annule une série et toutes ses occurrences."""
+        series = BookingSeries.query.get_or_404(series_id)
+        if series.status == 'cancelled':
+            return {"error": "Cette réservation est déjà annulée"}, 400
+
+        series.status = 'cancelled'
+        days = list(occurrences(series))
+        RecurrenceService._occurrences_changed(series, days)
+        db.session.commit()
+        for day in days:
+            booking_index.remove(series.room_id, day, occurrence_id(series.id, day))
+            occupancy.invalidate(day)
+
+        return {
+            'id': series.id,
+            'status': series.status,
+            'message': 'Votre réservation récurrente a été annulée'
+        }, 200
+
+    @staticmethod
+    def _exceptions(series_id, start, end):
+        """Exceptions d'une série dans une fenêtre, par date d'occurrence."""
+        return {
+            exception.date: exception
+            for exception in BookingSeriesException.query.filter(
+                BookingSeriesException.series_id == series_id,
+                BookingSeriesException.date >= start,
+                BookingSeriesException.date <= end,
+            )
+        }
+
+    @staticmethod
+    def _exception(series_id, day):
+        """Retourne l'exception d'une occurrence, ou une nouvelle exception non enregistrée."""
+        exception = BookingSeriesException.query.filter_by(series_id=series_id, date=day).first()
+        return exception or BookingSeriesException(series_id=series_id, date=day)
+
+    @staticmethod
+    def _occurrences_changed(series, days):
+        """À appeler avant le commit de toute écriture d'une série ou de ses occurrences."""
+        BookingService._bookings_changed(*(SimpleNamespace(user_id=series.user_id, date=day) for day in days))
@@ -1,60 +1,218 @@
 from app.models.room import Room
 from app.schemas.room import RoomCreate
 from app import db
+from app.cache import catalog_cache, MemoryCache
+from app.serialization import VersionedJsonCache, dumps, json_array, loads
+from app.versioning import catalog_versions
+from app.http_cache import purge_surrogate_keys
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from types import SimpleNamespace
+import os
+import uuid
+
+# Taille des lots de salles rechargées par requête IN
+ROOM_BATCH_SIZE = 500
+
+# Taille par défaut des lots d'insertion de l'import en masse
+ROOM_IMPORT_BATCH_SIZE = int(os.getenv("ROOM_IMPORT_BATCH_SIZE", "1000"))
+
+
+def _featured_image(room):
+    """Retourne l'image mise en avant d'une salle, à défaut la première."""
+    for image in room.images:
+        if image.get("featured"):
+            return image
+    return room.images[0] if room.images else None
+
+
+# Champs exposés par l'API : colonnes à charger et fonction de formatage
+ROOM_FIELDS = {
+    "id": (("id",), lambda room: room.id),
+    "name": (("name",), lambda room: room.name),
+    "slug": (("slug",), lambda room: room.slug),
+    "description": (("description",), lambda room: room.description),
+    "shortDescription": (("short_description",), lambda room: room.short_description),
+    "category": (("category",), lambda room: room.category),
+    "type": (("type",), lambda room: room.type),
+    "capacity": (
+        ("capacity_min", "capacity_max", "capacity_optimal"),
+        lambda room: {
+            "min": room.capacity_min,
+            "max": room.capacity_max,
+            "optimal": room.capacity_optimal,
+        },
+    ),
+    "size": (("size",), lambda room: room.size),
+    "pricePerHour": (("price_per_hour",), lambda room: room.price_per_hour),
+    "pricePerDay": (("price_per_day",), lambda room: room.price_per_day),
+    "location": (
+        (
+            "location_address",
+            "location_city",
+            "location_postal_code",
+            "location_country",
+            "location_lat",
+            "location_lng",
+        ),
+        lambda room: {
+            "address": room.location_address,
+            "city": room.location_city,
+            "postalCode": room.location_postal_code,
+            "country": room.location_country,
+            "coordinates": {"lat": room.location_lat, "lng": room.location_lng},
+        },
+    ),
+    "amenities": (("amenities",), lambda room: room.amenities),
+    "services": (("services",), lambda room: room.services),
+    "images": (("images",), lambda room: room.images),
+    "featuredImage": (("images",), _featured_image),
+    "availabilityConfirmationRequired": (
+        ("availability_confirmation_required",),
+        lambda room: room.availability_confirmation_required,
+    ),
+    "rating": (("rating",), lambda room: room.rating),
+    "reviews": (("reviews",), lambda room: room.reviews),
+}
+
+# Fonctions appelées avec chaque salle créée ou modifiée (index en mémoire...)
+catalog_listeners = []
+
+# Fonctions appelées sans argument quand la version du catalogue change, par
+# exemple après une écriture d'un autre worker ou d'une autre instance : les
+# index en mémoire sont vidés et reconstruits à la recherche suivante
+catalog_resets = []
+
+# JSON de chaque salle (et de chaque projection), sérialisé une seule fois
+room_json_cache = VersionedJsonCache(
+    MemoryCache(max_entries=int(os.getenv("ROOM_JSON_CACHE_SIZE", "20000")))
+)
+
+
+def _catalog_version_changed(key):
+    """Version modifiée par une autre instance : retire les réponses périmées du cache."""
+    if key == "rooms":
+        catalog_cache.invalidate()
+        for reset in catalog_resets:
+            reset()
+    else:
+        catalog_cache.backend.delete(f"room.json:{key.removeprefix('room:')}")
+
+
+catalog_versions.listeners.append(_catalog_version_changed)
+
+
+def _load_only_columns(fields):
+    """Options de chargement limitées aux colonnes nécessaires à `fields`."""
+    # Le slug est toujours chargé : il sert de curseur
+    columns = {"slug"}
+    for field in fields:
+        columns.update(ROOM_FIELDS[field][0])
+    return load_only(*(getattr(Room, column) for column in columns))
+
+
+def _line_error(number, error, details=None):
+    result = {"line": number, "status": "error", "error": error}
+    if details is not None:
+        result["details"] = details
+    return result
+
+
+def _line_created(number, columns):
+    return {"line": number, "status": "created", "id": columns["id"], "slug": columns["slug"]}
 
 
 class RoomService:
     @staticmethod
-    def get_all_rooms():
-        """Récupère toutes les salles et les formate pour le frontend."""
-        rooms = Room.query.all()
-        result = []
+    def get_all_rooms_json(limit=None, cursor=None, fields=None):
+        """Récupère les salles formatées pour le frontend, en corps JSON (bytes).
 
-        for room in rooms:
-            result.append(RoomService._format_room_data(room))
+        Avec `limit`, les salles sont paginées par slug croissant et le résultat
+        contient le curseur de la page suivante. `fields` restreint les champs
+        retournés ainsi que les colonnes chargées en base.
 
-        return result
+        Le JSON de chaque salle est sérialisé une fois puis réutilisé tant que
+        sa version ne change pas : après une écriture, seules les salles
+        modifiées sont relues et resérialisées.
+        """
+        return catalog_cache.get_or_load(
+            f"rooms.json:{limit}:{cursor}:{fields}",
+            lambda: RoomService._query_rooms_json(limit, cursor, fields),
+        )
 
     @staticmethod
-    def get_room_by_slug(slug):
-        """Récupère une salle par son slug et la formate pour le frontend."""
-        room = Room.query.filter_by(slug=slug).first_or_404()
-        return RoomService._format_room_data(room)
+    def _query_rooms_json(limit, cursor, fields):
+        query = db.session.query(Room.id, Room.slug)
+        if limit is not None or cursor is not None:
+            query = query.order_by(Room.slug)
+        if cursor is not None:
+            query = query.filter(Room.slug > cursor)
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        keys = query.all()
+        next_cursor = None
+        if limit is not None and len(keys) > limit:
+            keys = keys[:limit]
+            next_cursor = keys[-1].slug
+
+        items = json_array(RoomService._rooms_json(keys, fields))
+        if limit is None:
+            return items
+        return b'{"items":' + items + b',"nextCursor":' + dumps(next_cursor) + b"}"
+
+    @staticmethod
+    def _rooms_json(keys, fields=None):
+        """Retourne le JSON de chaque salle (couples id, slug), en ne relisant que les salles périmées."""
+        projection = ",".join(fields) if fields is not None else "*"
+        chunks = {}
+        missing = []
+        for room_id, slug in keys:
+            data = room_json_cache.get(
+                f"{room_id}:{projection}", catalog_versions.get(f"room:{slug}")
+            )
+            if data is None:
+                missing.append(room_id)
+            else:
+                chunks[room_id] = data
+
+        for start in range(0, len(missing), ROOM_BATCH_SIZE):
+            query = Room.query.filter(Room.id.in_(missing[start : start + ROOM_BATCH_SIZE]))
+            if fields is not None:
+                query = query.options(_load_only_columns(fields))
+            for room in query:
+                data = dumps(RoomService._format_room_data(room, fields))
+                room_json_cache.set(
+                    f"{room.id}:{projection}", catalog_versions.get(f"room:{room.slug}"), data
+                )
+                chunks[room.id] = data
+
+        # Une salle supprimée entre les deux requêtes est ignorée
+        return [chunks[room_id] for room_id, _ in keys if room_id in chunks]
+
+    @staticmethod
+    def get_room_by_slug_json(slug):
+        """Récupère une salle par son slug, formatée pour le frontend en corps JSON (bytes)."""
+        return catalog_cache.get_or_load(
+            f"room.json:{slug}",
+            lambda: dumps(
+                RoomService._format_room_data(
+                    Room.query.filter_by(slug=slug).first_or_404()
+                )
+            ),
+        )
 
     @staticmethod
     def create_room(room_data: RoomCreate):
         """Crée une nouvelle salle."""
         try:
-            new_room = Room(
-                name=room_data.name,
-                slug=room_data.slug,
-                description=room_data.description,
-                short_description=room_data.shortDescription,
-                category=room_data.category,
-                type=room_data.type,
-                capacity_min=room_data.capacity.min,
-                capacity_max=room_data.capacity.max,
-                capacity_optimal=room_data.capacity.optimal,
-                size=room_data.size,
-                price_per_hour=room_data.pricePerHour,
-                price_per_day=room_data.pricePerDay,
-                location_address=room_data.location.address,
-                location_city=room_data.location.city,
-                location_postal_code=room_data.location.postalCode,
-                location_country=room_data.location.country,
-                location_lat=room_data.location.coordinates["lat"],
-                location_lng=room_data.location.coordinates["lng"],
-                amenities=[amenity.dict() for amenity in room_data.amenities],
-                services=[service.dict() for service in room_data.services],
-                images=[image.dict() for image in room_data.images],
-                availability_confirmation_required=room_data.availabilityConfirmationRequired,
-                rating=room_data.rating,
-                reviews=room_data.reviews,
-            )
+            new_room = Room(**RoomService._room_columns(room_data))
 
             db.session.add(new_room)
+            RoomService._bump_catalog(new_room)
             db.session.commit()
+            RoomService._catalog_changed(new_room)
 
             return {"id": new_room.id, "message": "Salle créée avec succès"}, 201
 
@@ -63,8 +221,141 @@ class RoomService:
             return {"error": "Une salle avec ce slug existe déjà"}, 400
 
     @staticmethod
-    def _format_room_data(room):
+    def import_rooms(lines, batch_size=ROOM_IMPORT_BATCH_SIZE):
+        """Importe des salles depuis des lignes NDJSON (une salle par ligne).
+
+        Les lignes sont lues au fil de l'eau, validées une à une puis insérées
+        par lots de `batch_size` avec un seul INSERT multi-lignes et un commit
+        par lot. Une ligne invalide ou dont le slug existe déjà est signalée
+        sans interrompre l'import. Retourne le résultat de chaque ligne.
+        """
+        results = []
+        batch = []
+        seen_slugs = set()
+
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                room_data = RoomCreate(**loads(line))
+            except (ValueError, TypeError) as e:
+                results.append(_line_error(number, "Données invalides", str(e)))
+                continue
+            if room_data.slug in seen_slugs:
+                results.append(_line_error(number, "Slug en double dans l'import"))
+                continue
+            seen_slugs.add(room_data.slug)
+
+            columns = RoomService._room_columns(room_data)
+            columns["id"] = str(uuid.uuid4())
+            batch.append((number, columns))
+            if len(batch) >= batch_size:
+                results.extend(RoomService._insert_room_batch(batch))
+                batch = []
+
+        if batch:
+            results.extend(RoomService._insert_room_batch(batch))
+        results.sort(key=lambda result: result["line"])
+        return results
+
+    @staticmethod
+    def _insert_room_batch(batch):
+        """Insère un lot de salles en écartant les slugs déjà présents en base."""
+        slugs = [columns["slug"] for _, columns in batch]
+        existing = {
+            slug for (slug,) in db.session.query(Room.slug).filter(Room.slug.in_(slugs))
+        }
+        results = []
+        rows = []
+        for number, columns in batch:
+            if columns["slug"] in existing:
+                results.append(_line_error(number, "Une salle avec ce slug existe déjà"))
+            else:
+                rows.append((number, columns))
+
+        if rows:
+            try:
+                db.session.execute(insert(Room), [columns for _, columns in rows])
+                RoomService._bump_catalog(*(SimpleNamespace(**columns) for _, columns in rows))
+                db.session.commit()
+            except IntegrityError:
+                # Slug créé entre-temps par une autre requête : insertion ligne à ligne
+                db.session.rollback()
+                return results + RoomService._insert_rooms_one_by_one(rows)
+
+            RoomService._catalog_changed(*(SimpleNamespace(**columns) for _, columns in rows))
+        results.extend(_line_created(number, columns) for number, columns in rows)
+        return results
+
+    @staticmethod
+    def _insert_rooms_one_by_one(rows):
+        results = []
+        created = []
+        for number, columns in rows:
+            try:
+                db.session.execute(insert(Room), [columns])
+                RoomService._bump_catalog(SimpleNamespace(**columns))
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                results.append(_line_error(number, "Une salle avec ce slug existe déjà"))
+                continue
+            created.append(SimpleNamespace(**columns))
+            results.append(_line_created(number, columns))
+        if created:
+            RoomService._catalog_changed(*created)
+        return results
+
+    @staticmethod
+    def _room_columns(room_data: RoomCreate):
+        """Colonnes du modèle Room correspondant aux données validées d'une salle."""
+        return dict(
+            name=room_data.name,
+            slug=room_data.slug,
+            description=room_data.description,
+            short_description=room_data.shortDescription,
+            category=room_data.category,
+            type=room_data.type,
+            capacity_min=room_data.capacity.min,
+            capacity_max=room_data.capacity.max,
+            capacity_optimal=room_data.capacity.optimal,
+            size=room_data.size,
+            price_per_hour=room_data.pricePerHour,
+            price_per_day=room_data.pricePerDay,
+            location_address=room_data.location.address,
+            location_city=room_data.location.city,
+            location_postal_code=room_data.location.postalCode,
+            location_country=room_data.location.country,
+            location_lat=room_data.location.coordinates["lat"],
+            location_lng=room_data.location.coordinates["lng"],
+            amenities=[amenity.dict() for amenity in room_data.amenities],
+            services=[service.dict() for service in room_data.services],
+            images=[image.dict() for image in room_data.images],
+            availability_confirmation_required=room_data.availabilityConfirmationRequired,
+            rating=room_data.rating,
+            reviews=room_data.reviews,
+        )
+
+    @staticmethod
+    def _bump_catalog(*rooms):
+        """À appeler avant le commit de toute écriture sur les salles, dans la même transaction."""
+        catalog_versions.bump("rooms", *(f"room:{room.slug}" for room in rooms))
+
+    @staticmethod
+    def _catalog_changed(*rooms):
+        """À appeler après le commit de toute écriture sur les salles, avec les salles modifiées."""
+        catalog_cache.invalidate()
+        purge_surrogate_keys(["rooms", *(f"room-{room.slug}" for room in rooms)])
+        for listener in catalog_listeners:
+            for room in rooms:
+                listener(room)
+
+    @staticmethod
+    def _format_room_data(room, fields=None):
         """Formate les données d'une salle pour le frontend."""
+        if fields is not None:
+            return {field: ROOM_FIELDS[field][1](room) for field in fields}
+
         return {
             "id": room.id,
             "name": room.name,
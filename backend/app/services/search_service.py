@@ -0,0 +1,224 @@
+from app.models.room import Room
+from app.services.room_service import RoomService, catalog_listeners, catalog_resets
+from app.serialization import json_array
+from app import db
+from bisect import bisect_left, insort
+from collections import Counter
+from threading import Lock
+import heapq
+import math
+import re
+import unicodedata
+
+# Paramètres BM25
+K1 = 1.2
+B = 0.75
+
+# Poids de chaque champ dans la fréquence des termes (BM25F simplifié)
+FIELD_WEIGHTS = {
+    "name": 3,
+    "short_description": 2,
+    "description": 1,
+    "amenities": 2,
+    "location_city": 2,
+}
+
+# Nombre maximal de termes complétant le dernier mot saisi
+MAX_PREFIX_EXPANSIONS = 50
+
+STOPWORDS = frozenset(
+    "a au aux avec ce ces dans de des du en et est la le les l d un une par pour "
+    "sur ou qui que se sa son ses".split()
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text):
+    """Met en minuscules et retire les accents (« Équipée » -> « equipee »)."""
+    # Les ligatures ne sont pas séparées par la décomposition Unicode
+    text = text.lower().replace("œ", "oe").replace("æ", "ae")
+    decomposed = unicodedata.normalize("NFKD", text)
+    return decomposed.encode("ascii", "ignore").decode("ascii")
+
+
+def tokenize(text):
+    return [token for token in _TOKEN_RE.findall(fold(text)) if token not in STOPWORDS]
+
+
+def _document_terms(room):
+    """Fréquences pondérées des termes d'une salle."""
+    texts = {
+        "name": room.name,
+        "short_description": room.short_description,
+        "description": room.description,
+        "amenities": " ".join(amenity["name"] for amenity in room.amenities or ()),
+        "location_city": room.location_city,
+    }
+    terms = Counter()
+    for field, text in texts.items():
+        weight = FIELD_WEIGHTS[field]
+        for token, count in Counter(tokenize(text or "")).items():
+            terms[token] += count * weight
+    return terms
+
+
+class SearchIndex:
+    """Index inversé des salles avec classement BM25 et complétion du dernier mot.
+
+    Construit en une requête à la première recherche, puis mis à jour à
+    chaque création ou modification de salle.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._lock = Lock()
+        self._built = False
+
+    def _reset(self):
+        self.docs = []  # position -> (id, slug)
+        self.by_id = {}  # id -> position
+        self.doc_terms = []  # position -> Counter des termes
+        self.doc_lengths = []
+        self.total_length = 0
+        self.postings = {}  # terme -> {position: fréquence pondérée}
+        self.terms = []  # vocabulaire trié, pour la recherche par préfixe
+        self.impacts = {}  # terme -> {position: score BM25}, vidé à chaque écriture
+
+    def _ensure_built(self):
+        if self._built:
+            return
+        with self._lock:
+            if not self._built:
+                self._reset()
+                for room in self._loader():
+                    self._add(room)
+                self._built = True
+
+    def add(self, room):
+        """Ajoute ou met à jour une salle dans un index déjà construit."""
+        with self._lock:
+            if self._built:
+                self._add(room)
+
+    def _add(self, room):
+        position = self.by_id.get(room.id)
+        if position is None:
+            position = len(self.docs)
+            self.docs.append((room.id, room.slug))
+            self.doc_terms.append(Counter())
+            self.doc_lengths.append(0)
+            self.by_id[room.id] = position
+        else:
+            self._remove(position)
+            self.docs[position] = (room.id, room.slug)
+
+        self.impacts.clear()
+        terms = _document_terms(room)
+        self.doc_terms[position] = terms
+        length = sum(terms.values())
+        self.doc_lengths[position] = length
+        self.total_length += length
+        for term, frequency in terms.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                insort(self.terms, term)
+            posting[position] = frequency
+
+    def _remove(self, position):
+        for term in self.doc_terms[position]:
+            del self.postings[term][position]
+        self.total_length -= self.doc_lengths[position]
+
+    def clear(self):
+        with self._lock:
+            self._built = False
+
+    def _expand_prefix(self, prefix):
+        start = bisect_left(self.terms, prefix)
+        expansions = []
+        for term in self.terms[start : start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expansions.append(term)
+        return expansions
+
+    def _term_impacts(self, term):
+        """Score BM25 de chaque salle contenant `term`, calculé une fois par version de l'index."""
+        impacts = self.impacts.get(term)
+        if impacts is None:
+            posting = self.postings.get(term) or {}
+            count = len(self.docs)
+            average_length = (self.total_length / count if count else 0) or 1
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            lengths = self.doc_lengths
+            impacts = {
+                position: idf * frequency * (K1 + 1)
+                / (frequency + K1 * (1 - B + B * lengths[position] / average_length))
+                for position, frequency in posting.items()
+            }
+            self.impacts[term] = impacts
+        return impacts
+
+    def search(self, text, limit):
+        """Retourne jusqu'à `limit` couples (score, (id, slug)), du plus pertinent au moins pertinent.
+
+        Le dernier mot est complété par préfixe pour la saisie en cours.
+        """
+        self._ensure_built()
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+
+        with self._lock:
+            scores = {}
+            for i, token in enumerate(tokens):
+                # Complétion : le meilleur terme correspondant au préfixe compte
+                if i == len(tokens) - 1:
+                    candidates = self._expand_prefix(token)
+                else:
+                    candidates = [token]
+                impacts = [self._term_impacts(term) for term in candidates]
+                if len(impacts) == 1:
+                    best = impacts[0]
+                else:
+                    best = {}
+                    for term_impacts in impacts:
+                        for position, score in term_impacts.items():
+                            if score > best.get(position, 0):
+                                best[position] = score
+                if not scores:
+                    scores = dict(best)
+                else:
+                    for position, score in best.items():
+                        scores[position] = scores.get(position, 0) + score
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(score, self.docs[position]) for position, score in top]
+
+
+def _load_rooms_for_search():
+    return db.session.query(
+        Room.id,
+        Room.slug,
+        Room.name,
+        Room.short_description,
+        Room.description,
+        Room.amenities,
+        Room.location_city,
+    ).all()
+
+
+# Index plein texte, partagé par toutes les requêtes du processus
+search_index = SearchIndex(_load_rooms_for_search)
+catalog_listeners.append(search_index.add)
+catalog_resets.append(search_index.clear)
+
+
+class SearchService:
+    @staticmethod
+    def search_rooms_json(query):
+        """Recherche plein texte ; retourne le corps JSON des salles classées par pertinence."""
+        results = search_index.search(query.q, query.limit)
+        return json_array(RoomService._rooms_json([key for _, key in results], query.fields))
@@ -0,0 +1,128 @@
+from app import db
+from app.models.resource_version import ResourceVersion
+from sqlalchemy.dialects import postgresql, sqlite
+from threading import Lock
+import calendar
+import datetime
+import os
+import time
+
+
+class VersionCounters:
+    """Compteurs de version incrémentés à chaque écriture d'une ressource.
+
+    Les versions sont enregistrées en base (table resource_version) dans la
+    transaction de l'écriture : tous les workers et toutes les instances en
+    dérivent les mêmes ETags. Le processus en garde une copie locale, qui
+    valide les données dérivées en mémoire (JSON pré-sérialisé...) ; quand
+    `load_versions` lit une version changée par une autre instance, la copie
+    est mise à jour et les `listeners` sont appelés avec la clé.
+
+    Une version lue en base est réutilisée pendant `ttl` secondes sans
+    relire la table : une écriture d'un autre processus n'est vue qu'après
+    ce délai, une écriture du processus (`bump`) l'est immédiatement.
+    """
+
+    def __init__(self, ttl=0.0, clock=time.monotonic):
+        self._versions = {}
+        self._expires = {}
+        self._lock = Lock()
+        self.listeners = []
+        self.ttl = ttl
+        self._clock = clock
+
+    def get(self, key):
+        """Dernière version connue du processus, 0 si aucune."""
+        return self._versions.get(key, (0, 0.0))[0]
+
+    def modified_at(self, key):
+        """Horodatage (epoch) de la dernière écriture connue, 0 si aucune."""
+        return self._versions.get(key, (0, 0.0))[1]
+
+    def cached(self, key):
+        """Version et horodatage lus en base depuis moins de `ttl` secondes, sinon None."""
+        with self._lock:
+            if self._expires.get(key, 0.0) <= self._clock():
+                return None
+            return self._versions.get(key, (0, 0.0))
+
+    def bump(self, *keys):
+        """Incrémente les versions en base, dans la transaction en cours (à valider par l'appelant)."""
+        keys = sorted(set(keys))
+        if not keys:
+            return
+        with self._lock:
+            # Relues à la prochaine requête : le processus voit ses propres écritures
+            for key in keys:
+                self._expires.pop(key, None)
+        now = datetime.datetime.utcnow()
+        table = ResourceVersion.__table__
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = insert(table).values([{"key": key, "version": 1, "updated_at": now} for key in keys])
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={"version": table.c.version + 1, "updated_at": now},
+            ))
+            return
+        for key in keys:
+            updated = db.session.execute(
+                table.update().where(table.c.key == key).values(version=table.c.version + 1, updated_at=now)
+            )
+            if not updated.rowcount:
+                db.session.execute(table.insert().values(key=key, version=1, updated_at=now))
+
+    def observe(self, key, version, modified_at):
+        """Met à jour la copie locale ; retourne True si la version a changé."""
+        with self._lock:
+            self._expires[key] = self._clock() + self.ttl
+            if self._versions.get(key, (0, 0.0))[0] == version:
+                return False
+            self._versions[key] = (version, modified_at)
+        for listener in self.listeners:
+            listener(key)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+            self._expires.clear()
+
+
+def load_versions(versions):
+    """Lit en une requête les versions de couples (VersionCounters, clé).
+
+    Retourne une liste de couples (version, horodatage epoch) dans l'ordre
+    de `versions` ; une clé jamais écrite vaut (0, 0). Les versions encore
+    valides dans leur VersionCounters (voir `ttl`) ne sont pas relues :
+    aucune requête si toutes le sont.
+    """
+    loaded = [counters.cached(key) for counters, key in versions]
+    keys = {key for (_, key), cached in zip(versions, loaded) if cached is None}
+    if not keys:
+        return loaded
+    rows = {
+        key: (version, calendar.timegm(updated_at.utctimetuple()))
+        for key, version, updated_at in db.session.query(
+            ResourceVersion.key, ResourceVersion.version, ResourceVersion.updated_at
+        ).filter(ResourceVersion.key.in_(keys))
+    }
+    for index, (counters, key) in enumerate(versions):
+        if loaded[index] is None:
+            version, modified_at = rows.get(key, (0, 0))
+            counters.observe(key, version, modified_at)
+            loaded[index] = (version, modified_at)
+    return loaded
+
+
+# Durée (s) pendant laquelle une version lue en base est réutilisée par le
+# processus : borne le retard des ETags sur les écritures des autres workers
+VERSION_CACHE_TTL = float(os.getenv("VERSION_CACHE_TTL", "5"))
+
+
+# Version du catalogue ("rooms") et de chaque salle ("room:<slug>")
+catalog_versions = VersionCounters(ttl=VERSION_CACHE_TTL)
+
+# Version des réservations de chaque utilisateur ("user:<id>") et de chaque date ("date:<iso>")
+booking_versions = VersionCounters(ttl=VERSION_CACHE_TTL)
@@ -0,0 +1,43 @@
+from threading import Thread
+import time
+
+
+def warm_up_catalog(app):
+    """Charge le catalogue et les index de salles avant les premières requêtes.
+
+    Remplit le JSON de GET /api/rooms et construit les index de facettes, de
+    recherche et géographique, sinon construits par la première requête qui
+    en a besoin. Retourne la durée en secondes.
+    """
+    from app.services.facet_service import facet_index
+    from app.services.geo_service import geo_index
+    from app.services.room_service import RoomService
+    from app.services.search_service import search_index
+    from app.versioning import catalog_versions, load_versions
+
+    began = time.perf_counter()
+    with app.app_context():
+        # Version lue avant le catalogue : la première requête ne vide pas le cache
+        load_versions([(catalog_versions, "rooms")])
+        RoomService.get_all_rooms_json()
+        # Les index se construisent paresseusement à la première recherche
+        facet_index._ensure_built()
+        search_index._ensure_built()
+        geo_index._grid()
+    return time.perf_counter() - began
+
+
+def start_catalog_warmup(app):
+    """Lance warm_up_catalog dans un thread, sans retarder la première réponse."""
+
+    def run():
+        try:
+            elapsed = warm_up_catalog(app)
+        except Exception:
+            app.logger.exception("Échec du préchargement du catalogue")
+        else:
+            app.logger.info("Catalogue préchargé en %.2f s", elapsed)
+
+    thread = Thread(target=run, name="catalog-warmup", daemon=True)
+    thread.start()
+    return thread
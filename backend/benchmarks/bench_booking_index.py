@@ -0,0 +1,158 @@
+"""Benchmark de l'insertion d'une réservation quand l'historique d'une salle grandit.
+
+Mesure `BookingService.create_booking` de bout en bout sur une base SQLite
+réelle : verrou de la salle, relecture des créneaux du jour (`reload`),
+insertion et commit. L'historique de la salle est agrandi d'une taille à la
+suivante ; pour comparaison, le parcours naïf relit tout l'historique de la
+salle avant chaque insertion. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_booking_index
+    python -m benchmarks.bench_booking_index --sizes 1000,100000,500000 --db /tmp/bench-index.db
+"""
+import argparse
+import datetime
+import random
+import statistics
+import time
+import uuid
+
+from benchmarks.data import create_bench_app, seed_rooms, seed_users
+
+SLOTS_PER_DAY = 8  # créneaux d'une heure de 8h à 16h
+FIRST_DAY = datetime.date(2000, 1, 1)
+
+
+def grow_history(app, room_id, user_id, start, stop, batch_size=50000):
+    """Ajoute à la salle les réservations d'une heure numéro `start` à `stop` (8 par jour)."""
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking
+
+    now = datetime.datetime(2025, 1, 1)
+    with app.app_context():
+        for first in range(start, stop, batch_size):
+            rows = []
+            for n in range(first, min(first + batch_size, stop)):
+                hour = 8 + n % SLOTS_PER_DAY
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "room_id": room_id,
+                    "user_id": user_id,
+                    "date": FIRST_DAY + datetime.timedelta(days=n // SLOTS_PER_DAY),
+                    "start_time": datetime.time(hour),
+                    "end_time": datetime.time(hour + 1),
+                    "is_full_day": False,
+                    "attendees": 2,
+                    "services": [],
+                    "total_price": 50.0,
+                    "status": "confirmed",
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            db.session.execute(insert(Booking), rows)
+            db.session.commit()
+
+
+def naive_create(room_id, booking_data):
+    """Insertion après un parcours de tout l'historique de la salle (sans index)."""
+    from app import db
+    from app.models.booking import Booking
+    from app.services.booking_index import booking_bounds
+    from app.services.booking_service import BookingService
+    from app.models.room import Room
+
+    room = Room.query.filter_by(id=room_id).with_for_update().first_or_404()
+    start, end = booking_bounds(booking_data.is_full_day, booking_data.start_time, booking_data.end_time)
+    for day, start_time, end_time, is_full_day in db.session.query(
+        Booking.date, Booking.start_time, Booking.end_time, Booking.is_full_day
+    ).filter(Booking.room_id == room_id, Booking.status != "cancelled"):
+        b_start, b_end = booking_bounds(is_full_day, start_time, end_time)
+        if day == booking_data.date and b_start < end and b_end > start:
+            db.session.rollback()
+            return 409
+    db.session.add(Booking(**BookingService._booking_columns(booking_data, room)))
+    db.session.commit()
+    return 201
+
+
+def measure(app, room_id, user_id, size, requests, rng, naive):
+    """Médiane et p95 (ms) des insertions acceptées et refusées, pour l'historique courant."""
+    from app import db
+    from app.schemas.booking import BookingCreate
+    from app.services.booking_service import BookingService, booking_index
+
+    last_day = FIRST_DAY + datetime.timedelta(days=(size - 1) // SLOTS_PER_DAY)
+    timings = {201: [], 409: []}
+    with app.app_context():
+        for _ in range(requests):
+            # Moitié sur des jours de l'historique (conflit), moitié sur des jours libres
+            day = last_day + datetime.timedelta(days=rng.randint(-30, 30))
+            hour = rng.randint(8, 15)
+            booking_data = BookingCreate(
+                room_id=room_id,
+                user_id=user_id,
+                date=day,
+                start_time=datetime.time(hour),
+                end_time=datetime.time(hour + 1),
+                attendees=2,
+                total_price=50.0,
+            )
+            booking_index.clear()
+            db.session.remove()
+            began = time.perf_counter()
+            if naive:
+                status = naive_create(room_id, booking_data)
+            else:
+                status = BookingService.create_booking(booking_data)[1]
+            timings[status].append((time.perf_counter() - began) * 1000)
+    return {status: _summary(values) for status, values in timings.items()}
+
+
+def _summary(values):
+    if not values:
+        return None
+    values.sort()
+    return statistics.median(values), values[max(int(len(values) * 0.95) - 1, 0)]
+
+
+def _cell(summary):
+    return "-" if summary is None else f"{summary[0]:.2f} / {summary[1]:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", default="1000,10000,100000,300000",
+        help="tailles d'historique croissantes, séparées par des virgules",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--naive-max", type=int, default=100000,
+                        help="taille maximale pour le parcours naïf")
+    parser.add_argument("--db", help="fichier SQLite (doit être vide)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db)
+    seed_rooms(app, 1)
+    (user_id,) = seed_users(app, 1)
+    from app.models.room import Room
+
+    with app.app_context():
+        room_id = Room.query.with_entities(Room.id).scalar()
+
+    rng = random.Random(args.seed)
+    print("médiane / p95 en ms")
+    print(f"{'historique':>12} {'créée':>16} {'conflit':>16} {'naïf, créée':>16}")
+    size = 0
+    for target in sorted(int(s) for s in args.sizes.split(",")):
+        grow_history(app, room_id, user_id, size, target)
+        size = target
+        indexed = measure(app, room_id, user_id, size, args.requests, rng, naive=False)
+        naive = None
+        if size <= args.naive_max:
+            naive = measure(app, room_id, user_id, size, max(args.requests // 10, 10), rng, naive=True)[201]
+        print(f"{size:>12} {_cell(indexed[201]):>16} {_cell(indexed[409]):>16} {_cell(naive):>16}")
+
+
+if __name__ == "__main__":
+    main()
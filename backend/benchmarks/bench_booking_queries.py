@@ -0,0 +1,117 @@
+"""Benchmark des requêtes de réservation avant et après les index de la migration 0003.
+
+Crée une base SQLite au schéma initial (migration 0001, sans index
+secondaire), insère les réservations synthétiques, mesure les requêtes
+fréquentes, applique les migrations jusqu'à head puis mesure à nouveau.
+Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_booking_queries --bookings 1000000
+"""
+import argparse
+import datetime
+import os
+import random
+import statistics
+import time
+
+from benchmarks.data import DAYS, FIRST_DAY, create_bench_app, seed_bookings, seed_rooms, seed_users
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic")
+
+
+def migrate(revision):
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    command.upgrade(config, revision)
+
+
+def scenarios(room_ids, user_ids, rng):
+    from app.services.availability_service import _load_day_occupancy
+    from app.services.booking_service import BookingService, _load_day_intervals, _load_intervals_bulk
+    from app.services.export_service import ExportService
+    from app.schemas.booking import BookingExportQuery
+
+    def day():
+        return FIRST_DAY + datetime.timedelta(days=rng.randrange(DAYS))
+
+    def export_month():
+        start = day()
+        query = BookingExportQuery(status="pending", start=start, end=start + datetime.timedelta(days=30))
+        for _ in ExportService.export_bookings(query):
+            pass
+
+    return [
+        ("créneaux d'une salle et d'une date", lambda: _load_day_intervals(rng.choice(room_ids), day())),
+        ("créneaux groupés (20 couples)", lambda: _load_intervals_bulk(
+            [(rng.choice(room_ids), day()) for _ in range(20)]
+        )),
+        ("occupation de toutes les salles", lambda: _load_day_occupancy(day())),
+        ("historique utilisateur, page de 20", lambda: BookingService.get_user_bookings(
+            rng.choice(user_ids), limit=20
+        )),
+        ("historique utilisateur, un mois", lambda: BookingService.get_user_bookings(
+            rng.choice(user_ids), start=FIRST_DAY, end=FIRST_DAY + datetime.timedelta(days=30)
+        )),
+        ("export des réservations en attente, un mois", export_month),
+    ]
+
+
+def measure(app, room_ids, user_ids, repeat):
+    from app import db
+
+    results = {}
+    with app.app_context():
+        for label, run in scenarios(room_ids, user_ids, random.Random(7)):
+            timings = []
+            for _ in range(repeat):
+                began = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - began)
+                db.session.rollback()
+            timings.sort()
+            results[label] = (statistics.median(timings), timings[int(len(timings) * 0.95) - 1])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=1000000)
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Le schéma vient uniquement des migrations
+    os.environ["DB_CREATE_ALL"] = "false"
+    app = create_bench_app()
+    migrate("0001")
+
+    began = time.perf_counter()
+    seed_rooms(app, args.rooms)
+    user_ids = seed_users(app, args.users)
+    from app.models.room import Room
+    with app.app_context():
+        room_ids = [room_id for room_id, in Room.query.with_entities(Room.id)]
+    seed_bookings(app, args.bookings, room_ids, user_ids)
+    print(f"{args.bookings} réservations insérées en {time.perf_counter() - began:.1f} s")
+
+    before = measure(app, room_ids, user_ids, args.repeat)
+    began = time.perf_counter()
+    migrate("head")
+    print(f"migrations jusqu'à head en {time.perf_counter() - began:.1f} s")
+    after = measure(app, room_ids, user_ids, args.repeat)
+
+    print(f"{'requête':<44} {'avant méd/p95 (ms)':>20} {'après méd/p95 (ms)':>20}")
+    for label, (median, p95) in before.items():
+        median_after, p95_after = after[label]
+        print(
+            f"{label:<44} {median * 1000:>9.2f}/{p95 * 1000:<10.2f}"
+            f" {median_after * 1000:>9.2f}/{p95_after * 1000:<10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark de la recherche « salles autour de moi ».
+
+Compare la grille `GeoGridIndex` à un parcours complet avec haversine sur
+des salles synthétiques. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_geo_index --rooms 100000
+"""
+import argparse
+import heapq
+import random
+import statistics
+import time
+
+from app.services.geo_service import GeoGridIndex, haversine_km
+from benchmarks.data import CITIES
+
+
+def brute_force(points, lat, lng, radius_km, limit):
+    distances = (
+        (haversine_km(lat, lng, p_lat, p_lng), room_id) for room_id, p_lat, p_lng in points
+    )
+    return heapq.nsmallest(limit, (d for d in distances if d[0] <= radius_km))
+
+
+def timed(func, queries):
+    timings = []
+    for query in queries:
+        began = time.perf_counter()
+        func(*query)
+        timings.append(time.perf_counter() - began)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Salles concentrées autour des grandes villes, comme le catalogue réel
+    points = []
+    for n in range(args.rooms):
+        _, _, lat, lng = rng.choice(CITIES)
+        points.append((f"room-{n}", rng.gauss(lat, 0.3), rng.gauss(lng, 0.3)))
+
+    began = time.perf_counter()
+    index = GeoGridIndex(lambda: points)
+    index.nearest(0, 0, 1, 1)
+    print(f"{args.rooms} salles, construction de la grille : {time.perf_counter() - began:.2f} s")
+
+    print(f"{'rayon (km)':>10} {'grille p50/p99 (ms)':>22} {'parcours p50/p99 (ms)':>24}")
+    for radius_km in (2, 10, 50):
+        queries = []
+        for _ in range(args.queries):
+            _, _, lat, lng = rng.choice(CITIES)
+            queries.append((rng.gauss(lat, 0.2), rng.gauss(lng, 0.2), radius_km, args.limit))
+        grid = timed(index.nearest, queries)
+        brute = timed(lambda *q: brute_force(points, *q), queries[: max(10, args.queries // 20)])
+        print(
+            f"{radius_km:>10} {grid[0] * 1000:>10.2f} / {grid[1] * 1000:<9.2f}"
+            f" {brute[0] * 1000:>11.1f} / {brute[1] * 1000:<9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark des configurations de gunicorn sous le mélange de trafic de bench_load.
+
+Chaque configuration est lancée via gunicorn.conf.py (variables GUNICORN_*),
+chauffée puis chargée pendant la même durée avec le même mélange :
+catalogue, fiches salles, connexions (hachage scrypt) et réservations. La
+première ligne reproduit l'ancien lancement (un seul worker sync, sans
+préchargement). Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_gunicorn --scale 100k --db /tmp/bench-100k.db --seconds 20 --concurrency 16
+"""
+import argparse
+import datetime
+import importlib.util
+import itertools
+import time
+
+from benchmarks.bench_load import generate_mix, http_sender, report, route_templates, run, start_gunicorn
+from benchmarks.data import DAYS, FIRST_DAY, SCALES, create_bench_app, load_or_seed
+
+CONFIGURATIONS = [
+    ("sync x1 (ancien CMD)", {
+        "GUNICORN_WORKERS": "1", "GUNICORN_PRELOAD": "false", "GUNICORN_MAX_REQUESTS": "0",
+    }),
+    ("sync x1 (défaut)", {}),
+    ("sync, workers auto", {"GUNICORN_WORKERS": "auto"}),
+    ("gthread x1, 8 threads", {
+        "GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_WORKERS": "1", "GUNICORN_THREADS": "8",
+    }),
+    ("gthread auto", {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_WORKERS": "auto"}),
+    ("gevent, workers auto", {"GUNICORN_WORKER_CLASS": "gevent", "GUNICORN_WORKERS": "auto"}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--db", help="fichier SQLite à réutiliser (peuplé au premier run)")
+    parser.add_argument("--mix-size", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db)
+    load_or_seed(app, args.scale)
+    db_path = app.config["SQLALCHEMY_DATABASE_URI"].removeprefix("sqlite:///")
+    records = generate_mix(app, args.mix_size)
+    templates = route_templates(app, records)
+
+    rows = []
+    for label, env in CONFIGURATIONS:
+        if env.get("GUNICORN_WORKER_CLASS") == "gevent" and importlib.util.find_spec("gevent") is None:
+            print(f"{label} : ignoré, gevent n'est pas installé")
+            continue
+        began = time.perf_counter()
+        process = start_gunicorn(db_path, "", args.port, env)
+        boot = time.perf_counter() - began
+        make_sender = http_sender(f"http://127.0.0.1:{args.port}")
+        # Chaque configuration rejoue le mélange depuis le début, sur une base identique
+        position = itertools.count()
+        try:
+            run(make_sender, records, templates, args.concurrency, args.warmup, position)
+            results, elapsed = run(make_sender, records, templates, args.concurrency, args.seconds, position)
+        finally:
+            process.terminate()
+            process.wait()
+            from app import db
+            from app.models.booking import Booking
+            with app.app_context():
+                Booking.query.filter(Booking.date >= FIRST_DAY + datetime.timedelta(days=DAYS)).delete()
+                db.session.commit()
+        rows.append((label, boot, report(results, elapsed)))
+
+    print(f"{args.concurrency} clients, {args.seconds:.0f} s par configuration, échelle {args.scale}")
+    print(
+        f"{'configuration':<24} {'démarrage':>10} {'req/s':>8} {'p50':>7} {'p95':>7} {'p99':>8}"
+        f" {'catalogue p95':>14} {'connexion p95':>14} {'erreurs':>8}"
+    )
+    for label, boot, summary in rows:
+        total = summary["total"]
+        catalog = summary.get("GET /api/rooms", {}).get("p95_ms", float("nan"))
+        login = summary.get("POST /api/auth/login", {}).get("p95_ms", float("nan"))
+        print(
+            f"{label:<24} {boot * 1000:>8.0f}ms {total['throughput']:>8.1f} {total['p50_ms']:>7.1f}"
+            f" {total['p95_ms']:>7.1f} {total['p99_ms']:>8.1f} {catalog:>14.1f} {login:>14.1f}"
+            f" {total['error_rate']:>8.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""Test de charge HTTP de l'application complète, en rejouant un mélange de trafic enregistré.
+
+Les requêtes d'un journal NDJSON (une requête par ligne : method, path,
+body facultatif) sont rejouées en boucle par --concurrency clients, soit
+directement sur l'application WSGI de create_app() (par défaut), soit sur
+un gunicorn local lancé pour l'occasion (--gunicorn) ou déjà démarré
+(--url). Le rapport donne le débit, les latences p50/p95/p99 et les taux
+d'erreurs par modèle de route. Sans --mix, un mélange représentatif
+(catalogue, fiches salles, connexions, réservations) est généré ; --save-mix
+l'écrit pour le modifier ou le réutiliser. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_load --scale 100k --db /tmp/bench-100k.db --seconds 20 --concurrency 16
+    python -m benchmarks.bench_load --db /tmp/bench-100k.db --gunicorn "-w 4 --threads 4"
+"""
+import argparse
+import datetime
+import http.client
+import itertools
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+from benchmarks.data import DAYS, FIRST_DAY, PASSWORD, SCALES, create_bench_app, load_or_seed
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Part de chaque type de requête dans le mélange généré
+MIX_WEIGHTS = [
+    ("catalogue", 40),
+    ("fiche salle", 40),
+    ("connexion", 5),
+    ("réservation", 15),
+]
+
+
+def percentile(timings, fraction):
+    if not timings:
+        return float("nan")
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def generate_mix(app, size, seed=7):
+    """Mélange de `size` requêtes sur les données de la base, au format du journal NDJSON."""
+    from app import db
+    from app.models.room import Room
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    with app.app_context():
+        slugs = [slug for slug, in db.session.query(Room.slug)]
+        room_ids = [room_id for room_id, in db.session.query(Room.id)]
+        users = [(user_id, email) for user_id, email in db.session.query(User.id, User.email)]
+
+    kinds = [kind for kind, weight in MIX_WEIGHTS for _ in range(weight)]
+    # Chaque réservation vise un couple (salle, date) distinct, après les données synthétiques
+    booking_days = itertools.count(DAYS)
+    records = []
+    for _ in range(size):
+        kind = rng.choice(kinds)
+        if kind == "catalogue":
+            records.append({"method": "GET", "path": "/api/rooms?limit=24"})
+        elif kind == "fiche salle":
+            records.append({"method": "GET", "path": f"/api/rooms/{rng.choice(slugs)}"})
+        elif kind == "connexion":
+            _, email = rng.choice(users)
+            records.append({"method": "POST", "path": "/api/auth/login", "body": {"email": email, "password": PASSWORD}})
+        else:
+            user_id, _ = rng.choice(users)
+            records.append({"method": "POST", "path": "/api/bookings/", "body": {
+                "room_id": rng.choice(room_ids),
+                "user_id": user_id,
+                "date": (FIRST_DAY + datetime.timedelta(days=next(booking_days))).isoformat(),
+                "start_time": "09:00",
+                "end_time": "11:00",
+                "attendees": 2,
+                "total_price": 100.0,
+            }})
+    return records
+
+
+def read_mix(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def write_mix(path, records):
+    with open(path, "w", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def route_templates(app, records):
+    """Modèle de route (/api/rooms/<slug>) de chaque requête du mélange."""
+    adapter = app.url_map.bind("localhost")
+    templates = []
+    for record in records:
+        path = urllib.parse.urlsplit(record["path"]).path
+        try:
+            rule, _ = adapter.match(path, method=record["method"], return_rule=True)
+            templates.append(f"{record['method']} {rule.rule}")
+        except Exception:
+            templates.append(f"{record['method']} <unmatched>")
+    return templates
+
+
+def wsgi_sender(app):
+    """Envoie les requêtes à l'application WSGI, dans le processus (un client par thread)."""
+    def make():
+        client = app.test_client()
+
+        def send(record):
+            return client.open(record["path"], method=record["method"], json=record.get("body")).status_code
+        return send
+    return make
+
+
+def http_sender(url):
+    """Envoie les requêtes à un serveur HTTP, une connexion persistante par thread."""
+    target = urllib.parse.urlsplit(url)
+
+    def make():
+        connection = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+
+        def send(record):
+            body = record.get("body")
+            headers = {"Content-Type": "application/json"} if body is not None else {}
+            try:
+                connection.request(record["method"], record["path"], json.dumps(body) if body is not None else None, headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                raise
+            return response.status
+        return send
+    return make
+
+
+def run(make_sender, records, templates, concurrency, seconds, position):
+    """Rejoue le mélange en boucle pendant `seconds` à partir de `position` ; retourne les mesures par modèle de route."""
+    stop = time.monotonic() + seconds
+    results = {}
+    lock = threading.Lock()
+
+    def worker():
+        send = make_sender()
+        local = {}
+        while time.monotonic() < stop:
+            i = next(position) % len(records)
+            began = time.perf_counter()
+            try:
+                status = send(records[i])
+            except (OSError, http.client.HTTPException):
+                status = None
+            elapsed = time.perf_counter() - began
+            route = local.setdefault(templates[i], {"timings": [], "4xx": 0, "errors": 0})
+            route["timings"].append(elapsed)
+            if status is None or status >= 500:
+                route["errors"] += 1
+            elif status >= 400:
+                route["4xx"] += 1
+        with lock:
+            for template, route in local.items():
+                total = results.setdefault(template, {"timings": [], "4xx": 0, "errors": 0})
+                total["timings"].extend(route["timings"])
+                total["4xx"] += route["4xx"]
+                total["errors"] += route["errors"]
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - began
+
+
+def report(results, elapsed):
+    """Résumé par modèle de route (débit, latences en ms, taux d'erreurs), plus une ligne « total »."""
+    summary = {}
+    everything = {"timings": [], "4xx": 0, "errors": 0}
+    for template, route in sorted(results.items()) + [("total", everything)]:
+        if template != "total":
+            everything["timings"].extend(route["timings"])
+            everything["4xx"] += route["4xx"]
+            everything["errors"] += route["errors"]
+        timings = sorted(route["timings"])
+        count = len(timings)
+        summary[template] = {
+            "requests": count,
+            "throughput": round(count / elapsed, 1),
+            "p50_ms": round(percentile(timings, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(timings, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(timings, 0.99) * 1000, 2),
+            "4xx_rate": round(route["4xx"] / count, 4) if count else 0,
+            "error_rate": round(route["errors"] / count, 4) if count else 0,
+        }
+    return summary
+
+
+def start_gunicorn(db_path, options, port, env=None):
+    """Lance `gunicorn run:app` sur la base du benchmark et attend qu'il réponde.
+
+    `env` complète l'environnement (variables GUNICORN_* lues par gunicorn.conf.py).
+    """
+    env = dict(os.environ, **(env or {}), DATABASE_URL=f"sqlite:///{db_path}")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", *shlex.split(options), "run:app"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn s'est arrêté (code {process.returncode})")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/hello")
+            connection.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn ne répond pas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--db", help="fichier SQLite à réutiliser (peuplé au premier run)")
+    parser.add_argument("--mix", help="journal NDJSON des requêtes à rejouer")
+    parser.add_argument("--mix-size", type=int, default=5000)
+    parser.add_argument("--save-mix", help="écrit le mélange généré dans ce fichier")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=1, help="secondes de chauffe non mesurées")
+    parser.add_argument("--gunicorn", metavar="OPTIONS", help='lance gunicorn avec ces options, ex. "-w 4 --threads 2"')
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="serveur déjà démarré, ex. http://127.0.0.1:8080")
+    parser.add_argument("--output", help="fichier JSON du rapport")
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db)
+    load_or_seed(app, args.scale)
+    db_path = app.config["SQLALCHEMY_DATABASE_URI"].removeprefix("sqlite:///")
+
+    records = read_mix(args.mix) if args.mix else generate_mix(app, args.mix_size)
+    if args.save_mix:
+        write_mix(args.save_mix, records)
+    templates = route_templates(app, records)
+
+    process = None
+    if args.gunicorn is not None:
+        process = start_gunicorn(db_path, args.gunicorn, args.port)
+        make_sender = http_sender(f"http://127.0.0.1:{args.port}")
+        target = f"gunicorn {args.gunicorn}"
+    elif args.url:
+        make_sender = http_sender(args.url)
+        target = args.url
+    else:
+        make_sender = wsgi_sender(app)
+        target = "WSGI dans le processus"
+
+    # La mesure reprend le mélange là où la chauffe s'est arrêtée
+    position = itertools.count()
+    try:
+        if args.warmup:
+            run(make_sender, records, templates, args.concurrency, args.warmup, position)
+        results, elapsed = run(make_sender, records, templates, args.concurrency, args.seconds, position)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        # Les réservations créées par le mélange sont retirées pour réutiliser la base
+        from app import db
+        from app.models.booking import Booking
+        with app.app_context():
+            Booking.query.filter(Booking.date >= FIRST_DAY + datetime.timedelta(days=DAYS)).delete()
+            db.session.commit()
+
+    summary = report(results, elapsed)
+    print(f"{target}, {args.concurrency} clients, {len(records)} requêtes dans le mélange, {elapsed:.1f} s")
+    print(
+        f"{'route':<36} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}"
+        f" {'4xx':>6} {'erreurs':>8}"
+    )
+    for template, route in summary.items():
+        print(
+            f"{template:<36} {route['throughput']:>8.1f} {route['p50_ms']:>9.2f}"
+            f" {route['p95_ms']:>9.2f} {route['p99_ms']:>9.2f}"
+            f" {route['4xx_rate']:>6.1%} {route['error_rate']:>8.1%}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({
+                "target": target,
+                "concurrency": args.concurrency,
+                "seconds": round(elapsed, 2),
+                "routes": summary,
+            }, handle, indent=2, ensure_ascii=False)
+            handle.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark d'une charge mixte connexion + catalogue, hachage en ligne contre pool borné.
+
+Des threads enchaînent des connexions pendant que d'autres lisent le
+catalogue, comme dans un worker gunicorn à threads. Chaque configuration
+du hachage des mots de passe est mesurée pendant la même durée.
+Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_mixed_login --seconds 10
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.data import create_bench_app, seed_rooms
+
+
+def percentile(timings, fraction):
+    if not timings:
+        return float("nan")
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+def seed_users(app, count, password):
+    from app import db
+    from app.models.user import User
+
+    with app.app_context():
+        for n in range(count):
+            user = User(email=f"user{n}@example.com", first_name="Bench", last_name=str(n))
+            user.set_password(password)
+            db.session.add(user)
+        db.session.commit()
+
+
+def run(app, seconds, login_threads, catalog_threads, users, slugs):
+    stop = time.monotonic() + seconds
+    results = {"login": [], "catalog": [], "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(kind, n):
+        client = app.test_client()
+        timings = []
+        rejected = errors = 0
+        i = n
+        while time.monotonic() < stop:
+            began = time.perf_counter()
+            if kind == "login":
+                response = client.post(
+                    "/api/auth/login",
+                    json={"email": f"user{i % users}@example.com", "password": "password123"},
+                )
+            else:
+                response = client.get(f"/api/rooms/{slugs[i % len(slugs)]}")
+            elapsed = time.perf_counter() - began
+            i += 1
+            if response.status_code == 503:
+                rejected += 1
+                # Un client réel attendrait Retry-After avant de réessayer
+                time.sleep(0.1)
+            elif response.status_code != 200:
+                errors += 1
+            else:
+                timings.append(elapsed)
+        with lock:
+            results[kind].extend(timings)
+            results["rejected"] += rejected
+            results["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=("login", n)) for n in range(login_threads)]
+    threads += [threading.Thread(target=worker, args=("catalog", n)) for n in range(catalog_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--login-threads", type=int, default=8)
+    parser.add_argument("--catalog-threads", type=int, default=8)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rooms", type=int, default=500)
+    parser.add_argument("--method", default="scrypt:32768:8:1")
+    args = parser.parse_args()
+
+    import app.passwords as passwords
+    from app.cache import catalog_cache
+
+    app = create_bench_app()
+    seed_rooms(app, args.rooms)
+    passwords.password_hasher = passwords.PasswordHasher(args.method, workers=0)
+    seed_users(app, args.users, "password123")
+    slugs = [f"salle-{n:07d}" for n in range(args.rooms)]
+
+    configurations = [
+        ("en ligne", dict(workers=0)),
+        ("pool 1 + file 2", dict(workers=1, queue_size=2)),
+        ("pool 2 + file 4", dict(workers=2, queue_size=4)),
+    ]
+    print(f"{args.login_threads} threads connexion, {args.catalog_threads} threads catalogue, {args.method}")
+    print(
+        f"{'hachage':<18} {'connexions/s':>12} {'p50 (ms)':>9} {'p99 (ms)':>9}"
+        f" {'503':>6} {'catalogue/s':>12} {'p50 (ms)':>9} {'p99 (ms)':>9}"
+    )
+    for label, options in configurations:
+        passwords.password_hasher = passwords.PasswordHasher(args.method, **options)
+        catalog_cache.clear()
+        results = run(app, args.seconds, args.login_threads, args.catalog_threads, args.users, slugs)
+        login, catalog = results["login"], results["catalog"]
+        print(
+            f"{label:<18} {len(login) / args.seconds:>12.1f}"
+            f" {percentile(login, 0.5) * 1000:>9.1f} {percentile(login, 0.99) * 1000:>9.1f}"
+            f" {results['rejected']:>6} {len(catalog) / args.seconds:>12.1f}"
+            f" {percentile(catalog, 0.5) * 1000:>9.1f} {percentile(catalog, 0.99) * 1000:>9.1f}"
+        )
+        assert results["errors"] == 0, results["errors"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Micro-benchmark de la sérialisation du catalogue.
+
+Compare le chemin historique `_format_room_data` + `jsonify` à l'assemblage
+de documents JSON pré-sérialisés. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_room_json --rooms 5000
+"""
+import argparse
+import timeit
+
+from flask import jsonify
+
+from app.models.room import Room
+from app.serialization import dumps, json_array, orjson
+from app.services.room_service import RoomService
+from benchmarks.data import create_bench_app, room_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    # Salles en mémoire uniquement : on ne mesure que la sérialisation
+    rooms = [Room(**row) for row in room_rows(args.rooms)]
+
+    with app.app_context():
+        def format_and_jsonify():
+            return jsonify([RoomService._format_room_data(room) for room in rooms]).get_data()
+
+        def serialize_each():
+            return [dumps(RoomService._format_room_data(room)) for room in rooms]
+
+        chunks = serialize_each()
+
+        def splice():
+            return json_array(chunks)
+
+        scenarios = [
+            ("_format_room_data + jsonify", format_and_jsonify),
+            ("première sérialisation par salle", serialize_each),
+            ("assemblage des octets en cache", splice),
+        ]
+        print(f"{args.rooms} salles, encodeur : {'orjson' if orjson else 'json'}")
+        print(f"{'chemin':<34} {'ms / réponse':>14}")
+        for label, func in scenarios:
+            best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+            print(f"{label:<34} {best * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
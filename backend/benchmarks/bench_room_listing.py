@@ -0,0 +1,60 @@
+"""Benchmark de GET /api/rooms : liste complète contre pagination et projection.
+
+Mesure la taille de la réponse et la latence sur un catalogue SQLite
+synthétique. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_room_listing --rooms 50000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.data import create_bench_app, seed_rooms
+
+CARD_FIELDS = "name,slug,shortDescription,pricePerHour,pricePerDay,featuredImage"
+
+
+def measure(client, url, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        began = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - began)
+        assert response.status_code == 200, response.status_code
+        size = len(response.data)
+    return size, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=24)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    seed_rooms(app, args.rooms)
+    client = app.test_client()
+
+    # Curseur au milieu du catalogue pour mesurer une page quelconque
+    middle = f"salle-{args.rooms // 2:07d}"
+    scenarios = [
+        ("liste complète", "/api/rooms"),
+        ("liste complète, champs carte", f"/api/rooms?fields={CARD_FIELDS}"),
+        (f"page de {args.limit}", f"/api/rooms?limit={args.limit}&cursor={middle}"),
+        (
+            f"page de {args.limit}, champs carte",
+            f"/api/rooms?limit={args.limit}&cursor={middle}&fields={CARD_FIELDS}",
+        ),
+    ]
+
+    print(f"{args.rooms} salles")
+    print(f"{'scénario':<36} {'taille (Ko)':>12} {'médiane (ms)':>14}")
+    for label, url in scenarios:
+        size, latency = measure(client, url, args.repeat)
+        print(f"{label:<36} {size / 1024:>12.1f} {latency * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark de la recherche plein texte sur le catalogue.
+
+Construit l'index `SearchIndex` sur un corpus synthétique et mesure la
+latence (p50/p99) de requêtes complètes et de saisies en cours. Lancer
+depuis le dossier backend :
+
+    python -m benchmarks.bench_search --rooms 50000
+"""
+import argparse
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from app.services.search_service import SearchIndex
+from benchmarks.data import AMENITIES, CITIES, WORDS, room_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rooms = [SimpleNamespace(**row) for row in room_rows(args.rooms, seed=args.seed)]
+    index = SearchIndex(lambda: rooms)
+    began = time.perf_counter()
+    index.search("salle", 1)
+    print(f"{args.rooms} salles, construction de l'index : {time.perf_counter() - began:.1f} s")
+
+    rng = random.Random(args.seed)
+    vocabulary = WORDS + [name for _, name in AMENITIES] + [city for city, *_ in CITIES]
+    scenarios = {
+        "1 mot": lambda: rng.choice(vocabulary),
+        "3 mots": lambda: " ".join(rng.sample(vocabulary, 3)),
+        "saisie (préfixe)": lambda: " ".join(rng.sample(vocabulary, 2))[:-3],
+    }
+
+    print(f"{'requête':<18} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for label, make_query in scenarios.items():
+        timings = []
+        for _ in range(args.queries):
+            query = make_query()
+            start = time.perf_counter()
+            index.search(query, args.limit)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"{label:<18} {statistics.median(timings) * 1000:>10.2f} {p99 * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
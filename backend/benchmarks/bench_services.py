@@ -0,0 +1,178 @@
+"""Benchmark des services sur une base SQLite réelle, avec résultats JSON et seuil de régression.
+
+Peuple une base synthétique (voir SCALES dans benchmarks/data.py), mesure
+les méthodes de service les plus sollicitées sans mock, caches vidés, puis
+écrit médiane et p95 de chaque scénario dans un fichier JSON. Avec
+--baseline, compare chaque médiane à celle d'un run précédent et échoue
+si l'écart dépasse le seuil. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_services --scale 100k --db /tmp/bench-100k.db --output results.json
+    python -m benchmarks.bench_services --scale 100k --db /tmp/bench-100k.db --baseline results.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+
+from benchmarks.data import DAYS, FIRST_DAY, PASSWORD, SCALES, create_bench_app, load_or_seed
+
+def scenarios(room_ids, user_ids, rng):
+    """Scénarios nommés : (clé, fonction), la clé identifie la mesure d'un run à l'autre."""
+    from app.models.room import Room
+    from app.schemas.booking import BookingCreate
+    from app.schemas.user import UserLogin
+    from app.services.auth_service import AuthService
+    from app.services.booking_service import BookingService
+    from app.services.room_service import RoomService
+    from app import db
+
+    slugs = [slug for slug, in db.session.query(Room.slug)]
+    # Les réservations créées tombent après la période des données synthétiques
+    new_days = iter(range(DAYS, DAYS * 10))
+
+    def create_booking():
+        response, status = BookingService.create_booking(BookingCreate(
+            room_id=rng.choice(room_ids),
+            user_id=rng.choice(user_ids),
+            date=FIRST_DAY + datetime.timedelta(days=next(new_days)),
+            start_time=datetime.time(9),
+            end_time=datetime.time(11),
+            attendees=2,
+            total_price=100.0,
+        ))
+        assert status == 201, response
+
+    def login_user():
+        user = rng.randrange(len(user_ids))
+        response, status = AuthService.login_user(
+            UserLogin(email=f"user{user}@example.com", password=PASSWORD)
+        )
+        assert status == 200, response
+
+    return [
+        # Chemins servis par les routes : corps JSON pré-sérialisés
+        ("get_all_rooms_json", RoomService.get_all_rooms_json),
+        ("get_all_rooms_json_page", lambda: RoomService.get_all_rooms_json(
+            limit=24, cursor=rng.choice(slugs)
+        )),
+        ("get_room_by_slug_json", lambda: RoomService.get_room_by_slug_json(rng.choice(slugs))),
+        ("create_booking", create_booking),
+        ("get_user_bookings", lambda: BookingService.get_user_bookings(rng.choice(user_ids))),
+        ("get_user_bookings_page", lambda: BookingService.get_user_bookings(
+            rng.choice(user_ids), limit=20
+        )),
+        ("login_user", login_user),
+    ]
+
+
+def clear_caches():
+    from app.cache import catalog_cache
+    from app.services.availability_service import occupancy
+    from app.services.booking_service import booking_index
+    from app.services.room_service import room_json_cache
+
+    for cache in (catalog_cache, room_json_cache, booking_index, occupancy):
+        cache.clear()
+
+
+def measure(app, room_ids, user_ids, repeat, only=None):
+    from app import db
+    from app.models.booking import Booking
+
+    results = {}
+    with app.app_context():
+        for key, run in scenarios(room_ids, user_ids, random.Random(7)):
+            if only and key not in only:
+                continue
+            timings = []
+            for _ in range(repeat):
+                clear_caches()
+                db.session.remove()
+                began = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - began)
+            timings.sort()
+            results[key] = {
+                "median_ms": round(statistics.median(timings) * 1000, 3),
+                "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)] * 1000, 3),
+                "runs": repeat,
+            }
+        # La base reste réutilisable d'un run à l'autre
+        Booking.query.filter(Booking.date >= FIRST_DAY + datetime.timedelta(days=DAYS)).delete()
+        db.session.commit()
+        clear_caches()
+    return results
+
+
+def regressions(results, baseline, threshold, min_delta_ms):
+    """Scénarios dont la médiane dépasse celle de référence de plus de `threshold` (fraction) et de `min_delta_ms`."""
+    slower = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        delta = result["median_ms"] - reference["median_ms"]
+        if delta > min_delta_ms and delta > reference["median_ms"] * threshold:
+            slower.append((key, reference["median_ms"], result["median_ms"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+    parser.add_argument("--db", help="fichier SQLite à réutiliser (peuplé au premier run)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--only", nargs="*", help="clés des scénarios à mesurer")
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--baseline", help="résultats JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.25, help="régression tolérée (0.25 = +25 %%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.2, help="écart absolu ignoré (bruit)")
+    args = parser.parse_args()
+
+    app = create_bench_app(args.db)
+    room_ids, user_ids = load_or_seed(app, args.scale)
+    results = measure(app, room_ids, user_ids, args.repeat, args.only)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            reference = json.load(handle)
+        if reference["scale"] != args.scale:
+            parser.error(f"la référence a été mesurée à l'échelle {reference['scale']}")
+        baseline = reference["results"]
+
+    print(f"{len(room_ids)} salles, {len(user_ids)} utilisateurs (échelle {args.scale})")
+    print(f"{'scénario':<24} {'médiane (ms)':>13} {'p95 (ms)':>10} {'référence':>10} {'écart':>8}")
+    for key, result in results.items():
+        line = f"{key:<24} {result['median_ms']:>13.2f} {result['p95_ms']:>10.2f}"
+        reference = baseline.get(key)
+        if reference is not None:
+            change = result["median_ms"] / reference["median_ms"] - 1 if reference["median_ms"] else 0
+            line += f" {reference['median_ms']:>10.2f} {change:>+8.0%}"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump({
+                "scale": args.scale,
+                "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "results": results,
+            }, handle, indent=2)
+            handle.write("\n")
+
+    slower = regressions(results, baseline, args.threshold, args.min_delta_ms)
+    for key, reference, median in slower:
+        print(f"RÉGRESSION {key} : {reference:.2f} ms -> {median:.2f} ms", file=sys.stderr)
+    if slower:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark du démarrage à froid : temps d'import et délai avant la première réponse.
+
+Chaque mesure lance un interpréteur neuf qui importe l'application, appelle
+create_app() et setup_monitoring() comme run.py, puis sert GET /api/rooms.
+Avec --gunicorn, mesure aussi le délai entre le lancement de gunicorn et
+la première réponse HTTP. Lancer depuis le dossier backend :
+
+    python -m benchmarks.bench_startup --rooms 5000 --repeat 5
+"""
+import argparse
+import http.client
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.data import create_bench_app, seed_rooms
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Exécuté dans un interpréteur neuf ; les durées sont en secondes
+PROBE = """
+import json, os, threading, time
+began = time.perf_counter()
+import app
+imported_app = time.perf_counter()
+import monitoring
+imported_monitoring = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+monitoring.setup_monitoring(application)
+if os.environ.get("PROBE_WAIT_WARMUP"):
+    for thread in threading.enumerate():
+        if thread.name == "catalog-warmup":
+            thread.join()
+ready = time.perf_counter()
+response = application.test_client().get("/api/rooms")
+assert response.status_code == 200, response.status_code
+answered = time.perf_counter()
+print(json.dumps({
+    "import app": imported_app - began,
+    "import monitoring": imported_monitoring - imported_app,
+    "create_app": created - imported_monitoring,
+    "setup_monitoring (+ attente)": ready - created,
+    "première réponse": answered - ready,
+    "total (probe)": answered - began,
+}))
+"""
+
+SCENARIOS = [
+    ("create_all au démarrage", {"DB_CREATE_ALL": "true", "CATALOG_WARMUP": "false"}),
+    ("schéma géré par alembic", {"DB_CREATE_ALL": "false", "CATALOG_WARMUP": "false"}),
+    ("préchargement, requête immédiate", {"DB_CREATE_ALL": "false", "CATALOG_WARMUP": "true"}),
+    # La première requête n'arrive qu'une fois le préchargement terminé
+    ("préchargement terminé", {"DB_CREATE_ALL": "false", "CATALOG_WARMUP": "true", "PROBE_WAIT_WARMUP": "1"}),
+]
+
+
+def probe(env):
+    """Lance un interpréteur neuf ; retourne les durées de chaque phase et la durée totale du processus."""
+    began = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    phases = json.loads(output.strip().splitlines()[-1])
+    phases["processus"] = time.perf_counter() - began
+    return phases
+
+
+def gunicorn_first_response(env, options, port):
+    """Délai entre le lancement de gunicorn et la première réponse 200 de GET /api/rooms."""
+    began = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", *shlex.split(options), "run:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - began < 60:
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+                connection.request("GET", "/api/rooms")
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    return time.perf_counter() - began
+            except OSError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError("gunicorn ne répond pas")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--gunicorn", metavar="OPTIONS", help='options de gunicorn, ex. "-w 2"')
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    app = create_bench_app()
+    seed_rooms(app, args.rooms)
+    database_url = app.config["SQLALCHEMY_DATABASE_URI"]
+
+    print(f"{args.rooms} salles, médiane de {args.repeat} démarrages (ms)")
+    rows = []
+    for label, overrides in SCENARIOS:
+        env = dict(os.environ, DATABASE_URL=database_url, **overrides)
+        runs = [probe(env) for _ in range(args.repeat)]
+        phases = {phase: statistics.median(run[phase] for run in runs) for phase in runs[0]}
+        if args.gunicorn is not None:
+            phases["gunicorn → 1re réponse"] = statistics.median(
+                gunicorn_first_response(env, args.gunicorn, args.port) for _ in range(args.repeat)
+            )
+        rows.append((label, phases))
+
+    columns = list(rows[0][1])
+    print(f"{'phase':<28}" + "".join(f" {label:>32}" for label, _ in rows))
+    for phase in columns:
+        print(f"{phase:<28}" + "".join(f" {phases[phase] * 1000:>32.1f}" for _, phases in rows))
+
+
+if __name__ == "__main__":
+    main()
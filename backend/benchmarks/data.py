@@ -0,0 +1,223 @@
+"""Données synthétiques et application de test pour les benchmarks."""
+import datetime
+import os
+import random
+import tempfile
+import time
+import uuid
+
+# Jeux de données par échelle (nombre de réservations) : salles, utilisateurs, réservations
+SCALES = {
+    "1k": (100, 200, 1_000),
+    "100k": (1_000, 10_000, 100_000),
+    "1m": (5_000, 50_000, 1_000_000),
+}
+# Mot de passe de tous les utilisateurs synthétiques créés par load_or_seed
+PASSWORD = "password123"
+FIRST_DAY = datetime.date(2025, 1, 1)
+DAYS = 730
+SLOTS = [(datetime.time(h), datetime.time(h + 2)) for h in range(8, 19, 2)]
+
+CATEGORIES = ["Premium", "Standard", "Haut de Gamme"]
+TYPES = ["Petite", "Moyenne", "Grande", "Hangar", "Parking", "Espace Atypique"]
+CITIES = [
+    ("Paris", "75001", 48.8566, 2.3522),
+    ("Lyon", "69001", 45.7640, 4.8357),
+    ("Marseille", "13001", 43.2965, 5.3698),
+    ("Bordeaux", "33000", 44.8378, -0.5792),
+    ("Lille", "59000", 50.6292, 3.0573),
+    ("Nantes", "44000", 47.2184, -1.5536),
+]
+AMENITIES = [
+    ("wifi", "Wifi haut débit"),
+    ("projector", "Projecteur"),
+    ("screen", "Écran interactif"),
+    ("coffee", "Machine à café"),
+    ("sun", "Terrasse"),
+    ("parking", "Parking privé"),
+    ("accessibility", "Accès PMR"),
+    ("kitchen", "Cuisine équipée"),
+    ("sound", "Sonorisation"),
+    ("air", "Climatisation"),
+]
+WORDS = (
+    "salle lumineuse spacieuse moderne calme élégante atelier loft verrière "
+    "réunion séminaire conférence formation cocktail tournage exposition "
+    "vue jardin centre quartier historique gare métro"
+).split()
+
+
+def create_bench_app(db_path=None):
+    """Crée l'application sur une base SQLite dédiée au benchmark."""
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="roomly-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    from app import create_app
+
+    return create_app()
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def room_rows(count, seed=42, start=0):
+    """Génère `count` salles au format des colonnes du modèle Room."""
+    rng = random.Random(seed + start)
+    rows = []
+    for n in range(start, start + count):
+        city, postal_code, lat, lng = rng.choice(CITIES)
+        capacity_min = rng.randint(1, 20)
+        capacity_max = capacity_min + rng.randint(5, 200)
+        price_per_hour = round(rng.uniform(20, 400), 2)
+        rows.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                "name": f"{_sentence(rng, 2)[:-1]} {n}",
+                "slug": f"salle-{n:07d}",
+                "description": " ".join(_sentence(rng, 12) for _ in range(6)),
+                "short_description": _sentence(rng, 10),
+                "category": rng.choice(CATEGORIES),
+                "type": rng.choice(TYPES),
+                "capacity_min": capacity_min,
+                "capacity_max": capacity_max,
+                "capacity_optimal": (capacity_min + capacity_max) // 2,
+                "size": round(rng.uniform(10, 800), 1),
+                "price_per_hour": price_per_hour,
+                "price_per_day": round(price_per_hour * 7, 2),
+                "location_address": f"{rng.randint(1, 200)} rue {rng.choice(WORDS)}",
+                "location_city": city,
+                "location_postal_code": postal_code,
+                "location_country": "France",
+                "location_lat": lat + rng.uniform(-0.2, 0.2),
+                "location_lng": lng + rng.uniform(-0.2, 0.2),
+                "amenities": [
+                    {"icon": icon, "name": name, "description": _sentence(rng, 5)}
+                    for icon, name in rng.sample(AMENITIES, rng.randint(3, 8))
+                ],
+                "services": [
+                    {
+                        "icon": "service",
+                        "name": _sentence(rng, 2)[:-1],
+                        "description": _sentence(rng, 8),
+                        "includedInPrice": rng.random() < 0.5,
+                        "priceIfExtra": round(rng.uniform(10, 100), 2),
+                    }
+                    for _ in range(rng.randint(1, 4))
+                ],
+                "images": [
+                    {"src": f"/assets/room{n}-{i}.jpg", "alt": _sentence(rng, 4), "featured": i == 0}
+                    for i in range(rng.randint(2, 6))
+                ],
+                "availability_confirmation_required": rng.random() < 0.2,
+                "rating": round(rng.uniform(3, 5), 1),
+                "reviews": rng.randint(0, 500),
+            }
+        )
+    return rows
+
+
+def seed_rooms(app, count, seed=42, batch_size=5000):
+    """Insère `count` salles synthétiques par lots."""
+    from sqlalchemy import insert
+    from app import db
+    from app.models.room import Room
+
+    with app.app_context():
+        for start in range(0, count, batch_size):
+            rows = room_rows(min(batch_size, count - start), seed=seed, start=start)
+            db.session.execute(insert(Room), rows)
+        db.session.commit()
+
+
+def seed_users(app, count, password_hash="-", batch_size=10000):
+    """Insère `count` utilisateurs user<n>@example.com partageant le même hash ; retourne leurs ids."""
+    from sqlalchemy import insert
+    from app import db
+    from app.models.user import User
+
+    ids = [str(uuid.UUID(int=n + 1, version=4)) for n in range(count)]
+    with app.app_context():
+        for start in range(0, count, batch_size):
+            db.session.execute(insert(User), [
+                {
+                    "id": user_id,
+                    "email": f"user{start + i}@example.com",
+                    "password_hash": password_hash,
+                    "first_name": "Bench",
+                    "last_name": f"User {start + i}",
+                }
+                for i, user_id in enumerate(ids[start:start + batch_size])
+            ])
+        db.session.commit()
+    return ids
+
+
+def seed_bookings(app, count, room_ids, user_ids, seed=42, batch_size=50000):
+    """Insère `count` réservations réparties sur DAYS jours à partir de FIRST_DAY."""
+    from sqlalchemy import insert
+    from app import db
+    from app.models.booking import Booking
+
+    rng = random.Random(seed)
+    statuses = ["confirmed"] * 7 + ["pending"] * 2 + ["cancelled"]
+    now = datetime.datetime(2025, 1, 1)
+    with app.app_context():
+        for start in range(0, count, batch_size):
+            rows = []
+            for _ in range(min(batch_size, count - start)):
+                start_time, end_time = rng.choice(SLOTS)
+                rows.append({
+                    "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    "room_id": rng.choice(room_ids),
+                    "user_id": rng.choice(user_ids),
+                    "date": FIRST_DAY + datetime.timedelta(days=rng.randrange(DAYS)),
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "is_full_day": False,
+                    "attendees": rng.randint(1, 30),
+                    "services": [],
+                    "total_price": 100.0,
+                    "status": rng.choice(statuses),
+                    "created_at": now,
+                    "updated_at": now,
+                })
+            db.session.execute(insert(Booking), rows)
+            db.session.commit()
+
+
+def seed_dataset(app, scale, password_hash="-", seed=42):
+    """Peuple une base vide à l'échelle `scale` (clé de SCALES) ; retourne (room_ids, user_ids).
+
+    Les mêmes `scale` et `seed` produisent toujours les mêmes données.
+    """
+    from app.models.room import Room
+
+    rooms, users, bookings = SCALES[scale]
+    seed_rooms(app, rooms, seed=seed)
+    user_ids = seed_users(app, users, password_hash)
+    with app.app_context():
+        room_ids = [room_id for room_id, in Room.query.with_entities(Room.id).order_by(Room.slug)]
+    seed_bookings(app, bookings, room_ids, user_ids, seed=seed)
+    return room_ids, user_ids
+
+
+def load_or_seed(app, scale):
+    """Réutilise une base déjà peuplée (--db), sinon la peuple ; retourne (room_ids, user_ids)."""
+    from app import db
+    from app.models.room import Room
+    from app.models.user import User
+    from app.passwords import hash_password
+
+    with app.app_context():
+        room_ids = [room_id for room_id, in db.session.query(Room.id).order_by(Room.slug)]
+        user_ids = [user_id for user_id, in db.session.query(User.id).order_by(User.email)]
+    if room_ids:
+        return room_ids, user_ids
+
+    began = time.perf_counter()
+    # Un seul hash pour tous les utilisateurs : la connexion mesure quand même une vérification complète
+    room_ids, user_ids = seed_dataset(app, scale, password_hash=hash_password(PASSWORD))
+    print(f"base peuplée ({scale}) en {time.perf_counter() - began:.1f} s")
+    return room_ids, user_ids
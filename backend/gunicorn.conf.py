@@ -0,0 +1,168 @@
+"""Configuration de gunicorn, chargée automatiquement depuis le dossier courant.
+
+Par défaut, un seul worker sync, comme l'ancien CMD du Dockerfile : sur
+1 CPU, c'est la configuration au meilleur débit et au meilleur p95 (voir le
+README). Chaque valeur peut être imposée par l'environnement du processus
+(ce fichier est lu avant .env) :
+
+- GUNICORN_WORKERS : nombre de processus (défaut : 1 ; `auto` : 2 x CPU + 1,
+  compte tenu des quotas du conteneur, borné par la mémoire disponible
+  divisée par GUNICORN_WORKER_MEMORY_MB) ;
+- GUNICORN_THREADS : threads par worker gthread (défaut : 4) ;
+- GUNICORN_WORKER_CLASS : sync (défaut), gthread ou gevent ;
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER : recyclage des
+  workers contre la croissance de la mémoire ;
+- GUNICORN_PRELOAD : charge l'application une fois dans le maître (défaut : true).
+
+Avec plusieurs workers, les métriques Prometheus passent en mode
+multiprocessus (PROMETHEUS_MULTIPROC_DIR, un dossier temporaire par défaut)
+pour que /metrics agrège tous les workers.
+
+Comparer les configurations : python -m benchmarks.bench_gunicorn
+"""
+import glob
+import multiprocessing
+import os
+import tempfile
+
+# Mémoire d'un worker après quelques milliers de requêtes (catalogue et index en cache)
+WORKER_MEMORY_MB = int(os.getenv("GUNICORN_WORKER_MEMORY_MB", "200"))
+
+
+def _flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def _read(path):
+    try:
+        with open(path, encoding="ascii") as handle:
+            return handle.read().split()
+    except OSError:
+        return None
+
+
+def cpu_count():
+    """CPU utilisables, en tenant compte de l'affinité et du quota cgroup (Cloud Run, Docker)."""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = multiprocessing.cpu_count()
+    quota = _read("/sys/fs/cgroup/cpu.max")  # cgroup v2 : "<quota> <période>" ou "max <période>"
+    if quota and quota[0] != "max":
+        count = min(count, max(1, int(int(quota[0]) / int(quota[1]))))
+    return count
+
+
+def memory_mb():
+    """Mémoire disponible en Mo : limite du cgroup, sinon mémoire physique."""
+    limit = _read("/sys/fs/cgroup/memory.max")
+    if limit and limit[0] != "max":
+        return int(limit[0]) // (1024 * 1024)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def default_workers(cpus, memory):
+    workers = 2 * cpus + 1
+    if memory is not None:
+        # Garder de la marge pour le maître et le système
+        workers = min(workers, max(1, int(memory * 0.8) // WORKER_MEMORY_MB))
+    return max(1, workers)
+
+
+def _worker_class():
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+    if worker_class == "gevent":
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            # gevent n'est pas dans requirements.txt : à installer pour l'utiliser
+            worker_class = "gthread"
+    return worker_class
+
+
+def _workers():
+    value = os.getenv("GUNICORN_WORKERS") or "1"
+    if value == "auto":
+        return default_workers(cpu_count(), memory_mb())
+    return max(1, int(value))
+
+
+def _prometheus_multiproc_dir():
+    """Dossier partagé des métriques des workers, vidé au démarrage du maître.
+
+    Doit être défini avant le premier import de prometheus_client, donc avant
+    le préchargement de l'application.
+    """
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        path = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    return path
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+worker_class = _worker_class()
+workers = _workers()
+threads = int(os.getenv("GUNICORN_THREADS", "4")) if worker_class == "gthread" else 1
+# gevent : connexions simultanées par worker
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+
+prometheus_multiproc_dir = _prometheus_multiproc_dir() if workers > 1 else None
+
+# Recycler chaque worker après un nombre aléatoire de requêtes, pour que
+# tous ne redémarrent pas en même temps
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# L'application est importée une seule fois : les workers la partagent en
+# copie sur écriture et démarrent sans refaire les imports
+preload_app = _flag("GUNICORN_PRELOAD", "true")
+
+# Le préchargement du catalogue se fait dans chaque worker (post_worker_init) :
+# un thread lancé dans le maître ne survit pas au fork et peut laisser un
+# verrou d'index pris dans les workers
+catalog_warmup = _flag("CATALOG_WARMUP", "false")
+if preload_app:
+    os.environ["CATALOG_WARMUP"] = "false"
+
+
+def when_ready(server):
+    if preload_app:
+        # Le maître ne sert aucune requête : il lâche les connexions ouvertes au chargement
+        from app.pool import dispose_engines
+
+        dispose_engines()
+    server.log.info(
+        "%s worker(s) %s, %s thread(s), max_requests %s (+%s)",
+        workers, worker_class, threads, max_requests, max_requests_jitter,
+    )
+
+
+def post_fork(server, worker):
+    # Chaque worker ouvre ses propres connexions : rien n'est hérité du maître
+    from app.pool import dispose_engines
+
+    dispose_engines()
+
+
+def child_exit(server, worker):
+    if prometheus_multiproc_dir:
+        # Les jauges du worker arrêté ne sont plus agrégées
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    if catalog_warmup:
+        from app.warmup import start_catalog_warmup
+
+        start_catalog_warmup(worker.wsgi)
@@ -1,55 +1,173 @@
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.instrumentation.flask import FlaskInstrumentor
-from prometheus_client import Counter, Histogram, generate_latest
-from flask import request
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, multiprocess, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from app.cache import catalog_cache
+from app.pool import engines, pool_wait_listeners
+from flask import g, request
 import time
 import os
 
-# Prometheus metrics
+# Prometheus metrics, étiquetées par modèle de route (/api/rooms/<slug>) et
+# non par chemin, pour ne pas créer une série par salle ou par utilisateur
+ROUTE_LABELS = ["method", "endpoint", "blueprint"]
+
 REQUEST_COUNT = Counter(
-    "http_requests_total", "Total HTTP requests", ["method", "endpoint", "status"]
+    "http_requests_total", "Total HTTP requests", ROUTE_LABELS + ["status"]
 )
 
 REQUEST_LATENCY = Histogram(
-    "http_request_duration_seconds", "HTTP request latency", ["method", "endpoint"]
+    "http_request_duration_seconds", "HTTP request latency", ROUTE_LABELS
 )
 
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ROUTE_LABELS,
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+)
 
-def setup_monitoring(app):
-    # Setup OpenTelemetry
-    tracer_provider = TracerProvider()
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Total time spent in SQL statements per HTTP request",
+    ROUTE_LABELS,
+)
 
-    # Only enable Cloud Trace exporter in production
-    if os.getenv("ENABLE_CLOUD_MONITORING", "false").lower() == "true":
-        from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ROUTE_LABELS,
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+
+
+class CatalogCacheCollector:
+    """Expose les compteurs du cache du catalogue au moment de la collecte.
+
+    Comme DatabasePoolCollector, il décrit le seul processus qui répond à
+    /metrics, y compris en mode multiprocessus.
+    """
+
+    def collect(self):
+        for name, documentation, value in (
+            ("catalog_cache_hits", "Catalog cache hits", catalog_cache.hits),
+            ("catalog_cache_misses", "Catalog cache misses", catalog_cache.misses),
+            ("catalog_cache_evictions", "Catalog cache evictions", catalog_cache.evictions),
+        ):
+            yield CounterMetricFamily(name, documentation, value=value)
+
+
+catalog_cache_collector = CatalogCacheCollector()
+REGISTRY.register(catalog_cache_collector)
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent obtaining a database connection from the pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+pool_wait_listeners.append(DB_POOL_WAIT.observe)
+
+
+class DatabasePoolCollector:
+    """Expose l'état des pools de connexions au moment de la collecte."""
 
-        gcp_trace_exporter = CloudTraceSpanExporter()
-        tracer_provider.add_span_processor(BatchSpanProcessor(gcp_trace_exporter))
+    def collect(self):
+        gauges = {
+            name: GaugeMetricFamily(name, documentation, labels=["database"])
+            for name, documentation in (
+                ("db_pool_size", "Configured number of pooled connections"),
+                ("db_pool_checked_out", "Connections currently checked out"),
+                ("db_pool_idle", "Idle connections kept in the pool"),
+                ("db_pool_overflow", "Connections opened beyond the pool size"),
+            )
+        }
+        for engine in engines():
+            pool = engine.pool
+            # Seuls les pools à file (QueuePool) ont une taille et un débordement
+            if not hasattr(pool, "checkedout"):
+                continue
+            database = engine.url.database or ""
+            gauges["db_pool_size"].add_metric([database], pool.size())
+            gauges["db_pool_checked_out"].add_metric([database], pool.checkedout())
+            gauges["db_pool_idle"].add_metric([database], pool.checkedin())
+            gauges["db_pool_overflow"].add_metric([database], max(pool.overflow(), 0))
+        yield from gauges.values()
 
+
+database_pool_collector = DatabasePoolCollector()
+REGISTRY.register(database_pool_collector)
+
+
+def metrics_registry():
+    """Registre exposé par /metrics.
+
+    Avec PROMETHEUS_MULTIPROC_DIR (plusieurs workers gunicorn), compteurs et
+    histogrammes sont agrégés sur tous les workers depuis leurs fichiers ;
+    sinon, le registre du processus suffit.
+    """
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(catalog_cache_collector)
+    registry.register(database_pool_collector)
+    return registry
+
+
+def setup_tracing(app):
+    """Exporte les traces des requêtes vers Cloud Trace.
+
+    OpenTelemetry et l'exporteur GCP ne sont importés qu'ici : sans export,
+    les spans seraient créés puis jetés, et leur import allonge chaque
+    démarrage à froid.
+    """
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.instrumentation.flask import FlaskInstrumentor
+    from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(BatchSpanProcessor(CloudTraceSpanExporter()))
     trace.set_tracer_provider(tracer_provider)
 
     # Instrument Flask
     FlaskInstrumentor().instrument_app(app)
 
+
+def setup_monitoring(app):
+    # Only enable Cloud Trace exporter in production
+    if os.getenv("ENABLE_CLOUD_MONITORING", "false").lower() == "true":
+        setup_tracing(app)
+
     # Add Prometheus metrics middleware
     @app.before_request
     def before_request():
-        request.start_time = time.time()
+        g.request_started = time.perf_counter()
 
     @app.after_request
     def after_request(response):
-        request_latency = time.time() - request.start_time
-        REQUEST_COUNT.labels(
-            method=request.method, endpoint=request.path, status=response.status_code
-        ).inc()
-        REQUEST_LATENCY.labels(method=request.method, endpoint=request.path).observe(
-            request_latency
-        )
+        labels = {
+            "method": request.method,
+            "endpoint": request.url_rule.rule if request.url_rule else "<unmatched>",
+            "blueprint": request.blueprint or "",
+        }
+        REQUEST_COUNT.labels(status=response.status_code, **labels).inc()
+        started = g.get("request_started")
+        if started is not None:
+            REQUEST_LATENCY.labels(**labels).observe(time.perf_counter() - started)
+
+        # Les requêtes SQL d'une réponse en flux (export) s'exécutent après ce hook
+        stats = g.get("query_stats")
+        REQUEST_DB_QUERIES.labels(**labels).observe(stats.count if stats else 0)
+        REQUEST_DB_DURATION.labels(**labels).observe(stats.duration if stats else 0)
+
+        size = response.calculate_content_length()
+        if size is not None:
+            RESPONSE_SIZE.labels(**labels).observe(size)
         return response
 
     # Add metrics endpoint
+    registry = metrics_registry()
+
     @app.route("/metrics")
     def metrics():
-        return generate_latest()
+        return generate_latest(registry)
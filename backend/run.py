@@ -1,10 +1,6 @@
 from app import create_app
 from monitoring import setup_monitoring
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Create the Flask application
 app = create_app()
@@ -4,8 +4,10 @@ import os
 
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
     """Create a test client for the app."""
+    # Base temporaire : create_all ne doit pas modifier instance/roomly.db
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'app.db'}")
     app = create_app()
     app.config["TESTING"] = True
     with app.test_client() as client:
@@ -50,3 +52,10 @@ def test_nonexistent_endpoint(client):
     """Test that nonexistent endpoints return 404."""
     response = client.get("/nonexistent")
     assert response.status_code == 404
+
+
+def test_batch_bookings_rejects_non_object_body(client):
+    """Test that a JSON list sent to /api/bookings/batch returns 400, not 500."""
+    response = client.post("/api/bookings/batch", json=[{"room_id": "1"}])
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Données invalides"
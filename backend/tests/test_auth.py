@@ -0,0 +1,131 @@
+import datetime
+import time
+import jwt
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.auth import TokenDenylist, denylist, token_cache
+from app.cache import MemoryCache
+from app.models.user import User
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = create_app()
+    with app.app_context():
+        user = User(id="u1", email="jane@example.com", first_name="Jane", last_name="Doe")
+        user.set_password("password123")
+        db.session.add(user)
+        db.session.commit()
+    token_cache.clear()
+    denylist.clear()
+    with app.test_client() as client:
+        yield client
+    token_cache.clear()
+    denylist.clear()
+
+
+def _login(client):
+    response = client.post("/api/auth/login", json={"email": "jane@example.com", "password": "password123"})
+    return {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+
+# Test: sans token, la route protégée répond 401
+def test_login_required_without_token(client):
+    assert client.get("/api/auth/me").status_code == 401
+    assert client.get("/api/auth/me", headers={"Authorization": "Basic abc"}).status_code == 401
+
+
+# Test: le token vérifié est mis en cache, la requête suivante ne lit pas la base
+def test_verified_token_is_cached(client):
+    headers = _login(client)
+    statements = []
+    with client.application.app_context():
+        engine = db.engine
+
+    def count(*args):
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        first = client.get("/api/auth/me", headers=headers)
+        after_first = len(statements)
+        second = client.get("/api/auth/me", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert first.status_code == second.status_code == 200
+    assert second.get_json()["email"] == "jane@example.com"
+    assert after_first == 1
+    assert len(statements) == after_first
+
+
+# Test: un token expiré ou signé avec une autre clé est refusé
+def test_invalid_tokens_rejected(client):
+    expired = jwt.encode(
+        {"user_id": "u1", "exp": datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1)},
+        client.application.config["SECRET_KEY"],
+        algorithm="HS256",
+    )
+    forged = jwt.encode(
+        {"user_id": "u1", "exp": datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)},
+        "other-key",
+        algorithm="HS256",
+    )
+
+    for token in (expired, forged):
+        assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+
+
+# Test: après déconnexion, le token est révoqué malgré le cache
+def test_logout_revokes_token(client):
+    headers = _login(client)
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    assert client.post("/api/auth/logout", headers=headers).status_code == 200
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+
+# Test: les révocations expirées sont oubliées
+def test_denylist_forgets_expired_entries():
+    now = [1000.0]
+    revoked = TokenDenylist(MemoryCache(clock=lambda: now[0]), clock=lambda: now[0])
+    revoked.add("a", 1010.0)
+    revoked.add("expired", 990.0)
+    assert "a" in revoked
+    assert "expired" not in revoked
+
+    now[0] = 1020.0
+    revoked.add("b", 1030.0)
+
+    assert "a" not in revoked
+    assert "b" in revoked
+
+
+# Test: une révocation écrite dans un stockage partagé s'applique aux autres workers
+def test_denylist_shared_backend():
+    shared = MemoryCache()
+    worker_a, worker_b = TokenDenylist(shared), TokenDenylist(shared)
+
+    worker_a.add("token", time.time() + 60)
+
+    assert "token" in worker_b
+
+
+# Test: l'export des réservations est réservé aux rôles admin et finance
+def test_export_requires_finance_role(client):
+    assert client.get("/api/bookings/export").status_code == 401
+
+    headers = _login(client)
+    assert client.get("/api/bookings/export", headers=headers).status_code == 403
+
+    with client.application.app_context():
+        db.session.get(User, "u1").role = "finance"
+        db.session.commit()
+    token_cache.clear()
+
+    response = client.get("/api/bookings/export", headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
@@ -2,7 +2,6 @@ import pytest
 from unittest.mock import patch, MagicMock
 from app.services.auth_service import AuthService
 from app.schemas.user import UserCreate, UserLogin
-from app.models.user import User
 
 
 # Setup de données utilisateur
@@ -63,10 +62,11 @@ def test_login_user_wrong_credentials(mock_user_class, user_data_login):
 
 
 # Test: connexion avec succès
+@patch("app.services.auth_service.needs_rehash", return_value=False)
 @patch("app.services.auth_service.jwt.encode", return_value="fake.jwt.token")
 @patch("app.services.auth_service.os.getenv", return_value="secret_key")
 @patch("app.services.auth_service.User")
-def test_login_user_success(mock_user_class, mock_getenv, mock_jwt, user_data_login):
+def test_login_user_success(mock_user_class, mock_getenv, mock_jwt, mock_needs_rehash, user_data_login):
     user_mock = MagicMock()
     user_mock.id = 1
     user_mock.email = "test@example.com"
@@ -82,3 +82,40 @@ def test_login_user_success(mock_user_class, mock_getenv, mock_jwt, user_data_lo
     assert response["user"]["email"] == user_mock.email
     assert response["user"]["first_name"] == user_mock.first_name
     assert response["user"]["id"] == user_mock.id
+
+
+# Test: un hash aux anciens paramètres est recalculé à la connexion
+@patch("app.services.auth_service.needs_rehash", return_value=True)
+@patch("app.services.auth_service.db")
+@patch("app.services.auth_service.User")
+def test_login_user_rehashes_outdated_hash(mock_user_class, mock_db, mock_needs_rehash, user_data_login):
+    user_mock = MagicMock()
+    user_mock.id = "1"
+    user_mock.check_password.return_value = True
+    mock_user_class.query.filter_by.return_value.first.return_value = user_mock
+
+    response, status = AuthService.login_user(user_data_login)
+
+    assert status == 200
+    user_mock.set_password.assert_called_once_with("password123")
+    mock_db.session.commit.assert_called_once()
+
+
+# Test: pool de hachage saturé, la connexion réussit sans mettre à niveau le hash
+@patch("app.services.auth_service.needs_rehash", return_value=True)
+@patch("app.services.auth_service.db")
+@patch("app.services.auth_service.User")
+def test_login_user_skips_rehash_when_hasher_busy(mock_user_class, mock_db, mock_needs_rehash, user_data_login):
+    from app.passwords import PasswordHasherBusy
+
+    user_mock = MagicMock()
+    user_mock.id = "1"
+    user_mock.check_password.return_value = True
+    user_mock.set_password.side_effect = PasswordHasherBusy()
+    mock_user_class.query.filter_by.return_value.first.return_value = user_mock
+
+    response, status = AuthService.login_user(user_data_login)
+
+    assert status == 200
+    assert response["token"]
+    mock_db.session.commit.assert_not_called()
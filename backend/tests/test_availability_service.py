@@ -0,0 +1,115 @@
+import json
+import pytest
+from unittest.mock import patch
+from datetime import date, time
+from app.services.availability_service import (
+    AvailabilityService,
+    OccupancyBitmaps,
+    occupancy,
+    slot_mask,
+    SLOTS_PER_DAY,
+)
+from app.schemas.room import RoomAvailabilityQuery
+
+
+@pytest.fixture(autouse=True)
+def reset_occupancy():
+    occupancy.clear()
+    yield
+    occupancy.clear()
+
+
+def test_slot_mask_rounds_to_quarter_hours():
+    assert slot_mask(0, 15) == 0b1
+    assert slot_mask(15, 45) == 0b110
+    # 9h10-9h20 touche les créneaux 9h00 et 9h15
+    assert slot_mask(550, 560) == 0b11 << 36
+    assert slot_mask(0, 24 * 60) == (1 << SLOTS_PER_DAY) - 1
+
+
+def test_bitmaps_loaded_once_and_updated():
+    calls = []
+
+    def loader(day):
+        calls.append(day)
+        return [("room-1", 9 * 60, 10 * 60)]
+
+    bitmaps = OccupancyBitmaps(loader)
+    day = date(2025, 5, 20)
+    assert bitmaps.masks_for(day)["room-1"] == slot_mask(540, 600)
+
+    bitmaps.add("room-2", day, 0, 60)
+    assert bitmaps.masks_for(day)["room-2"] == slot_mask(0, 60)
+    assert calls == [day]
+
+    # Une date non chargée n'est pas créée par un ajout
+    bitmaps.add("room-1", date(2025, 5, 21), 0, 60)
+    bitmaps.invalidate(day)
+    bitmaps.masks_for(day)
+    assert calls == [day, day]
+
+
+def test_bitmaps_expire_and_are_bounded():
+    now = [0.0]
+    calls = []
+
+    def loader(day):
+        calls.append(day)
+        return []
+
+    bitmaps = OccupancyBitmaps(loader, max_entries=2, ttl=10, clock=lambda: now[0])
+    days = [date(2025, 5, d) for d in (20, 21, 22)]
+    for day in days:
+        bitmaps.masks_for(day)
+    # Le 20, le plus ancien, est évincé
+    assert len(bitmaps) == 2
+    bitmaps.masks_for(days[0])
+    assert calls == days + [days[0]]
+
+    now[0] = 11
+    bitmaps.masks_for(days[0])
+    assert len(calls) == 5
+
+
+# Test: une réservation écrite par un autre processus change la version de la date, qui est rechargée
+def test_date_version_change_reloads_day():
+    from app.versioning import booking_versions
+
+    day = date(2025, 5, 20)
+    key = f"date:{day.isoformat()}"
+    rows = []
+    with patch.object(occupancy, "_loader", side_effect=lambda day: list(rows)):
+        assert occupancy.masks_for(day) == {}
+        rows.append(("room-1", 600, 660))
+        booking_versions.observe(key, booking_versions.get(key) + 1, 0)
+
+        assert occupancy.masks_for(day) == {"room-1": slot_mask(600, 660)}
+
+
+@patch("app.services.availability_service.RoomService._rooms_json")
+@patch("app.services.availability_service.db")
+@patch("app.services.availability_service.Room")
+def test_find_available_rooms_excludes_booked(mock_room_class, mock_db, mock_rooms_json):
+    mock_room_class.capacity_min.__le__.return_value = True
+    mock_room_class.capacity_max.__ge__.return_value = True
+    mock_query = mock_db.session.query.return_value
+    mock_query.filter.return_value = [("free", "salle-libre"), ("busy", "salle-prise")]
+    mock_rooms_json.side_effect = lambda keys: [f'{{"id":"{room_id}"}}'.encode() for room_id, _ in keys]
+
+    day = date(2025, 5, 20)
+    with patch.object(occupancy, "_loader", return_value=[("busy", 600, 660)]):
+        query = RoomAvailabilityQuery(
+            date=day, start=time(10, 30), end=time(12, 0), attendees=4
+        )
+        body, status = AvailabilityService.find_available_rooms_json(query)
+
+    assert status == 200
+    assert json.loads(body) == [{"id": "free"}]
+    mock_rooms_json.assert_called_once_with([("free", "salle-libre")])
+    mock_query.filter.assert_called_once()
+
+
+def test_find_available_rooms_invalid_range():
+    query = RoomAvailabilityQuery(date=date(2025, 5, 20), start=time(12), end=time(10))
+    response, status = AvailabilityService.find_available_rooms_json(query)
+    assert status == 400
@@ -0,0 +1,102 @@
+import pytest
+from datetime import date, time
+from app.services.booking_index import (
+    BookingIntervalIndex,
+    DayIntervals,
+    booking_bounds,
+    DAY_END,
+)
+
+
+@pytest.fixture
+def index():
+    loaded = {("room-1", date(2025, 5, 20)): [(9 * 60, 12 * 60, "b1")]}
+    return BookingIntervalIndex(lambda room_id, day: loaded.get((room_id, day), []))
+
+
+def test_booking_bounds_full_day():
+    assert booking_bounds(True, None, None) == (0, DAY_END)
+    assert booking_bounds(False, None, None) == (0, DAY_END)
+    assert booking_bounds(False, time(9, 30), time(11, 0)) == (570, 660)
+
+
+def test_find_conflict_overlap_and_adjacent(index):
+    day = date(2025, 5, 20)
+    assert index.find_conflict("room-1", day, 10 * 60, 11 * 60) == "b1"
+    assert index.find_conflict("room-1", day, 8 * 60, 9 * 60 + 1) == "b1"
+    # Des créneaux qui se touchent ne sont pas en conflit
+    assert index.find_conflict("room-1", day, 12 * 60, 14 * 60) is None
+    assert index.find_conflict("room-1", day, 7 * 60, 9 * 60) is None
+    # Autre salle ou autre date : aucun conflit
+    assert index.find_conflict("room-2", day, 10 * 60, 11 * 60) is None
+    assert index.find_conflict("room-1", date(2025, 5, 21), 0, DAY_END) is None
+
+
+def test_add_and_remove_update_index(index):
+    day = date(2025, 5, 20)
+    index.add("room-1", day, 14 * 60, 16 * 60, "b2")
+    assert index.find_conflict("room-1", day, 15 * 60, 17 * 60) == "b2"
+    assert index.find_conflict("room-1", day, 10 * 60, 11 * 60) == "b1"
+
+    index.remove("room-1", day, "b2")
+    assert index.find_conflict("room-1", day, 15 * 60, 17 * 60) is None
+
+
+def test_loader_called_once_per_key():
+    calls = []
+
+    def loader(room_id, day):
+        calls.append((room_id, day))
+        return []
+
+    index = BookingIntervalIndex(loader)
+    day = date(2025, 5, 20)
+    index.find_conflict("room-1", day, 0, 60)
+    index.add("room-1", day, 0, 60, "b1")
+    index.find_conflict("room-1", day, 0, 60)
+    assert calls == [("room-1", day)]
+
+    index.invalidate("room-1", day)
+    index.find_conflict("room-1", day, 0, 60)
+    assert len(calls) == 2
+
+
+def test_overlapping_history_falls_back_to_scan():
+    # Une longue réservation suivie d'une courte qui la chevauche déjà en base
+    intervals = DayIntervals([(0, 600, "long"), (60, 120, "short")])
+    assert not intervals.disjoint
+    assert intervals.find_conflict(300, 360) == "long"
+
+
+def test_entries_expire_and_are_bounded():
+    now = [0.0]
+    calls = []
+
+    def loader(room_id, day):
+        calls.append(room_id)
+        return []
+
+    index = BookingIntervalIndex(loader, max_entries=2, ttl=10, clock=lambda: now[0])
+    day = date(2025, 5, 20)
+    for room_id in ("room-1", "room-2", "room-3"):
+        index.find_conflict(room_id, day, 0, 60)
+    # room-1, le plus ancien, est évincé
+    assert len(index) == 2
+    index.find_conflict("room-1", day, 0, 60)
+    assert calls == ["room-1", "room-2", "room-3", "room-1"]
+
+    now[0] = 11
+    index.find_conflict("room-1", day, 0, 60)
+    assert calls[-1] == "room-1" and len(calls) == 5
+
+
+def test_reload_replaces_cached_intervals():
+    rows = []
+    index = BookingIntervalIndex(lambda room_id, day: list(rows))
+    day = date(2025, 5, 20)
+    assert index.find_conflict("room-1", day, 9 * 60, 10 * 60) is None
+    # Réservation écrite par un autre processus
+    rows.append((9 * 60, 12 * 60, "b1"))
+    assert index.find_conflict("room-1", day, 9 * 60, 10 * 60) is None
+    assert index.reload("room-1", day).find_conflict(9 * 60, 10 * 60) == "b1"
+    assert index.find_conflict("room-1", day, 9 * 60, 10 * 60) == "b1"
@@ -0,0 +1,82 @@
+import pytest
+from datetime import date
+from sqlalchemy import event
+from app import create_app, db
+from app.services.availability_service import _load_day_occupancy
+from app.services.booking_service import BookingService, _load_day_intervals, _load_intervals_bulk
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = create_app()
+    with app.app_context():
+        yield app
+
+
+def _query_plan(query):
+    """Plan d'exécution SQLite d'une requête ORM (les valeurs des paramètres n'influent pas)."""
+    compiled = query.statement.compile(
+        dialect=db.engine.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = (None,) * len(compiled.positiontup)
+    with db.engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return " | ".join(row[-1] for row in rows)
+
+
+def _executed_plans(function, *args):
+    """Plans d'exécution des requêtes sur la table booking émises par `function`."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "FROM booking " in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        function(*args)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    plans = []
+    with db.engine.connect() as connection:
+        for statement, parameters in statements:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+# Test: l'historique d'un utilisateur est servi par l'index (user_id, date), sans parcours de table
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"start": date(2025, 1, 1), "end": date(2025, 12, 31)},
+        {"status": ["confirmed", "pending"]},
+        {"cursor": "2025-05-20_09:00:00_b1"},
+    ],
+)
+def test_user_bookings_uses_user_date_index(app, filters):
+    plan = _query_plan(BookingService._user_bookings_query("u1", **filters))
+
+    assert "ix_booking_user_id_date" in plan
+    assert "SCAN booking" not in plan
+
+
+# Test: les chargements de créneaux passent par les index (room_id, date) et (date)
+@pytest.mark.parametrize(
+    "loader, args, index",
+    [
+        (_load_day_intervals, ("r1", date(2025, 5, 20)), "ix_booking_room_id_date"),
+        (_load_intervals_bulk, ([("r1", date(2025, 5, 20)), ("r2", date(2025, 5, 21))],), "ix_booking_room_id_date"),
+        (_load_day_occupancy, (date(2025, 5, 20),), "ix_booking_date"),
+    ],
+)
+def test_slot_loaders_use_indexes(app, loader, args, index):
+    plans = _executed_plans(loader, *args)
+
+    assert plans
+    for plan in plans:
+        assert index in plan
+        assert "SCAN booking" not in plan
@@ -1,8 +1,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from app.services.booking_service import BookingService
+from app.services.booking_service import BookingService, booking_index
 from app.schemas.booking import BookingCreate
-from datetime import date, time, datetime
+from datetime import date, time
 
 
 @pytest.fixture
@@ -35,6 +35,16 @@ def booking_data_half_day():
     )
 
 
+@pytest.fixture(autouse=True)
+def reset_booking_index():
+    booking_index.clear()
+    # Aucune réservation récurrente dans ces tests, versions non enregistrées
+    with patch("app.services.booking_service.series_intervals", return_value=[]), \
+            patch("app.versioning.VersionCounters.bump"):
+        yield
+    booking_index.clear()
+
+
 # Test: création d'une réservation - salle sans confirmation requise
 @patch("app.services.booking_service.db")
 @patch("app.services.booking_service.Room")
@@ -43,8 +53,9 @@ def test_create_booking_without_confirmation(
     mock_booking_class, mock_room_class, mock_db, booking_data_full_day
 ):
     mock_room = MagicMock()
+    mock_room.capacity_max = 20
     mock_room.availability_confirmation_required = False
-    mock_room_class.query.get_or_404.return_value = mock_room
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = mock_room
 
     mock_booking = MagicMock()
     mock_booking.id = 1
@@ -68,8 +79,9 @@ def test_create_booking_with_confirmation(
     mock_booking_class, mock_room_class, mock_db, booking_data_half_day
 ):
     mock_room = MagicMock()
+    mock_room.capacity_max = 20
     mock_room.availability_confirmation_required = True
-    mock_room_class.query.get_or_404.return_value = mock_room
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = mock_room
 
     mock_booking = MagicMock()
     mock_booking.id = 2
@@ -85,24 +97,233 @@ def test_create_booking_with_confirmation(
     mock_db.session.commit.assert_called_once()
 
 
+# Test: création refusée si le nombre de participants dépasse la capacité de la salle
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_booking_over_capacity(
+    mock_booking_class, mock_room_class, mock_db, booking_data_full_day
+):
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = _batch_room("1", capacity_max=8)
+
+    response, status = BookingService.create_booking(booking_data_full_day)
+
+    assert status == 400
+    assert response["error"] == "Le nombre de participants dépasse la capacité de la salle"
+    mock_db.session.add.assert_not_called()
+    mock_db.session.rollback.assert_called_once()
+
+
 # Test: récupération des réservations utilisateur
+@patch("app.services.booking_service.BookingService._user_occurrences", return_value=[])
 @patch("app.services.booking_service.BookingService._format_booking_data")
 @patch("app.services.booking_service.Booking")
-def test_get_user_bookings(mock_booking_class, mock_format_booking):
+def test_get_user_bookings(mock_booking_class, mock_format_booking, mock_occurrences):
     booking1 = MagicMock()
     booking2 = MagicMock()
-    mock_booking_class.query.filter_by.return_value.all.return_value = [
+    mock_booking_class.query.filter_by.return_value.order_by.return_value.all.return_value = [
         booking1,
         booking2,
     ]
 
     mock_format_booking.side_effect = [
-        {"id": 1, "status": "confirmed"},
-        {"id": 2, "status": "pending"},
+        {"id": "1", "date": "2025-05-20", "start_time": None, "status": "confirmed"},
+        {"id": "2", "date": "2025-05-21", "start_time": "09:00:00", "status": "pending"},
     ]
 
     bookings = BookingService.get_user_bookings(user_id=2)
 
     assert len(bookings) == 2
-    assert bookings[0]["id"] == 1
+    assert bookings[0]["id"] == "1"
     assert bookings[1]["status"] == "pending"
+
+
+# Test: création refusée si le créneau est déjà réservé
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_booking_conflict(
+    mock_booking_class, mock_room_class, mock_db, booking_data_half_day
+):
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = _batch_room("1")
+    mock_db.session.query.return_value.filter.return_value = [("existing", time(11), time(14), False)]
+
+    response, status = BookingService.create_booking(booking_data_half_day)
+
+    assert status == 409
+    assert response["error"] == "La salle est déjà réservée sur ce créneau"
+    mock_db.session.add.assert_not_called()
+
+
+# Test: un créneau encore dans l'index mais annulé par un autre worker est accepté
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_booking_ignores_stale_index(
+    mock_booking_class, mock_room_class, mock_db, booking_data_half_day
+):
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = _batch_room("1")
+    booking_index.add("1", date(2025, 5, 21), 9 * 60, 12 * 60, "cancelled-elsewhere")
+    mock_db.session.query.return_value.filter.return_value = []
+
+    response, status = BookingService.create_booking(booking_data_half_day)
+
+    assert status == 201
+    mock_db.session.commit.assert_called_once()
+
+
+# Test: une réservation validée par un autre worker (absente de l'index) est relue en base
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_booking_rechecks_database(
+    mock_booking_class, mock_room_class, mock_db, booking_data_half_day
+):
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = _batch_room("1")
+    booking_index.add("1", date(2025, 5, 21), 8 * 60, 9 * 60, "known")
+    mock_db.session.query.return_value.filter.return_value = [("elsewhere", time(11), time(13), False)]
+
+    response, status = BookingService.create_booking(booking_data_half_day)
+
+    assert status == 409
+    mock_db.session.add.assert_not_called()
+    mock_db.session.rollback.assert_called_once()
+    assert booking_index.find_conflict("1", date(2025, 5, 21), 11 * 60, 12 * 60) == "elsewhere"
+
+
+# Test: annulation d'une réservation - le créneau est libéré
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Booking")
+def test_cancel_booking_frees_slot(mock_booking_class, mock_db):
+    mock_booking = MagicMock()
+    mock_booking.id = "b1"
+    mock_booking.room_id = "1"
+    mock_booking.date = date(2025, 5, 21)
+    mock_booking.status = "confirmed"
+    mock_booking_class.query.get_or_404.return_value = mock_booking
+    booking_index.add("1", date(2025, 5, 21), 9 * 60, 12 * 60, "b1")
+
+    response, status = BookingService.cancel_booking("b1")
+
+    assert status == 200
+    assert response["status"] == "cancelled"
+    mock_db.session.commit.assert_called_once()
+    assert booking_index.find_conflict("1", date(2025, 5, 21), 9 * 60, 12 * 60) is None
+
+
+def _batch_item(room_id, start, end, attendees=5):
+    return BookingCreate(
+        room_id=room_id,
+        user_id="2",
+        date=date(2025, 5, 21),
+        start_time=time(start, 0),
+        end_time=time(end, 0),
+        attendees=attendees,
+        total_price=50.0,
+    )
+
+
+def _batch_room(room_id, capacity_max=10):
+    room = MagicMock()
+    room.id = room_id
+    room.capacity_max = capacity_max
+    room.availability_confirmation_required = False
+    return room
+
+
+# Test: lot de réservations - une seule insertion et un seul commit
+@patch("app.services.booking_service.insert")
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_bookings_single_transaction(
+    mock_booking_class, mock_room_class, mock_db, mock_insert
+):
+    mock_room_class.query.filter.return_value.order_by.return_value.with_for_update.return_value = [_batch_room("1"), _batch_room("2")]
+    mock_db.session.query.return_value.filter.return_value = []
+    items = [_batch_item("1", 9, 10), _batch_item("1", 10, 11), _batch_item("2", 9, 10)]
+
+    response, status = BookingService.create_bookings(items)
+
+    assert status == 201
+    assert response["created"] == 3
+    assert [result["status"] for result in response["results"]] == ["created"] * 3
+    mock_db.session.execute.assert_called_once()
+    assert len(mock_db.session.execute.call_args[0][1]) == 3
+    mock_db.session.commit.assert_called_once()
+    assert booking_index.find_conflict("1", date(2025, 5, 21), 9 * 60, 10 * 60) is not None
+
+
+# Test: lot atomique - un conflit interne au lot annule tout
+@patch("app.services.booking_service.insert")
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_bookings_atomic_rejects_whole_batch(
+    mock_booking_class, mock_room_class, mock_db, mock_insert
+):
+    mock_room_class.query.filter.return_value.order_by.return_value.with_for_update.return_value = [_batch_room("1")]
+    mock_db.session.query.return_value.filter.return_value = []
+    items = [_batch_item("1", 9, 11), _batch_item("1", 10, 12)]
+
+    response, status = BookingService.create_bookings(items)
+
+    assert status == 400
+    assert response["created"] == 0
+    assert response["results"][0]["status"] == "skipped"
+    assert response["results"][1]["error"] == "La salle est déjà réservée sur ce créneau"
+    mock_db.session.execute.assert_not_called()
+    mock_db.session.commit.assert_not_called()
+
+
+# Test: lot partiel - les éléments valides sont créés malgré les erreurs
+@patch("app.services.booking_service.insert")
+@patch("app.services.booking_service.db")
+@patch("app.services.booking_service.Room")
+@patch("app.services.booking_service.Booking")
+def test_create_bookings_partial(
+    mock_booking_class, mock_room_class, mock_db, mock_insert
+):
+    mock_room_class.query.filter.return_value.order_by.return_value.with_for_update.return_value = [_batch_room("1", capacity_max=4)]
+    mock_db.session.query.return_value.filter.return_value = []
+    items = [_batch_item("1", 9, 10, attendees=3), _batch_item("1", 10, 11, attendees=8), _batch_item("9", 9, 10)]
+
+    response, status = BookingService.create_bookings(items, mode="partial")
+
+    assert status == 201
+    assert response["created"] == 1
+    assert response["errors"] == 2
+    assert response["results"][1]["error"] == "Le nombre de participants dépasse la capacité de la salle"
+    assert response["results"][2]["error"] == "Salle introuvable"
+    mock_db.session.commit.assert_called_once()
+
+
+# Test: l'historique intercale les occurrences des séries, pagination comprise
+def test_get_user_bookings_includes_series_occurrences(monkeypatch):
+    from app import create_app, db
+    from app.models.booking import Booking
+    from app.models.booking_series import BookingSeries, BookingSeriesException
+
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = create_app()
+    with app.app_context():
+        db.session.add(Booking(
+            id="b1", room_id="r1", user_id="u1", date=date(2025, 1, 14),
+            start_time=time(10), end_time=time(11), attendees=4, total_price=50.0,
+        ))
+        db.session.add(BookingSeries(
+            id="s1", room_id="r2", user_id="u1", freq="weekly", start_date=date(2025, 1, 7), count=3,
+            start_time=time(9), end_time=time(10), attendees=4, total_price=80.0, status="confirmed",
+        ))
+        db.session.add(BookingSeriesException(series_id="s1", date=date(2025, 1, 21), status="cancelled"))
+        db.session.commit()
+
+        first = BookingService.get_user_bookings("u1", limit=2)
+        second = BookingService.get_user_bookings("u1", limit=2, cursor=first["nextCursor"])
+        everything = BookingService.get_user_bookings("u1")
+
+    assert [item["id"] for item in first["items"]] == ["s1@2025-01-07", "s1@2025-01-14"]
+    assert first["items"][0]["series_id"] == "s1"
+    assert [item["id"] for item in second["items"]] == ["b1"]
+    assert second["nextCursor"] is None
+    assert [item["id"] for item in everything] == ["s1@2025-01-07", "s1@2025-01-14", "b1"]
@@ -0,0 +1,57 @@
+from app.cache import MemoryCache, ReadThroughCache, MISSING
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_cache_ttl_expiry():
+    clock = FakeClock()
+    cache = MemoryCache(clock=clock)
+    cache.set("a", 1, ttl=10)
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert cache.get("a") is MISSING
+    assert cache.evictions == 1
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")  # "b" devient la moins récemment utilisée
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_read_through_counts_hits_and_misses():
+    cache = ReadThroughCache(MemoryCache(), ttl=60)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return None  # une valeur None est aussi mise en cache
+
+    assert cache.get_or_load("k", loader) is None
+    assert cache.get_or_load("k", loader) is None
+    assert (cache.hits, cache.misses, len(loads)) == (1, 1, 1)
+
+    cache.invalidate()
+    cache.get_or_load("k", loader)
+    assert (cache.hits, cache.misses, len(loads)) == (1, 2, 2)
+
+
+def test_read_through_disabled_with_zero_ttl():
+    cache = ReadThroughCache(MemoryCache(), ttl=0)
+    cache.get_or_load("k", lambda: 1)
+    cache.get_or_load("k", lambda: 1)
+    assert len(cache.backend) == 0
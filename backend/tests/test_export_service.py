@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from unittest.mock import patch
+from datetime import date, time, datetime
+from app.schemas.booking import BookingExportQuery
+from app.services.export_service import EXPORT_COLUMNS, ExportService
+
+
+def _rows(count):
+    for i in range(count):
+        yield (
+            f"b{i}", "r1", "u1", date(2025, 5, 20), time(9, 0), time(11, 0), False,
+            4, ["wifi", "café"], 50.0, "confirmed",
+            datetime(2025, 5, 1, 8, 0), datetime(2025, 5, 1, 8, 0),
+        )
+
+
+# Test: export NDJSON - une ligne par réservation, par morceaux de batch_size
+@patch("app.services.export_service.ExportService._rows")
+def test_export_ndjson_chunks(mock_rows):
+    mock_rows.return_value = _rows(5)
+
+    chunks = list(ExportService.export_bookings(BookingExportQuery(), batch_size=2))
+
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode("utf-8").splitlines()
+    assert len(lines) == 5
+    first = json.loads(lines[0])
+    assert first["id"] == "b0"
+    assert first["date"] == "2025-05-20"
+    assert first["start_time"] == "09:00:00"
+    assert first["services"] == ["wifi", "café"]
+
+
+# Test: export CSV - en-tête puis une ligne par réservation
+@patch("app.services.export_service.ExportService._rows")
+def test_export_csv_chunks(mock_rows):
+    mock_rows.return_value = _rows(3)
+
+    chunks = list(ExportService.export_bookings(BookingExportQuery(format="csv"), batch_size=2))
+
+    assert len(chunks) == 2
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert len(rows) == 4
+    assert rows[1][EXPORT_COLUMNS.index("services")] == '["wifi","café"]'
+
+
+# Test: le filtre de statut accepte une liste séparée par des virgules
+def test_export_query_splits_status():
+    query = BookingExportQuery(status="confirmed, pending")
+
+    assert query.status == ["confirmed", "pending"]
+
+
+# Test: les occurrences non annulées des séries suivent les réservations simples
+def test_export_includes_series_occurrences(monkeypatch):
+    from app import create_app, db
+    from app.models.booking import Booking
+    from app.models.booking_series import BookingSeries, BookingSeriesException
+
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = create_app()
+    with app.app_context():
+        db.session.add(Booking(
+            id="b1", room_id="r1", user_id="u1", date=date(2025, 1, 8),
+            start_time=time(9), end_time=time(10), attendees=4, total_price=50.0, status="confirmed",
+        ))
+        series = BookingSeries(
+            id="s1", room_id="r1", user_id="u1", freq="weekly", start_date=date(2025, 1, 7), count=3,
+            start_time=time(9), end_time=time(11), attendees=6, total_price=80.0, status="confirmed",
+        )
+        db.session.add(series)
+        db.session.add(BookingSeriesException(series_id="s1", date=date(2025, 1, 14), status="cancelled"))
+        db.session.commit()
+
+        chunks = list(ExportService.export_bookings(BookingExportQuery(), batch_size=2))
+
+    rows = [json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines()]
+    assert [row["id"] for row in rows] == ["b1", "s1@2025-01-07", "s1@2025-01-21"]
+    assert rows[1]["total_price"] == 80.0
+    assert rows[1]["start_time"] == "09:00:00"
@@ -0,0 +1,72 @@
+import pytest
+from types import SimpleNamespace
+from app.services.facet_service import FacetIndex, bits_from, positions
+
+
+def make_room(room_id, category, city, capacity, price, amenities=()):
+    return SimpleNamespace(
+        id=room_id,
+        slug=f"salle-{room_id}",
+        category=category,
+        type="Moyenne",
+        location_city=city,
+        amenities=[{"icon": "i", "name": name} for name in amenities],
+        capacity_max=capacity,
+        price_per_hour=price,
+    )
+
+
+@pytest.fixture
+def index():
+    rooms = [
+        make_room("a", "Premium", "Paris", 10, 50, ["Wifi", "Projecteur"]),
+        make_room("b", "Standard", "Paris", 30, 80, ["Wifi"]),
+        make_room("c", "Standard", "Lyon", 60, 120, ["Terrasse"]),
+        make_room("d", "Premium", "Lyon", 100, 200, ["Wifi", "Terrasse"]),
+    ]
+    return FacetIndex(lambda: rooms)
+
+
+def slugs(index, bits):
+    return sorted(slug for _, slug in index.keys(bits))
+
+
+def test_positions_and_bits_from_round_trip():
+    assert list(positions(0b101001)) == [0, 3, 5]
+    assert bits_from([0, 3, 5], 6) == 0b101001
+    assert list(positions(0)) == []
+
+
+def test_filter_values_are_ored_within_a_facet(index):
+    matched, _ = index.search({"city": ["Paris", "Lyon"], "category": ["Premium"]}, {})
+    assert slugs(index, matched) == ["salle-a", "salle-d"]
+
+
+def test_amenities_must_all_be_present(index):
+    matched, counts = index.search({"amenities": ["Wifi", "Terrasse"]}, {})
+    assert slugs(index, matched) == ["salle-d"]
+    assert counts["amenities"] == {"Terrasse": 1, "Wifi": 1}
+
+
+def test_facet_counts_ignore_their_own_filter(index):
+    matched, counts = index.search({"category": ["Premium"]}, {})
+    assert slugs(index, matched) == ["salle-a", "salle-d"]
+    assert counts["category"] == {"Premium": 2, "Standard": 2}
+    assert counts["city"] == {"Lyon": 1, "Paris": 1}
+
+
+def test_numeric_ranges_are_inclusive(index):
+    matched, counts = index.search({}, {"capacity": (30, 100), "price": (None, 120)})
+    assert slugs(index, matched) == ["salle-b", "salle-c"]
+    assert counts["category"] == {"Standard": 2}
+
+
+def test_add_updates_existing_room(index):
+    index.search({}, {})
+    index.add(make_room("a", "Standard", "Lille", 10, 50))
+    index.add(make_room("e", "Premium", "Lille", 5, 20))
+
+    matched, counts = index.search({"city": ["Lille"]}, {})
+    assert slugs(index, matched) == ["salle-a", "salle-e"]
+    assert counts["city"] == {"Lille": 2, "Lyon": 2, "Paris": 1}
+    assert "Projecteur" not in counts["amenities"]
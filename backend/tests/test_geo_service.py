@@ -0,0 +1,51 @@
+import random
+import pytest
+from app.services.geo_service import GeoGridIndex, haversine_km
+
+
+def brute_force(points, lat, lng, radius_km, limit):
+    distances = sorted(
+        (haversine_km(lat, lng, p_lat, p_lng), room_id) for room_id, p_lat, p_lng in points
+    )
+    return [(d, room_id) for d, room_id in distances if d <= radius_km][:limit]
+
+
+def test_haversine_paris_lyon():
+    assert haversine_km(48.8566, 2.3522, 45.7640, 4.8357) == pytest.approx(392, abs=1)
+    assert haversine_km(10, 20, 10, 20) == 0
+
+
+@pytest.mark.parametrize("radius_km", [1, 25, 300, 20000])
+def test_nearest_matches_brute_force(radius_km):
+    rng = random.Random(radius_km)
+    points = [
+        (f"r{n}", rng.uniform(42, 51), rng.uniform(-5, 8)) for n in range(2000)
+    ]
+    index = GeoGridIndex(lambda: points)
+    for _ in range(20):
+        lat, lng = rng.uniform(42, 51), rng.uniform(-5, 8)
+        assert index.nearest(lat, lng, radius_km, 10) == brute_force(
+            points, lat, lng, radius_km, 10
+        )
+
+
+def test_nearest_across_antimeridian():
+    points = [("east", 0.0, 179.95), ("west", 0.0, -179.95), ("far", 0.0, 170.0)]
+    index = GeoGridIndex(lambda: points)
+    found = [room_id for _, room_id in index.nearest(0.0, 179.99, 50, 10)]
+    assert found == ["east", "west"]
+
+
+def test_add_updates_built_grid_only():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return []
+
+    index = GeoGridIndex(loader)
+    index.add("ignored", 48.85, 2.35)  # grille pas encore construite
+    assert index.nearest(48.85, 2.35, 1, 5) == []
+    index.add("new", 48.85, 2.35)
+    assert [room_id for _, room_id in index.nearest(48.85, 2.35, 1, 5)] == ["new"]
+    assert len(loads) == 1
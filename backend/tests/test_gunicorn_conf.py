@@ -0,0 +1,78 @@
+import os
+import runpy
+import sys
+
+CONF = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "gunicorn.conf.py")
+
+
+def _load(monkeypatch, **env):
+    for name in ("GUNICORN_WORKERS", "GUNICORN_THREADS", "GUNICORN_WORKER_CLASS", "GUNICORN_PRELOAD"):
+        monkeypatch.delenv(name, raising=False)
+    # Valeur restaurée après le test, même si gunicorn.conf.py la définit
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    monkeypatch.setenv("CATALOG_WARMUP", "false")
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return runpy.run_path(CONF)
+
+
+# Test: par défaut, un seul worker sync comme l'ancien CMD, sans métriques multiprocessus
+def test_defaults_match_previous_command(monkeypatch):
+    conf = _load(monkeypatch)
+
+    assert (conf["workers"], conf["threads"], conf["worker_class"]) == (1, 1, "sync")
+    assert conf["prometheus_multiproc_dir"] is None
+
+
+# Test: GUNICORN_WORKERS=auto donne 2 x CPU + 1 workers, bornés par la mémoire disponible
+def test_default_workers_bounded_by_memory(monkeypatch):
+    conf = _load(monkeypatch, GUNICORN_WORKERS="auto")
+
+    assert conf["workers"] == conf["default_workers"](conf["cpu_count"](), conf["memory_mb"]())
+
+    assert conf["default_workers"](2, None) == 5
+    assert conf["default_workers"](8, 1024) == 4
+    assert conf["default_workers"](4, 100) == 1
+
+
+# Test: les variables GUNICORN_* priment sur les valeurs calculées
+def test_environment_overrides(monkeypatch):
+    conf = _load(
+        monkeypatch, GUNICORN_WORKERS="3", GUNICORN_WORKER_CLASS="gthread", GUNICORN_THREADS="8", GUNICORN_PRELOAD="false"
+    )
+
+    assert (conf["workers"], conf["threads"], conf["worker_class"]) == (3, 8, "gthread")
+    assert conf["preload_app"] is False
+    assert conf["max_requests_jitter"] == conf["max_requests"] // 10
+
+
+# Test: un worker sync n'a qu'un thread ; gevent absent retombe sur gthread
+def test_worker_class(monkeypatch):
+    assert _load(monkeypatch, GUNICORN_WORKER_CLASS="sync")["threads"] == 1
+
+    monkeypatch.setitem(sys.modules, "gevent", None)
+    assert _load(monkeypatch, GUNICORN_WORKER_CLASS="gevent")["worker_class"] == "gthread"
+
+
+# Test: avec preload_app, le préchargement du catalogue passe du maître aux workers
+def test_preload_moves_catalog_warmup_to_workers(monkeypatch):
+    conf = _load(monkeypatch, CATALOG_WARMUP="true")
+
+    assert conf["catalog_warmup"] is True
+    assert os.environ["CATALOG_WARMUP"] == "false"
+
+
+# Test: avec plusieurs workers, les métriques Prometheus passent en mode multiprocessus
+def test_multiple_workers_enable_prometheus_multiprocess(monkeypatch, tmp_path):
+    (tmp_path / "counter_123.db").write_bytes(b"")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setenv("GUNICORN_WORKERS", "2")
+    monkeypatch.setenv("CATALOG_WARMUP", "false")
+    conf = runpy.run_path(CONF)
+
+    assert conf["prometheus_multiproc_dir"] == str(tmp_path)
+    # Les fichiers d'un lancement précédent sont supprimés
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "")
+    assert os.path.isdir(_load(monkeypatch, GUNICORN_WORKERS="2")["prometheus_multiproc_dir"])
@@ -0,0 +1,133 @@
+import pytest
+from flask import Flask, abort, jsonify
+from app import db
+from app.http_cache import conditional_get, purge_surrogate_keys
+from app.versioning import VersionCounters
+
+
+@pytest.fixture
+def counters():
+    return VersionCounters()
+
+
+@pytest.fixture
+def client(counters):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    calls = []
+
+    @app.route("/items/<name>")
+    @conditional_get(
+        lambda name: [(counters, f"item:{name}")],
+        "public, max-age=0",
+        surrogate_keys=lambda name: [f"item-{name}"],
+    )
+    def get_item(name):
+        calls.append(name)
+        if name == "missing":
+            abort(404)
+        return jsonify({"name": name})
+
+    # Même ressource servie avec les compteurs d'un autre worker
+    other_worker = VersionCounters()
+
+    @app.route("/other/<name>")
+    @conditional_get(lambda name: [(other_worker, f"item:{name}")], "public, max-age=0")
+    def get_other(name):
+        return jsonify({"name": name})
+
+    client = app.test_client()
+    client.calls = calls
+    client.other_worker = other_worker
+    return client
+
+
+def _bump(client, counters, key):
+    with client.application.app_context():
+        counters.bump(key)
+        db.session.commit()
+
+
+def test_response_carries_validators(client):
+    response = client.get("/items/a")
+    assert response.status_code == 200
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert response.headers["Cache-Control"] == "public, max-age=0"
+    assert response.headers["Surrogate-Key"] == "item-a"
+
+
+def test_if_none_match_skips_view(client):
+    etag = client.get("/items/a").headers["ETag"]
+    response = client.get("/items/a", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert client.calls == ["a"]
+
+
+def test_write_changes_etag(client, counters):
+    etag = client.get("/items/a").headers["ETag"]
+    _bump(client, counters, "item:a")
+    response = client.get("/items/a", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+# Test: un autre worker (compteurs distincts, même base) calcule le même ETag
+def test_etag_shared_between_workers(client, counters):
+    _bump(client, counters, "item:a")
+    etag = client.get("/items/a").headers["ETag"]
+    changed = []
+    client.other_worker.listeners.append(changed.append)
+
+    response = client.get("/other/a", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert changed == ["item:a"]
+
+
+# Test: If-None-Match: * ne répond 304 que si la ressource existe
+def test_if_none_match_star(client):
+    assert client.get("/items/a", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/items/missing", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_if_modified_since(client):
+    last_modified = client.get("/items/a").headers["Last-Modified"]
+    assert client.get("/items/a", headers={"If-Modified-Since": last_modified}).status_code == 304
+
+
+# Test: une version lue est réutilisée pendant le TTL, sans requête
+def test_versions_cached_for_ttl(client, counters):
+    from app.query_stats import query_budget
+
+    now = [0.0]
+    counters.ttl = 5
+    counters._clock = lambda: now[0]
+    etag = client.get("/items/a").headers["ETag"]
+
+    with query_budget(0):
+        assert client.get("/items/a", headers={"If-None-Match": etag}).status_code == 304
+
+    # Écriture d'un autre worker : vue après le TTL
+    _bump(client, client.other_worker, "item:a")
+    assert client.get("/items/a", headers={"If-None-Match": etag}).status_code == 304
+    now[0] = 6
+    assert client.get("/items/a", headers={"If-None-Match": etag}).status_code == 200
+
+
+# Test: une écriture du processus est vue immédiatement malgré le TTL
+def test_own_write_bypasses_version_cache(client, counters):
+    counters.ttl = 60
+    etag = client.get("/items/a").headers["ETag"]
+    _bump(client, counters, "item:a")
+    assert client.get("/items/a", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_purge_surrogate_keys_calls_purgers(monkeypatch):
+    purged = []
+    monkeypatch.setattr("app.http_cache.surrogate_purgers", [purged.append])
+    purge_surrogate_keys(["rooms", "room-a"])
+    assert purged == [["rooms", "room-a"]]
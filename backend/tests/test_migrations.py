@@ -0,0 +1,106 @@
+import os
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from app import db
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic")
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    command.upgrade(config, "head")
+    return url
+
+
+# Test: les migrations créent l'index composite de l'historique des réservations
+def test_migrations_create_user_date_index(database_url):
+    indexes = inspect(create_engine(database_url)).get_indexes("booking")
+
+    assert {"name": "ix_booking_user_id_date", "column_names": ["user_id", "date"]} in [
+        {"name": index["name"], "column_names": index["column_names"]} for index in indexes
+    ]
+
+
+# Test: le schéma obtenu par les migrations correspond aux modèles
+def test_migrations_match_models(database_url):
+    with create_engine(database_url).connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+
+    assert diff == []
+
+
+# Test: une base créée par db.create_all avant les migrations (sans alembic_version) est migrée
+def test_migrations_upgrade_database_created_by_create_all(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    command.upgrade(config, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE alembic_version")
+
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+    assert diff == []
+
+
+# Test: une base d'avant les migrations, démarrée avec create_all (défaut), est ensuite migrée
+def test_migrations_upgrade_after_boot_with_create_all(tmp_path, monkeypatch):
+    from app import create_app
+
+    url = f"sqlite:///{tmp_path / 'booted.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.delenv("DB_CREATE_ALL", raising=False)
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    command.upgrade(config, "0001")
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP TABLE alembic_version")
+
+    # Le démarrage crée les nouvelles tables (séries, versions) et leurs index
+    create_app()
+    assert {"booking_series", "resource_version"} <= set(inspect(engine).get_table_names())
+
+    command.upgrade(config, "head")
+
+    assert "role" in {column["name"] for column in inspect(engine).get_columns("user")}
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), db.metadata)
+    assert diff == []
+
+
+# Test: avec DB_CREATE_ALL=false, le démarrage ne crée aucune table
+def test_create_app_can_skip_create_all(tmp_path, monkeypatch):
+    from app import create_app
+
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setenv("DB_CREATE_ALL", "false")
+    create_app()
+
+    assert inspect(create_engine(url)).get_table_names() == []
+
+
+# Test: flask init-db crée le schéma hors du démarrage du serveur
+def test_init_db_command_creates_tables(tmp_path, monkeypatch):
+    from app import create_app
+
+    url = f"sqlite:///{tmp_path / 'init.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setenv("DB_CREATE_ALL", "false")
+    result = create_app().test_cli_runner().invoke(args=["init-db"])
+
+    assert result.exit_code == 0, result.output
+    assert {"room", "booking", "user"} <= set(inspect(create_engine(url)).get_table_names())
@@ -0,0 +1,84 @@
+import os
+import pytest
+from prometheus_client import REGISTRY
+from app import create_app
+from app.cache import catalog_cache
+from app.services.room_service import room_json_cache
+from monitoring import setup_monitoring
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = create_app()
+    setup_monitoring(app)
+    catalog_cache.clear()
+    room_json_cache.clear()
+    with app.test_client() as client:
+        yield client
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+# Test: les métriques sont étiquetées par modèle de route, pas par chemin
+def test_metrics_use_route_template(client):
+    route = {"method": "GET", "endpoint": "/api/rooms/<slug>", "blueprint": "rooms"}
+    before = _sample("http_requests_total", status="404", **route)
+
+    client.get("/api/rooms/salle-a")
+    client.get("/api/rooms/salle-b")
+
+    assert _sample("http_requests_total", status="404", **route) == before + 2
+    assert b'endpoint="/api/rooms/salle-a"' not in client.get("/metrics").data
+
+
+# Test: nombre de requêtes SQL, temps base de données et taille de réponse par requête
+def test_metrics_record_db_and_size(client):
+    route = {"method": "GET", "endpoint": "/api/rooms/<slug>", "blueprint": "rooms"}
+    count = _sample("http_request_db_queries_count", **route)
+    queries = _sample("http_request_db_queries_sum", **route)
+    sizes = _sample("http_response_size_bytes_count", **route)
+
+    client.get("/api/rooms/salle-c")
+
+    assert _sample("http_request_db_queries_count", **route) == count + 1
+    assert _sample("http_request_db_queries_sum", **route) >= queries + 1
+    assert _sample("http_request_db_duration_seconds_count", **route) >= 1
+    assert _sample("http_response_size_bytes_count", **route) == sizes + 1
+
+
+# Test: OpenTelemetry n'est importé que si l'export des traces est activé
+def test_monitoring_import_does_not_load_opentelemetry():
+    import subprocess
+    import sys
+
+    code = "import sys, monitoring; print('opentelemetry' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    assert output.strip() == "False"
+
+
+# Test: en mode multiprocessus, /metrics lit les compteurs écrits dans PROMETHEUS_MULTIPROC_DIR
+def test_metrics_multiprocess_mode(tmp_path):
+    import subprocess
+    import sys
+
+    code = (
+        "from app import create_app; from monitoring import setup_monitoring\n"
+        "app = create_app(); setup_monitoring(app); client = app.test_client()\n"
+        "client.get('/api/hello'); client.get('/api/hello')\n"
+        "print(client.get('/metrics').get_data(as_text=True))\n"
+    )
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path), DATABASE_URL="sqlite://")
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+
+    assert 'http_requests_total{blueprint="",endpoint="/api/hello",method="GET",status="200"} 2.0' in output
+    assert "catalog_cache_hits" in output
+    assert any(path.suffix == ".db" for path in tmp_path.iterdir())
@@ -0,0 +1,76 @@
+import threading
+import time
+import pytest
+from werkzeug.security import generate_password_hash
+from app.passwords import PasswordHasher, PasswordHasherBusy
+
+FAST_METHOD = "pbkdf2:sha256:1000"
+
+
+# Test: hachage et vérification sur le pool de threads
+def test_hash_and_verify():
+    hasher = PasswordHasher(FAST_METHOD, workers=1, queue_size=1)
+
+    password_hash = hasher.hash("secret")
+
+    assert password_hash.startswith("pbkdf2:sha256:1000$")
+    assert hasher.verify(password_hash, "secret")
+    assert not hasher.verify(password_hash, "wrong")
+
+
+# Test: un hash produit avec d'autres paramètres doit être recalculé
+def test_needs_rehash():
+    hasher = PasswordHasher(FAST_METHOD, workers=0)
+
+    assert not hasher.needs_rehash(generate_password_hash("secret", FAST_METHOD))
+    assert hasher.needs_rehash(generate_password_hash("secret", "pbkdf2:sha256:2000"))
+    assert hasher.needs_rehash(generate_password_hash("secret", "scrypt"))
+
+
+# Test: au-delà des workers et de la file d'attente, la demande est refusée
+def test_queue_limit():
+    hasher = PasswordHasher(FAST_METHOD, workers=1, queue_size=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking(*args):
+        started.set()
+        release.wait(5)
+        return "done"
+
+    # Deux demandes occupent le worker et la place en file
+    threads = [threading.Thread(target=hasher._run, args=(blocking,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    deadline = time.monotonic() + 5
+    while hasher._slots._value and time.monotonic() < deadline:
+        time.sleep(0.001)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(blocking)
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert hasher._run(lambda: "ok") == "ok"
+
+
+# Test: après un délai dépassé, la place reste prise jusqu'à la fin du hachage
+def test_timeout_keeps_slot_until_done():
+    hasher = PasswordHasher(FAST_METHOD, workers=1, queue_size=0, timeout=0.01)
+    release = threading.Event()
+
+    with pytest.raises(PasswordHasherBusy):
+        hasher._run(lambda: release.wait(5))
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher._run(lambda: "ok")
+    finally:
+        release.set()
+
+    deadline = time.monotonic() + 5
+    while not hasher._slots._value and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert hasher._run(lambda: "ok") == "ok"
@@ -0,0 +1,47 @@
+from sqlalchemy import create_engine
+from app.pool import TimedQueuePool, dispose_engines, engine_options, pool_wait_listeners, register_engine
+
+
+# Test: options du pool lues dans l'environnement, taille ignorée pour SQLite
+def test_engine_options_from_env(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_RECYCLE", "300")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = engine_options("postgresql://roomly@db/roomly")
+
+    assert options["poolclass"] is TimedQueuePool
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 0
+    assert options["pool_recycle"] == 300
+    assert options["pool_pre_ping"] is False
+    assert "pool_size" not in engine_options("sqlite:///roomly.db")
+
+
+# Test: chaque obtention de connexion est chronométrée
+def test_timed_pool_reports_wait(tmp_path):
+    waits = []
+    pool_wait_listeners.append(waits.append)
+    try:
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+        with engine.connect():
+            pass
+    finally:
+        pool_wait_listeners.remove(waits.append)
+
+    assert len(waits) == 1
+    assert waits[0] >= 0
+
+
+# Test: après un fork, les connexions héritées ne sont plus réutilisées
+def test_dispose_engines_drops_pooled_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool)
+    register_engine(engine)
+    with engine.connect():
+        pass
+    assert engine.pool.checkedin() == 1
+
+    dispose_engines()
+
+    assert engine.pool.checkedin() == 0
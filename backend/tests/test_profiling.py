@@ -0,0 +1,97 @@
+import os
+import pstats
+import time
+import pytest
+from app import create_app
+from app.profiling import profile_token, profiler, verify_token
+
+SECRET = "profile-secret"
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("PROFILE_SECRET", SECRET)
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    app = create_app()
+
+    @app.route("/slow")
+    def slow():
+        time.sleep(0.05)
+        return "ok"
+
+    profiler.disable()
+    profiler.sampler.clear()
+    yield app
+    profiler.disable()
+    profiler.sampler.clear()
+
+
+def _headers(mode):
+    return {"X-Profile": profile_token(SECRET, mode)}
+
+
+# Test: sans PROFILE_SECRET, aucun hook ni route de profilage
+def test_profiling_disabled_by_default(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.delenv("PROFILE_SECRET", raising=False)
+    app = create_app()
+
+    assert profiler.before_request not in app.before_request_funcs.get(None, [])
+    assert app.test_client().get("/api/admin/profiling").status_code == 404
+
+
+# Test: un en-tête signé active l'échantillonnage, agrégé par modèle de route
+def test_signed_header_samples_request(app):
+    client = app.test_client()
+    client.get("/slow", headers=_headers("sample"))
+    client.get("/slow", headers={"X-Profile": profile_token("autre-secret", "sample")})
+
+    assert profiler.sampler.requests == {"GET /slow": 1}
+    stacks = profiler.sampler.snapshot()["GET /slow"]
+    assert any(stack.endswith("app.<locals>.slow") for stack in stacks)
+
+
+# Test: en mode cprofile, le profil de la requête est écrit dans PROFILE_DIR
+def test_cprofile_mode_dumps_stats(app, tmp_path):
+    response = app.test_client().get("/slow", headers=_headers("cprofile"))
+
+    name = response.headers["X-Profile-File"]
+    assert name.startswith("GET_slow.") and name.endswith(".prof")
+    stats = pstats.Stats(str(tmp_path / name))
+    assert any(function == "slow" for _, _, function in stats.stats)
+
+
+# Test: le toggle admin échantillonne le trafic, puis les piles sont écrites en .folded
+def test_admin_toggle_and_dump(app, tmp_path):
+    client = app.test_client()
+    assert client.put("/api/admin/profiling", json={"sample_rate": 1}, headers=_headers("sample")).status_code == 403
+
+    assert client.put("/api/admin/profiling", json=[1, 60], headers=_headers("admin")).status_code == 400
+
+    response = client.put("/api/admin/profiling", json={"sample_rate": 1, "duration": 60}, headers=_headers("admin"))
+    assert response.get_json()["sample_rate"] == 1
+    assert response.get_json()["worker"] == os.getpid()
+    client.get("/slow")
+    client.delete("/api/admin/profiling", headers=_headers("admin"))
+    client.get("/slow")
+
+    files = client.post("/api/admin/profiling/dump", headers=_headers("admin")).get_json()["files"]
+
+    assert files == [str(tmp_path / f"GET_slow.{os.getpid()}.folded")]
+    with open(files[0], encoding="utf-8") as handle:
+        stack, count = handle.readline().rsplit(" ", 1)
+    assert ";" in stack
+    assert int(count) >= 1
+    assert profiler.sampler.snapshot() == {}
+
+
+# Test: un en-tête expiré ou d'un mode inconnu est ignoré
+def test_verify_token_rejects_expired_and_unknown():
+    token = profile_token(SECRET, "sample")
+
+    assert verify_token(token, SECRET, max_age=60) == "sample"
+    assert verify_token(token, SECRET, max_age=-1) is None
+    assert verify_token(token.replace("sample", "other"), SECRET, max_age=60) is None
+    with pytest.raises(ValueError):
+        profile_token(SECRET, "other")
@@ -0,0 +1,169 @@
+import logging
+import pytest
+from datetime import date, time
+from app import create_app, db
+from app.cache import catalog_cache
+from app.models.booking import Booking
+from app.models.room import Room
+from app.query_stats import QueryBudgetExceeded, query_budget, statement_shape
+from app.services.availability_service import occupancy
+from app.services.booking_service import booking_index
+from app.services.facet_service import facet_index
+from app.services.geo_service import geo_index
+from app.services.room_service import room_json_cache
+from app.services.search_service import search_index
+from app.versioning import booking_versions, catalog_versions
+
+ROOM_COUNT = 6
+
+# Budget de requêtes SQL par endpoint, caches froids. Un dépassement signale
+# souvent un chargement paresseux ligne à ligne : corriger la requête plutôt
+# que relever le budget. Les GET conditionnels lisent en plus leurs versions
+# (resource_version, relues après VERSION_CACHE_TTL) et les écritures les incrémentent.
+BUDGETS = [
+    ("GET", "/api/rooms", None, 3),
+    ("GET", "/api/rooms?category=Premium&limit=3", None, 3),
+    ("GET", "/api/rooms/salle-1", None, 2),
+    # ids des salles, puis salles absentes du cache JSON (aucune une fois chaud)
+    ("GET", "/api/rooms/available?date=2026-03-02&start=09:00&end=10:00", None, 5),
+    ("GET", "/api/rooms/search?q=salle", None, 3),
+    # réservations simples, puis séries de l'utilisateur (et leurs exceptions s'il en a)
+    ("GET", "/api/bookings/user/u1", None, 3),
+    ("GET", "/api/bookings/user/u1?limit=2", None, 3),
+    ("POST", "/api/bookings/", {"room": 5, "date": "2026-03-03"}, 6),
+    ("POST", "/api/bookings/batch", {"rooms": [2, 3, 4, 5], "date": "2026-03-04"}, 5),
+]
+
+
+def _room(n):
+    return Room(
+        name=f"Salle {n}",
+        slug=f"salle-{n}",
+        description="Salle de réunion lumineuse",
+        short_description="Salle de réunion",
+        category="Premium" if n % 2 else "Standard",
+        type="Moyenne",
+        capacity_min=1,
+        capacity_max=20,
+        capacity_optimal=10,
+        size=40.0,
+        price_per_hour=50.0,
+        price_per_day=300.0,
+        location_address=f"{n} rue de la Paix",
+        location_city="Paris",
+        location_postal_code="75002",
+        location_country="France",
+        location_lat=48.86,
+        location_lng=2.33,
+        amenities=[{"icon": "wifi", "name": "Wifi", "description": "Wifi haut débit"}],
+    )
+
+
+def _booking(room_id, day, start="09:00", end="10:00"):
+    return {
+        "room_id": room_id,
+        "user_id": "u1",
+        "date": day,
+        "start_time": start,
+        "end_time": end,
+        "attendees": 4,
+        "total_price": 50.0,
+    }
+
+
+def _clear_caches():
+    for cache in (
+        catalog_cache, room_json_cache, booking_index, occupancy, facet_index, geo_index, search_index,
+        catalog_versions, booking_versions,
+    ):
+        cache.clear()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    monkeypatch.setenv("QUERY_TRACKING", "log")
+    app = create_app()
+    with app.app_context():
+        rooms = [_room(n) for n in range(ROOM_COUNT)]
+        db.session.add_all(rooms)
+        db.session.flush()
+        db.session.add_all(
+            Booking(
+                room_id=room.id, user_id="u1", date=date(2026, 3, 2),
+                start_time=time(9), end_time=time(10), attendees=4, total_price=50.0,
+            )
+            for room in rooms[:3]
+        )
+        db.session.commit()
+        room_ids = [room.id for room in rooms]
+    with app.test_client() as client:
+        client.room_ids = room_ids
+        yield client
+    _clear_caches()
+
+
+# Test: chaque endpoint reste dans son budget de requêtes, sans requête répétée
+@pytest.mark.parametrize("method, url, body, budget", BUDGETS)
+def test_endpoint_query_budget(client, method, url, body, budget):
+    json = None
+    if body is not None and "room" in body:
+        json = _booking(client.room_ids[body["room"]], body["date"])
+    elif body is not None:
+        json = {"items": [_booking(client.room_ids[n], body["date"]) for n in body["rooms"]]}
+    _clear_caches()
+
+    with query_budget(budget):
+        response = client.open(url, method=method, json=json)
+
+    assert response.status_code < 400
+
+
+# Test: caches chauds, un GET conditionnel du catalogue ne lit pas la base
+def test_warm_catalog_get_makes_no_query(client):
+    _clear_caches()
+    etag = client.get("/api/rooms").headers["ETag"]
+
+    with query_budget(0):
+        response = client.get("/api/rooms")
+        not_modified = client.get("/api/rooms", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+
+
+# Test: un chargement paresseux par salle est détecté comme N+1
+def test_lazy_loading_loop_exceeds_budget(client):
+    with client.application.app_context():
+        rooms = Room.query.all()
+        with pytest.raises(QueryBudgetExceeded, match="N\\+1"):
+            with query_budget(ROOM_COUNT + 1):
+                for room in rooms:
+                    len(room.bookings)
+
+
+# Test: en staging, une requête HTTP qui répète une requête SQL est journalisée
+def test_log_offenders_reports_repeated_statements(client, caplog):
+    app = client.application
+
+    @app.route("/n-plus-one")
+    def n_plus_one():
+        return {"bookings": [len(room.bookings) for room in Room.query.all()]}
+
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        client.get("/api/rooms/salle-1")
+        assert not caplog.records
+        client.get("/n-plus-one")
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert message.startswith("GET /n-plus-one")
+    assert f"{ROOM_COUNT} x SELECT booking.id" in message
+    assert "N+1 probable" in message
+
+
+# Test: la forme d'une requête ignore les blancs et la taille des listes IN
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT *\n  FROM room WHERE id IN (?, ?, ?)") == "SELECT * FROM room WHERE id IN (?)"
+    assert statement_shape("SELECT * FROM room WHERE id IN (?)") == "SELECT * FROM room WHERE id IN (?)"
+    assert statement_shape("WHERE id IN (%(id_1)s, %(id_2)s)") == "WHERE id IN (?)"
@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from datetime import date, time
+from app.services.recurrence import expand_series, occurrences, occurs_on
+from app.services.recurrence_service import RecurrenceService
+from app.services.booking_service import booking_index
+from app.schemas.booking import BookingSeriesCreate
+
+
+def _rule(**overrides):
+    rule = dict(freq="weekly", interval=1, by_weekday=None, start_date=date(2025, 1, 7), until=None, count=None)
+    rule.update(overrides)
+    return SimpleNamespace(**rule)
+
+
+# Test: tous les mardis jusqu'en juin
+def test_weekly_until():
+    days = list(occurrences(_rule(until=date(2025, 6, 30))))
+
+    assert days[0] == date(2025, 1, 7)
+    assert days[-1] == date(2025, 6, 24)
+    assert all(day.weekday() == 1 for day in days)
+    assert len(days) == 25
+
+
+# Test: plusieurs jours par semaine, une semaine sur deux, nombre d'occurrences limité
+def test_weekly_by_weekday_interval_count():
+    days = list(occurrences(_rule(by_weekday=[3, 1], interval=2, count=4)))
+
+    assert days == [date(2025, 1, 7), date(2025, 1, 9), date(2025, 1, 21), date(2025, 1, 23)]
+
+
+# Test: règle quotidienne limitée aux jours ouvrés
+def test_daily_by_weekday():
+    days = list(occurrences(_rule(freq="daily", by_weekday=[0, 1, 2, 3, 4], until=date(2025, 1, 14))))
+
+    assert days == [date(2025, 1, d) for d in (7, 8, 9, 10, 13, 14)]
+
+
+# Test: une date de fin lointaine n'est pas tronquée par l'horizon des règles sans fin
+def test_until_beyond_horizon():
+    rule = _rule(start_date=date(2025, 1, 7), until=date(2030, 1, 1))
+
+    assert occurs_on(rule, date(2029, 1, 2))
+    assert list(occurrences(rule))[-1] == date(2030, 1, 1)
+
+
+# Test: une fenêtre donne le même résultat que le filtrage de toutes les occurrences
+@pytest.mark.parametrize("count", [None, 30])
+def test_window_matches_full_expansion(count):
+    rule = _rule(by_weekday=[0, 4], until=date(2025, 12, 31), count=count)
+    start, end = date(2025, 3, 1), date(2025, 4, 15)
+
+    expected = [day for day in occurrences(rule) if start <= day <= end]
+
+    assert list(occurrences(rule, start, end)) == expected
+    assert occurs_on(rule, expected[0])
+    assert not occurs_on(rule, date(2025, 3, 4))
+
+
+# Test: les exceptions annulent ou déplacent une occurrence sans toucher à la série
+def test_expand_series_applies_exceptions():
+    series = _rule(count=3, is_full_day=False, start_time=time(9), end_time=time(11), status="confirmed")
+    exceptions = {
+        date(2025, 1, 14): SimpleNamespace(status="cancelled"),
+        date(2025, 1, 21): SimpleNamespace(status="moved", is_full_day=False, start_time=time(14), end_time=time(16)),
+    }
+
+    expanded = list(expand_series(series, exceptions))
+
+    assert expanded[0] == (date(2025, 1, 7), False, time(9), time(11), "confirmed")
+    assert expanded[1][4] == "cancelled"
+    assert expanded[2] == (date(2025, 1, 21), False, time(14), time(16), "confirmed")
+
+
+# Test: une série en conflit sur une occurrence est refusée en une vérification groupée
+@patch("app.services.recurrence_service._load_intervals_bulk")
+@patch("app.services.recurrence_service.db")
+@patch("app.services.recurrence_service.Room")
+def test_create_series_conflict(mock_room_class, mock_db, mock_bulk_loader):
+    room = MagicMock()
+    room.id = "1"
+    room.capacity_max = 10
+    mock_room_class.query.filter_by.return_value.with_for_update.return_value.first_or_404.return_value = room
+    mock_bulk_loader.return_value = {("1", date(2025, 1, 14)): [(10 * 60, 12 * 60, "existing")]}
+    series_data = BookingSeriesCreate(
+        room_id="1",
+        start_date=date(2025, 1, 7),
+        count=10,
+        start_time=time(9),
+        end_time=time(11),
+        attendees=4,
+        total_price=50.0,
+    )
+
+    booking_index.clear()
+    try:
+        response, status = RecurrenceService.create_series(series_data)
+    finally:
+        booking_index.clear()
+
+    assert status == 409
+    assert response["conflicts"] == ["2025-01-14"]
+    mock_bulk_loader.assert_called_once()
+    assert len(mock_bulk_loader.call_args[0][0]) == 10
+    mock_db.session.commit.assert_not_called()
@@ -1,7 +1,12 @@
+import json
 import unittest
+from collections import namedtuple
 from unittest.mock import patch, Mock
 from sqlalchemy.exc import IntegrityError
 
+# Ligne (id, slug) renvoyée par la requête des clés du catalogue
+Row = namedtuple("Row", ["id", "slug"])
+
 
 class TestRoomService(unittest.TestCase):
     """Tests unitaires pour le service RoomService."""
@@ -11,13 +16,18 @@ class TestRoomService(unittest.TestCase):
         # Patcher les modules problématiques
         self.room_patcher = patch("app.services.room_service.Room")
         self.db_patcher = patch("app.services.room_service.db")
+        self.versions_patcher = patch("app.versioning.VersionCounters.bump")
 
         # Démarrer les patchers
         self.mock_room = self.room_patcher.start()
         self.mock_db = self.db_patcher.start()
+        self.mock_bump = self.versions_patcher.start()
 
         # Importer RoomService après les mocks
-        from app.services.room_service import RoomService
+        from app.services.room_service import RoomService, catalog_cache, room_json_cache
+
+        catalog_cache.clear()
+        room_json_cache.clear()
 
         self.RoomService = RoomService
 
@@ -32,25 +42,134 @@ class TestRoomService(unittest.TestCase):
         """Nettoyage après les tests."""
         self.room_patcher.stop()
         self.db_patcher.stop()
+        self.versions_patcher.stop()
 
-    def test_get_all_rooms(self):
-        """Teste la récupération de toutes les salles."""
+    def test_get_all_rooms_json(self):
+        """Teste la récupération de toutes les salles en JSON."""
         # Configurer les mocks
-        mock_query = Mock()
-        self.mock_room.query = mock_query
-        mock_query.all.return_value = [self.room_obj]
+        self.mock_db.session.query.return_value.all.return_value = [(1, "salle-test")]
+        self.mock_room.query.filter.return_value = [self.room_obj]
 
         # Patcher la méthode de formatage
         with patch.object(
             self.RoomService, "_format_room_data", return_value={"name": "Salle Test"}
         ):
             # Exécuter et vérifier
-            result = self.RoomService.get_all_rooms()
-            self.assertEqual(len(result), 1)
-            self.assertEqual(result[0]["name"], "Salle Test")
-            mock_query.all.assert_called_once()
+            result = json.loads(self.RoomService.get_all_rooms_json())
+            self.assertEqual(result, [{"name": "Salle Test"}])
+            self.mock_db.session.query.return_value.all.assert_called_once()
+
+    def test_get_all_rooms_json_paginated(self):
+        """Teste la pagination par curseur avec projection des champs."""
+        rooms = [Mock(id=i, slug=f"salle-{i}", short_description="Courte") for i in range(2)]
+        self.mock_room.slug.__gt__.return_value = True
+        mock_query = self.mock_db.session.query.return_value.order_by.return_value
+        mock_query.filter.return_value = mock_query
+        mock_query.limit.return_value.all.return_value = [
+            Row(i, f"salle-{i}") for i in range(3)
+        ]
+        self.mock_room.query.filter.return_value.options.return_value = rooms
+
+        with patch("app.services.room_service.load_only") as mock_load_only:
+            result = json.loads(
+                self.RoomService.get_all_rooms_json(
+                    limit=2, cursor="salle-a", fields=["slug", "shortDescription"]
+                )
+            )
+
+        self.assertEqual(
+            result["items"],
+            [
+                {"slug": "salle-0", "shortDescription": "Courte"},
+                {"slug": "salle-1", "shortDescription": "Courte"},
+            ],
+        )
+        self.assertEqual(result["nextCursor"], "salle-1")
+        mock_query.limit.assert_called_once_with(3)
+        mock_query.filter.assert_called_once()
+        self.assertEqual(len(mock_load_only.call_args.args), 2)
+
+    def test_get_all_rooms_json_last_page(self):
+        """Teste que la dernière page n'a pas de curseur suivant."""
+        mock_query = self.mock_db.session.query.return_value.order_by.return_value
+        mock_query.limit.return_value.all.return_value = [Row(1, "salle-test")]
+        self.mock_room.query.filter.return_value = [self.room_obj]
+
+        with patch.object(
+            self.RoomService, "_format_room_data", return_value={"name": "Salle Test"}
+        ):
+            result = json.loads(self.RoomService.get_all_rooms_json(limit=2))
+
+        self.assertEqual(result, {"items": [{"name": "Salle Test"}], "nextCursor": None})
+
+    def test_featured_image_field(self):
+        """Teste le champ featuredImage."""
+        from app.services.room_service import ROOM_FIELDS
+
+        room = Mock(images=[{"src": "a.jpg"}, {"src": "b.jpg", "featured": True}])
+        self.assertEqual(ROOM_FIELDS["featuredImage"][1](room), {"src": "b.jpg", "featured": True})
+        room.images = []
+        self.assertIsNone(ROOM_FIELDS["featuredImage"][1](room))
+
+    def test_get_all_rooms_json_cached(self):
+        """Teste que la liste est servie depuis le cache jusqu'à une création."""
+        mock_keys = self.mock_db.session.query.return_value.all
+        mock_keys.return_value = [(1, "salle-test")]
+        self.mock_room.query.filter.return_value = [self.room_obj]
+
+        with patch.object(
+            self.RoomService, "_format_room_data", return_value={"name": "Salle Test"}
+        ):
+            self.RoomService.get_all_rooms_json()
+            self.RoomService.get_all_rooms_json()
+            self.assertEqual(mock_keys.call_count, 1)
+
+            self.RoomService._catalog_changed()
+            self.RoomService.get_all_rooms_json()
+            self.assertEqual(mock_keys.call_count, 2)
+
+    def test_rooms_json_serializes_each_room_once(self):
+        """Teste que le JSON d'une salle est réutilisé tant que sa version ne change pas."""
+        from app.versioning import catalog_versions
+
+        room_a, room_b = Mock(id="a", slug="salle-a"), Mock(id="b", slug="salle-b")
+        keys = [("a", "salle-a"), ("b", "salle-b")]
+        self.mock_room.query.filter.return_value = [room_a, room_b]
+
+        with patch.object(
+            self.RoomService, "_format_room_data", side_effect=lambda room, fields: {"id": room.id}
+        ) as mock_format:
+            first = self.RoomService._rooms_json(keys)
+            self.assertEqual(first, [b'{"id":"a"}', b'{"id":"b"}'])
+
+            # Seule la salle modifiée (par cette instance ou une autre) est relue
+            self.mock_room.query.filter.return_value = [room_b]
+            catalog_versions.observe("room:salle-b", catalog_versions.get("room:salle-b") + 1, 0)
+            second = self.RoomService._rooms_json(keys)
+            self.assertEqual(second, first)
+            self.assertEqual(mock_format.call_count, 3)
+
+    def test_catalog_version_change_resets_indexes(self):
+        """Teste qu'une salle créée par une autre instance vide les index de recherche, facettes et proximité."""
+        from app.services.facet_service import facet_index
+        from app.services.geo_service import geo_index
+        from app.services.search_service import search_index
+        from app.versioning import catalog_versions
+
+        geo_index._cells = {}
+        facet_index._built = search_index._built = True
+        try:
+            catalog_versions.observe("rooms", catalog_versions.get("rooms") + 1, 0)
+
+            self.assertIsNone(geo_index._cells)
+            self.assertFalse(facet_index._built)
+            self.assertFalse(search_index._built)
+        finally:
+            geo_index.clear()
+            facet_index.clear()
+            search_index.clear()
 
-    def test_get_room_by_slug(self):
+    def test_get_room_by_slug_json(self):
         """Teste la récupération d'une salle par son slug."""
         # Configurer les mocks
         mock_query = Mock()
@@ -64,7 +183,7 @@ class TestRoomService(unittest.TestCase):
             self.RoomService, "_format_room_data", return_value={"name": "Salle Test"}
         ):
             # Exécuter et vérifier
-            result = self.RoomService.get_room_by_slug("salle-test")
+            result = json.loads(self.RoomService.get_room_by_slug_json("salle-test"))
             self.assertEqual(result["name"], "Salle Test")
             mock_query.filter_by.assert_called_once_with(slug="salle-test")
 
@@ -162,6 +281,68 @@ class TestRoomService(unittest.TestCase):
         self.assertEqual(response["error"], "Une salle avec ce slug existe déjà")
         self.mock_db.session.rollback.assert_called_once()
 
+    def _room_line(self, slug):
+        return json.dumps(
+            {
+                "name": "Salle",
+                "slug": slug,
+                "description": "Description",
+                "shortDescription": "Courte",
+                "category": "Standard",
+                "type": "Petite",
+                "capacity": {"min": 1, "max": 10, "optimal": 5},
+                "size": 20,
+                "pricePerHour": 30,
+                "pricePerDay": 200,
+                "location": {
+                    "address": "1 rue",
+                    "city": "Lyon",
+                    "postalCode": "69001",
+                    "country": "France",
+                    "coordinates": {"lat": 45.76, "lng": 4.83},
+                },
+                "amenities": [],
+                "services": [],
+                "images": [],
+            }
+        )
+
+    @patch("app.services.room_service.insert")
+    def test_import_rooms_reports_each_line(self, mock_insert):
+        """Teste l'import NDJSON : lignes invalides, doublons et slugs existants."""
+        self.mock_db.session.query.return_value.filter.return_value = [("existante",)]
+        lines = [
+            self._room_line("nouvelle"),
+            "{invalide",
+            "",
+            self._room_line("existante"),
+            self._room_line("nouvelle"),
+        ]
+
+        results = self.RoomService.import_rooms(lines, batch_size=10)
+
+        self.assertEqual(
+            [(r["line"], r["status"]) for r in results],
+            [(1, "created"), (2, "error"), (4, "error"), (5, "error")],
+        )
+        self.assertEqual(results[2]["error"], "Une salle avec ce slug existe déjà")
+        self.assertEqual(results[3]["error"], "Slug en double dans l'import")
+        inserted = self.mock_db.session.execute.call_args.args[1]
+        self.assertEqual([row["slug"] for row in inserted], ["nouvelle"])
+        self.mock_db.session.commit.assert_called_once()
+
+    @patch("app.services.room_service.insert")
+    def test_import_rooms_in_batches(self, mock_insert):
+        """Teste qu'un INSERT multi-lignes et un commit sont émis par lot."""
+        self.mock_db.session.query.return_value.filter.return_value = []
+        lines = [self._room_line(f"salle-{i}") for i in range(5)]
+
+        results = self.RoomService.import_rooms(lines, batch_size=2)
+
+        self.assertTrue(all(r["status"] == "created" for r in results))
+        self.assertEqual(self.mock_db.session.execute.call_count, 3)
+        self.assertEqual(self.mock_db.session.commit.call_count, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
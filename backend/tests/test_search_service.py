@@ -0,0 +1,64 @@
+import pytest
+from types import SimpleNamespace
+from app.services.search_service import SearchIndex, fold, tokenize
+
+
+def make_room(room_id, name, description, amenities=(), city="Paris"):
+    return SimpleNamespace(
+        id=room_id,
+        slug=f"salle-{room_id}",
+        name=name,
+        short_description="",
+        description=description,
+        amenities=[{"icon": "i", "name": amenity} for amenity in amenities],
+        location_city=city,
+    )
+
+
+@pytest.fixture
+def index():
+    rooms = [
+        make_room("a", "Loft Bastille", "Grand loft avec projecteur", ["Projecteur"]),
+        make_room("b", "Atelier", "Atelier lumineux et terrasse arborée", ["Terrasse"]),
+        make_room("c", "Salle Étoile", "Salle de réunion équipée", [], "Lyon"),
+    ]
+    return SearchIndex(lambda: rooms)
+
+
+def slugs(results):
+    return [slug for _, (_, slug) in results]
+
+
+def test_fold_and_tokenize_remove_accents_and_stopwords():
+    assert fold("Équipée à Évry") == "equipee a evry"
+    assert tokenize("La salle de l'Étoile, équipée !") == ["salle", "etoile", "equipee"]
+
+
+def test_search_is_accent_insensitive(index):
+    assert slugs(index.search("etoile", 10)) == ["salle-c"]
+    assert slugs(index.search("ÉQUIPÉE", 10)) == ["salle-c"]
+
+
+def test_documents_matching_more_terms_rank_first(index):
+    results = index.search("projecteur terrasse arborée", 10)
+    assert slugs(results)[0] == "salle-b"
+    assert set(slugs(results)) == {"salle-a", "salle-b"}
+
+
+def test_last_token_is_a_prefix(index):
+    assert slugs(index.search("proj", 10)) == ["salle-a"]
+    # Seul le dernier mot est complété
+    assert index.search("proj loft", 10) == index.search("loft", 10)
+
+
+def test_add_and_update_documents(index):
+    index.search("x", 1)
+    index.add(make_room("d", "Péniche", "Péniche amarrée"))
+    assert slugs(index.search("peniche", 10)) == ["salle-d"]
+
+    index.add(make_room("a", "Loft Bastille", "Grand loft sans équipement"))
+    assert slugs(index.search("projecteur", 10)) == []
+
+
+def test_empty_query_returns_nothing(index):
+    assert index.search("de la", 10) == []
@@ -0,0 +1,23 @@
+import json
+from app.cache import MemoryCache
+from app.serialization import VersionedJsonCache, dumps, json_array
+
+
+def test_dumps_returns_utf8_bytes():
+    data = dumps({"name": "Salle Étoile", "price": 12.5})
+    assert isinstance(data, bytes)
+    assert json.loads(data) == {"name": "Salle Étoile", "price": 12.5}
+
+
+def test_json_array_splices_documents():
+    body = json_array([dumps({"id": 1}), dumps({"id": 2})])
+    assert json.loads(body) == [{"id": 1}, {"id": 2}]
+    assert json_array([]) == b"[]"
+
+
+def test_versioned_cache_ignores_stale_versions():
+    cache = VersionedJsonCache(MemoryCache())
+    cache.set("room-1", 1, b"{}")
+    assert cache.get("room-1", 1) == b"{}"
+    assert cache.get("room-1", 2) is None
+    assert cache.get("room-2", 0) is None
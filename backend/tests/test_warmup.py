@@ -0,0 +1,53 @@
+import pytest
+from app import create_app, db
+from app.cache import MISSING, catalog_cache
+from app.models.room import Room
+from app.services.facet_service import facet_index
+from app.services.geo_service import geo_index
+from app.services.room_service import room_json_cache
+from app.services.search_service import search_index
+from app.warmup import start_catalog_warmup, warm_up_catalog
+
+
+def _clear():
+    for cache in (catalog_cache, room_json_cache, facet_index, geo_index, search_index):
+        cache.clear()
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite://")
+    app = create_app()
+    with app.app_context():
+        db.session.add(Room(
+            name="Salle A", slug="salle-a", description="Salle lumineuse",
+            short_description="Salle", category="Premium", type="Moyenne",
+            capacity_min=1, capacity_max=10, capacity_optimal=5, size=30.0,
+            price_per_hour=40.0, price_per_day=250.0, location_address="1 rue de la Paix",
+            location_city="Paris", location_postal_code="75002", location_country="France",
+            location_lat=48.86, location_lng=2.33,
+        ))
+        db.session.commit()
+    _clear()
+    yield app
+    _clear()
+
+
+# Test: le préchargement remplit le catalogue et construit les index de salles
+def test_warm_up_catalog_fills_caches(app):
+    warm_up_catalog(app)
+
+    assert catalog_cache.backend.get("rooms.json:None:None:None") is not MISSING
+    assert facet_index._built and search_index._built
+    assert geo_index._cells is not None
+
+
+# Test: le préchargement tourne en arrière-plan et ne propage pas ses erreurs
+def test_start_catalog_warmup_runs_in_background(app, monkeypatch):
+    start_catalog_warmup(app).join(timeout=5)
+    assert catalog_cache.backend.get("rooms.json:None:None:None") is not MISSING
+
+    monkeypatch.setattr("app.warmup.warm_up_catalog", lambda app: 1 / 0)
+    thread = start_catalog_warmup(app)
+    thread.join(timeout=5)
+    assert not thread.is_alive()